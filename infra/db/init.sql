@@ -12,11 +12,12 @@ CREATE TABLE challenges (
     minimum_activity_count INTEGER NOT NULL,
     payment_transaction VARCHAR,
     payment_reward INTEGER NOT NULL,
-    complete_date TIMESTAMPTZ
+    complete_date TIMESTAMPTZ,
+    completed_activity_count INTEGER NOT NULL DEFAULT 0
 );
 
-CREATE INDEX idx_challenger_address ON challenges (challenger_address);
-CREATE INDEX idx_start_date ON challenges (start_date);
+CREATE INDEX idx_challenges_id ON challenges (id);
+CREATE INDEX idx_challenges_challenger_start_date ON challenges (challenger_address, start_date, hash);
 
 CREATE TABLE challenge_activities (
     challenge_hash VARCHAR NOT NULL REFERENCES challenges(hash),
@@ -26,4 +27,21 @@ CREATE TABLE challenge_activities (
     PRIMARY KEY (challenge_hash, activity_hash)
 );
 
-CREATE INDEX idx_challenge_hash ON challenge_activities (challenge_hash);
\ No newline at end of file
+CREATE TABLE activity_submissions (
+    challenge_hash VARCHAR NOT NULL,
+    activity_hash VARCHAR NOT NULL,
+    activity_signature VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error VARCHAR,
+    next_attempt_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (challenge_hash, activity_hash)
+);
+
+CREATE INDEX idx_activity_submissions_next_attempt_at ON activity_submissions (status, next_attempt_at);
+
+
+CREATE TABLE chain_checkpoints (
+    name VARCHAR PRIMARY KEY,
+    block_number BIGINT NOT NULL
+);
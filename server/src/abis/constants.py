@@ -5,3 +5,6 @@ with open(os.path.join(os.path.dirname(__file__), 'OGUOGU.json'), 'r') as f:
     content = json.load(f)
 
 OGUOGU_EVENT_ABI = content['abi']
+
+with open(os.path.join(os.path.dirname(__file__), 'Multicall3.json'), 'r') as f:
+    MULTICALL3_ABI = json.load(f)['abi']
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from src.container import AppContainer
 from src import routers
@@ -12,10 +13,30 @@ logger = logging.getLogger(__name__)
 
 def create_app() -> FastAPI:
     container = AppContainer()
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # 스키마 마이그레이션
+        await container.registry.database.migrator().migrate()
+        # 챌린지 수행 증명 제출 워커
+        outbox = container.registry.outbox()
+        outbox.start()
+        # 블록체인 이벤트 인덱서
+        indexer = container.registry.indexer()
+        indexer.start()
+        # 종료된 챌린지 자동 완료
+        completion = container.registry.completion()
+        completion.start()
+        yield
+        await completion.stop()
+        await indexer.stop()
+        await outbox.stop()
+        await container.registry.transaction().aweb3.provider.disconnect()
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.container = container
     app.include_router(routers.router)
+    app.include_router(routers.metrics_router)
     
     app.add_middleware(
         CORSMiddleware,
@@ -0,0 +1,168 @@
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from eth_typing import ChecksumAddress
+import pytz
+from src.exceptions import ClientException
+from src.settings import Settings
+from src.utils import recover_address
+from web3 import Web3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RecoveredAddressCache:
+    """ 서명 토큰으로 복원한 주소 캐시
+
+    토큰(message:signature)의 해시값을 키로, 복원된 주소를 ttl(초) 동안 보관합니다.
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, ChecksumAddress]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[ChecksumAddress]:
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, address: ChecksumAddress) -> None:
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, address)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+SESSION_TOKEN_VERSION = b"\x01"
+
+
+class Authenticator:
+    """ Bearer 토큰 인증 서비스
+
+    두 가지 형태의 토큰을 받습니다.
+        - 지갑 서명 토큰: `message:signature`
+        - 세션 토큰: 지갑 서명 토큰으로 로그인해서 발급받은 HMAC 서명 토큰 (`payload.mac`)
+    """
+    def __init__(self, settings: Settings):
+        self.signature_cache = RecoveredAddressCache(
+            maxsize=settings.AUTH_CACHE_SIZE,
+            ttl=settings.AUTH_CACHE_TTL,
+        )
+        self.session_ttl = settings.SESSION_TOKEN_TTL
+        self.session_secret = _session_secret(settings)
+        self.metrics_token = settings.METRICS_TOKEN
+
+    def authenticate(self, token: str) -> ChecksumAddress:
+        """ 토큰 형태에 맞게 인증하고, 인증된 주소를 반환합니다. """
+        if ":" in token:
+            return self.authenticate_signature(token)
+        return self.authenticate_session(token)
+
+    def authenticate_signature(self, token: str) -> ChecksumAddress:
+        """ message:signature 형태의 토큰에서 서명한 주소를 복원합니다. """
+        if address := self.signature_cache.get(token):
+            return address
+
+        try:
+            message, signature = token.split(":")
+        except ValueError:
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+
+        try:
+            address = recover_address(message, signature)
+        except Exception:
+            # hex가 아니거나 길이가 맞지 않는 서명 (ValueError, ValidationError, BadSignature)
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+        self.signature_cache.set(token, address)
+        return address
+
+    def issue_session_token(self, address: ChecksumAddress) -> Tuple[str, datetime]:
+        """ 주소에 묶인 세션 토큰을 발급합니다. """
+        expires_at = int(time.time() + self.session_ttl)
+        payload = (
+            SESSION_TOKEN_VERSION
+            + Web3.to_bytes(hexstr=address)
+            + expires_at.to_bytes(8, byteorder='big')
+        )
+        token = f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+        return token, datetime.fromtimestamp(expires_at, tz=pytz.utc)
+
+    def authenticate_session(self, token: str) -> ChecksumAddress:
+        """ 세션 토큰의 HMAC과 만료 시각을 검증합니다. """
+        try:
+            encoded_payload, encoded_mac = token.split(".")
+            payload = _b64decode(encoded_payload)
+            mac = _b64decode(encoded_mac)
+        except ValueError:
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+
+        if len(payload) != 29 or payload[:1] != SESSION_TOKEN_VERSION:
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+
+        if not hmac.compare_digest(mac, self._sign(payload)):
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+
+        if int.from_bytes(payload[21:], byteorder='big') < time.time():
+            raise ClientException(message="인증 토큰이 만료되었어요.")
+
+        return Web3.to_checksum_address(payload[1:21])
+
+    def authenticate_metrics(self, token: str) -> None:
+        """ 운영 지표 조회 토큰을 검증합니다. 토큰이 설정되지 않았으면 항상 거부합니다. """
+        if not self.metrics_token or not hmac.compare_digest(token.encode('utf-8'), self.metrics_token.encode('utf-8')):
+            raise ClientException(message="인증 토큰이 올바르지 않아요.")
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self.session_secret, payload, hashlib.sha256).digest()
+
+
+def _session_secret(settings: Settings) -> bytes:
+    """ 세션 서명 키. 따로 지정하지 않으면 operator 키에서 유도합니다. """
+    if settings.SESSION_SECRET_KEY:
+        return settings.SESSION_SECRET_KEY.encode('utf-8')
+    return hmac.new(
+        settings.OPERATOR_PRIVATE_KEY.encode('utf-8'), 
+        b"oguogu-session", 
+        hashlib.sha256
+    ).digest()
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode('ascii')
+
+
+def _b64decode(value: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    except Exception:
+        raise ValueError(f"Invalid base64 value: {value}")
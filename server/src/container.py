@@ -1,5 +1,7 @@
 from dependency_injector import containers, providers
+from src.auth import Authenticator
 from src.registry.container import RegistryContainer
+from src.settings import Settings
 
 
 
@@ -7,5 +9,9 @@ class AppContainer(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=["src.routers"]
     )
-    
+
+    settings = providers.Singleton(Settings)
+
+    authenticator = providers.Singleton(Authenticator, settings=settings)
+
     registry = providers.Container(RegistryContainer)
@@ -3,11 +3,14 @@ from dependency_injector import containers, providers
 from src.database.repository import ChallengeRepository
 from src.settings import Settings
 from src.database.database import SessionManager
+from src.database.migration import SchemaMigrator
 
 class DataBaseContainer(containers.DeclarativeContainer):
     settings = providers.Singleton(Settings)
 
     session_manager = providers.Singleton(SessionManager, settings=settings)
+
+    migrator = providers.Singleton(SchemaMigrator, session_manager=session_manager)
     
     repository = providers.Singleton(
         ChallengeRepository, 
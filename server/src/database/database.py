@@ -1,11 +1,18 @@
 import asyncio
+from collections import deque
 from contextlib import AbstractContextManager, asynccontextmanager
-from typing import AsyncGenerator, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
 import logging
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, async_scoped_session
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
 
+from src.exceptions import ClientException
 from src.settings import Settings
 from src.database.entity import ChallengeEntity, ChallengeActivityEntity
 
@@ -13,26 +20,137 @@ from src.database.entity import ChallengeEntity, ChallengeActivityEntity
 logger = logging.getLogger(__name__)
 
 
+class PoolStats:
+    """ 커넥션 풀 checkout 대기 시간 통계 """
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0 # 풀이 가득 차서 커넥션 반납을 기다리는 요청 수
+        self.wait_total = 0.0
+        self._waits: deque = deque(maxlen=window)
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.wait_total += wait
+        self._waits.append(wait)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._waits:
+            return None
+        waits = sorted(self._waits)
+        return waits[min(len(waits) - 1, int(q * len(waits)))]
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """ checkout 대기 시간을 기록하는 커넥션 풀
+
+    pre-ping과 새 커넥션 연결 시간도 요청이 기다린 시간이므로 포함합니다.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.monotonic()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record(time.monotonic() - start)
+        return connection
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # 쉬는 커넥션도 없고 overflow도 다 쓴 경우에만 반납을 기다립니다
+        exhausted = self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+        if not exhausted:
+            return super()._do_get()
+        self.stats.waiting += 1
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.waiting -= 1
+
+
+@dataclass
+class UnitOfWork:
+    """ 요청 하나 동안 저장소 메소드들이 같이 쓰는 세션. 커넥션은 처음 사용할 때 가져옵니다 """
+    task: asyncio.Task
+    connection: Optional[AsyncConnection] = None
+    session: Optional[AsyncSession] = None
+
+
+# 지금 요청의 unit of work. 요청을 처리하는 task에서만 사용합니다
+_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+
+
 class SessionManager:
     """비동기 데이터베이스 클래스"""
 
     def __init__(self, settings: Settings):
         url = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-        self._engine = create_async_engine(url)
+        self._engine = create_async_engine(
+            url,
+            poolclass=MeteredQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            connect_args={
+                # SQLAlchemy asyncpg 어댑터의 캐시와 asyncpg 자체 캐시
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            },
+        )
         
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                autocommit=False,
-                bind=self._engine,
-            ),
-            scopefunc=asyncio.current_task,
+        self._session_factory = async_sessionmaker(
+            autocommit=False,
+            bind=self._engine,
         )
     
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine
+
     @asynccontextmanager
     async def connect(self) -> AsyncGenerator[AsyncSession, None]:
         async with self._engine.begin() as conn:
             yield conn
 
+    @asynccontextmanager
+    async def try_advisory_lock(self, lock_id: int) -> AsyncGenerator[bool, None]:
+        """ advisory lock을 기다리지 않고 잡아보고, 잡았는지 여부를 반환합니다.
+        
+        서버(워커)가 여러 개일 때 백그라운드 작업을 한 곳에서만 실행하는 데 사용합니다.
+        lock은 블록이 끝날 때까지 커넥션 하나를 AUTOCOMMIT으로 잡고 유지합니다.
+        """
+        async with self._engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id})
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        pool: MeteredQueuePool = self._engine.pool
+        stats = pool.stats
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "waiting": stats.waiting,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait": stats.wait_total / stats.checkouts if stats.checkouts else None,
+            "p50": stats.percentile(0.5),
+            "p95": stats.percentile(0.95),
+            "p99": stats.percentile(0.99),
+        }
+
     async def create_database(self) -> None:
         async with self.connect() as conn:
             await conn.run_sync(ChallengeEntity.metadata.create_all)
@@ -46,6 +164,18 @@ class SessionManager:
 
     @asynccontextmanager
     async def session(self) -> Callable[..., AbstractContextManager[AsyncSession]]:
+        unit_of_work = _unit_of_work.get()
+        if unit_of_work is not None and unit_of_work.task is asyncio.current_task():
+            # 요청의 트랜잭션에 참여합니다. 커밋 / 롤백은 unit_of_work가 합니다
+            if unit_of_work.session is None:
+                unit_of_work.connection = await self._engine.connect()
+                await unit_of_work.connection.begin()
+                unit_of_work.session = self._session_factory(
+                    bind=unit_of_work.connection, join_transaction_mode="rollback_only"
+                )
+            yield unit_of_work.session
+            return
+        
         session: AsyncSession = self._session_factory()
         try:
             yield session
@@ -55,4 +185,34 @@ class SessionManager:
             raise
         finally:
             await session.close()
-            await self._session_factory.remove()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncGenerator[None, None]:
+        """ 저장소 호출을 커넥션 하나, 트랜잭션 하나로 묶고 끝날 때 커밋하기
+        
+        커넥션은 처음 저장소를 사용할 때 가져옵니다. 블록 안에서 오래 기다리는 작업(채점, 업로드, 영수증 대기)을
+        하면 그동안 커넥션을 잡고 있으므로, DB를 사용하는 부분만 묶습니다.
+        세션은 외부 트랜잭션에 rollback_only로 참여하므로, 저장소 메소드의 commit은 flush만 하고
+        rollback은 묶은 작업 전체를 롤백합니다.
+        같은 task에서만 공유합니다. (gather 등으로 만든 task는 AsyncSession을 동시에 쓸 수 없으므로 각자 세션을 엽니다)
+        """
+        unit_of_work = UnitOfWork(asyncio.current_task())
+        token = _unit_of_work.set(unit_of_work)
+        try:
+            yield
+            if unit_of_work.session is not None:
+                await unit_of_work.session.flush()
+                await unit_of_work.connection.commit()
+        except Exception as e:
+            if unit_of_work.connection is not None:
+                # 클라이언트 예외는 정상적인 응답이므로 남기지 않고, 오류 보고는 앱의 예외 핸들러에 맡깁니다
+                if not isinstance(e, ClientException):
+                    logger.debug("Unit of work rollback because of exception", exc_info=True)
+                await unit_of_work.connection.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            if unit_of_work.session is not None:
+                await unit_of_work.session.close()
+            if unit_of_work.connection is not None:
+                await unit_of_work.connection.close()
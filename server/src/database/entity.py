@@ -1,12 +1,12 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import DateTime, Numeric, PrimaryKeyConstraint, String, Integer, ForeignKey
+from sqlalchemy import BigInteger, DateTime, Index, Numeric, PrimaryKeyConstraint, Row, String, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import relationship, backref
 
-from src.domains import Challenge, ChallengeActivity, ChallengeStatus, ChallengeType
+from src.domains import ActivitySubmission, Challenge, ChallengeActivity, ChallengeStatus, ChallengeType, SubmissionStatus
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
@@ -32,13 +32,21 @@ class ChallengeEntity(Base):
     payment_transaction: Mapped[str] = mapped_column(String, nullable=True)
     payment_reward: Mapped[int] = mapped_column(Numeric(precision=78, scale=0))
     complete_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_activity_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     activities: Mapped[List["ChallengeActivityEntity"]] = relationship(
         "ChallengeActivityEntity", 
-        backref=backref("challenge", lazy="joined"), 
+        backref=backref("challenge"), 
         lazy="select"
     )
     
+    __table_args__ = (
+        Index('idx_challenges_id', 'id'),
+        Index('idx_challenges_status_id', 'status', 'id'),
+        Index('idx_challenges_challenger_start_date', 'challenger_address', 'start_date', 'hash'),
+        Index('idx_challenges_challenger_status_start_date', 'challenger_address', 'status', 'start_date', 'hash'),
+    )
+    
     @staticmethod
     def from_domain(domain: Challenge) -> "ChallengeEntity":
         return ChallengeEntity(
@@ -56,6 +64,7 @@ class ChallengeEntity(Base):
             payment_transaction=domain.payment_transaction,
             payment_reward=domain.payment_reward,
             complete_date=domain.complete_date,
+            completed_activity_count=domain.completed_activity_count,
         )
 
     def to_domain(self) -> Challenge:
@@ -74,9 +83,39 @@ class ChallengeEntity(Base):
             payment_transaction=self.payment_transaction,
             payment_reward=int(self.payment_reward),
             complete_date=self.complete_date,
+            completed_activity_count=self.completed_activity_count,
             activities=[activity.to_domain() for activity in self.activities],
         )
 
+    @staticmethod
+    def row_to_domain(row: Row) -> Challenge:
+        """ 조회한 행을 ORM 객체 없이 도메인으로 바꿉니다. activities는 json_agg로 묶은 증명 목록입니다. (없으면 빈 목록) """
+        return Challenge(
+            hash=row.hash,
+            id=row.id,
+            nonce=row.nonce,
+            status=ChallengeStatus(row.status),
+            challenger_address=row.challenger_address,
+            reward_amount=int(row.reward_amount),
+            title=row.title,
+            type=ChallengeType[row.type],
+            start_date=row.start_date,
+            end_date=row.end_date,
+            minimum_activity_count=row.minimum_activity_count,
+            payment_transaction=row.payment_transaction,
+            payment_reward=int(row.payment_reward),
+            complete_date=row.complete_date,
+            completed_activity_count=row.completed_activity_count,
+            activities=[
+                ChallengeActivity(
+                    activity_hash=activity['activity_hash'],
+                    activity_transaction=activity['activity_transaction'],
+                    activity_date=datetime.fromisoformat(activity['activity_date']) if activity['activity_date'] else None,
+                )
+                for activity in row._mapping.get("activities") or []
+            ],
+        )
+
 
 class ChallengeActivityEntity(Base):
     __tablename__ = "challenge_activities"
@@ -88,7 +127,7 @@ class ChallengeActivityEntity(Base):
     activity_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     
     __table_args__ = (
-        PrimaryKeyConstraint('activity_hash', 'challenge_hash'),
+        PrimaryKeyConstraint('challenge_hash', 'activity_hash'),
     )    
 
     @staticmethod
@@ -105,4 +144,52 @@ class ChallengeActivityEntity(Base):
             activity_hash=self.activity_hash,
             activity_transaction=self.activity_transaction,
             activity_date=self.activity_date,
-        )
\ No newline at end of file
+        )
+
+
+class ActivitySubmissionEntity(Base):
+    __tablename__ = "activity_submissions"
+    
+    challenge_hash: Mapped[str] = mapped_column(String)
+    activity_hash: Mapped[str] = mapped_column(String)
+    activity_signature: Mapped[str] = mapped_column(String)
+    
+    status: Mapped[str] = mapped_column(String)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        PrimaryKeyConstraint('challenge_hash', 'activity_hash'),
+        Index('idx_activity_submissions_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    
+    @staticmethod
+    def from_domain(domain: ActivitySubmission) -> "ActivitySubmissionEntity":
+        return ActivitySubmissionEntity(
+            challenge_hash=domain.challenge_hash,
+            activity_hash=domain.activity_hash,
+            activity_signature=domain.activity_signature,
+            status=domain.status.value,
+            attempts=domain.attempts,
+            last_error=domain.last_error,
+            next_attempt_at=domain.next_attempt_at,
+        )
+        
+    def to_domain(self) -> ActivitySubmission:
+        return ActivitySubmission(
+            challenge_hash=self.challenge_hash,
+            activity_hash=self.activity_hash,
+            activity_signature=self.activity_signature,
+            status=SubmissionStatus(self.status),
+            attempts=self.attempts,
+            last_error=self.last_error,
+            next_attempt_at=self.next_attempt_at,
+        )
+
+
+class ChainCheckpointEntity(Base):
+    __tablename__ = "chain_checkpoints"
+    
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    block_number: Mapped[int] = mapped_column(BigInteger)
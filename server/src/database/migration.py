@@ -0,0 +1,95 @@
+import asyncio
+from pathlib import Path
+from typing import List, Tuple
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.database.database import SessionManager
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# 서버 여러 대가 동시에 시작해도 마이그레이션은 한 곳에서만 실행되도록 잡는 advisory lock 키
+MIGRATION_LOCK_ID = 4848_0001
+
+NO_TRANSACTION = "-- no-transaction"
+
+
+class SchemaMigrator:
+    """ SQL 스키마 마이그레이션
+
+    infra/db/init.sql이 최초 스키마이고, 이후 스키마 변경은 migrations 디렉토리에 NNNN_name.sql 파일로 추가합니다.
+    파일 이름 순서대로 한 번씩 실행하고 schema_migrations 테이블에 기록합니다.
+    첫 줄이 `-- no-transaction`인 파일(CREATE INDEX CONCURRENTLY 등)은 문장마다 따로 커밋하므로,
+    중간에 실패해도 다시 실행할 수 있게 IF [NOT] EXISTS로 작성합니다.
+    """
+    def __init__(self, session_manager: SessionManager, directory: Path = MIGRATIONS_DIR):
+        self.engine = session_manager.engine
+        self.directory = directory
+
+    def get_migrations(self) -> List[Tuple[str, str]]:
+        return [(path.stem, path.read_text()) for path in sorted(self.directory.glob("*.sql"))]
+
+    async def migrate(self) -> List[str]:
+        """ 아직 실행하지 않은 마이그레이션을 실행하고, 실행한 버전 목록을 반환합니다. """
+        applied_versions = []
+        async with self.engine.connect() as lock:
+            lock = await lock.execution_options(isolation_level="AUTOCOMMIT")
+            await lock.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            try:
+                await lock.execute(text(
+                    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                    "version VARCHAR PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+                ))
+                result = await lock.execute(text("SELECT version FROM schema_migrations"))
+                applied = set(result.scalars().all())
+
+                for version, sql in self.get_migrations():
+                    if version in applied:
+                        continue
+                    logger.info(f"apply migration {version}")
+                    await self._apply(version, sql)
+                    applied_versions.append(version)
+            finally:
+                await lock.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        return applied_versions
+
+    async def _apply(self, version: str, sql: str):
+        statements = split_statements(sql)
+        if sql.startswith(NO_TRANSACTION):
+            async with self.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                for statement in statements:
+                    await conn.exec_driver_sql(statement)
+                await self._record(conn, version)
+        else:
+            async with self.engine.begin() as conn:
+                for statement in statements:
+                    await conn.exec_driver_sql(statement)
+                await self._record(conn, version)
+
+    async def _record(self, conn: AsyncConnection, version: str):
+        await conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version})
+
+
+def split_statements(sql: str) -> List[str]:
+    """ 주석을 지우고 `;`로 문장을 나눕니다. (마이그레이션에는 함수 본문처럼 `;`가 들어간 문장을 쓰지 않습니다) """
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+async def main():
+    from src.database.container import DataBaseContainer
+
+    migrator = DataBaseContainer().migrator()
+    versions = await migrator.migrate()
+    print(f"applied={versions}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+-- init.sql 이후에 추가된 테이블. 기존 DB에는 없으므로 인덱스 마이그레이션보다 먼저 만듭니다.
+
+-- 챌린지 수행 증명 제출 outbox
+CREATE TABLE IF NOT EXISTS activity_submissions (
+    challenge_hash VARCHAR NOT NULL,
+    activity_hash VARCHAR NOT NULL,
+    activity_signature VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error VARCHAR,
+    next_attempt_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (challenge_hash, activity_hash)
+);
+
+-- 인덱서 / 복원 체크포인트
+CREATE TABLE IF NOT EXISTS chain_checkpoints (
+    name VARCHAR PRIMARY KEY,
+    block_number BIGINT NOT NULL
+);
@@ -0,0 +1,23 @@
+-- no-transaction
+-- 저장소 쿼리 모양에 맞춘 인덱스. 운영 중인 테이블의 쓰기를 막지 않도록 CONCURRENTLY로 만듭니다.
+
+-- 유저 챌린지 목록: challenger_address = ? ORDER BY start_date DESC, hash DESC (keyset)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_challenges_challenger_start_date ON challenges (challenger_address, start_date, hash);
+
+-- 상태로 거른 유저 챌린지 목록: challenger_address = ? AND status = ? ORDER BY start_date DESC, hash DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_challenges_challenger_status_start_date ON challenges (challenger_address, status, start_date, hash);
+
+-- 챌린지 ID 조회, DB / 블록체인 비교(keyset)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_challenges_id ON challenges (id);
+
+-- 자동 완료: status = 'OPEN' AND id > ? ORDER BY id (keyset)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_challenges_status_id ON challenges (status, id);
+
+-- outbox: status IN (...) AND next_attempt_at <= ? ORDER BY next_attempt_at
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_submissions_next_attempt_at ON activity_submissions (status, next_attempt_at);
+
+-- 위 인덱스와 기본 키의 앞부분으로 처리되는 인덱스
+DROP INDEX CONCURRENTLY IF EXISTS idx_challenger_address;
+DROP INDEX CONCURRENTLY IF EXISTS idx_start_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_challenges_status_end_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_challenge_hash;
@@ -0,0 +1,11 @@
+-- 챌린지별 완료된 증명 수. 증명 목록을 세지 않고 제출/완료 가능 여부를 확인합니다.
+ALTER TABLE challenges ADD COLUMN IF NOT EXISTS completed_activity_count INTEGER NOT NULL DEFAULT 0;
+
+-- 기존 챌린지는 지금까지 완료된 증명 수로 채웁니다
+UPDATE challenges
+SET completed_activity_count = (
+    SELECT count(*)
+    FROM challenge_activities a
+    WHERE a.challenge_hash = challenges.hash
+      AND a.activity_transaction IS NOT NULL
+);
@@ -1,15 +1,64 @@
+from collections import Counter
 from contextlib import AbstractContextManager
-from typing import Callable, List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional, Set
+import pytz
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import JSON, DateTime, Select, String, bindparam, cast, column, func, literal, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
 
-from src.database.entity import ChallengeEntity, ChallengeActivityEntity
-from src.domains import Challenge, ChallengeActivity, ChallengeStatus
+from src.database.entity import ActivitySubmissionEntity, ChainCheckpointEntity, ChallengeEntity, ChallengeActivityEntity
+from src.domains import (
+    ActivitySubmission,
+    ActivitySubmittedEvent,
+    ChainEventBatch,
+    Challenge,
+    ChallengeActivity,
+    ChallengeCompletedEvent,
+    ChallengeCursor,
+    ChallengeOpenedEvent,
+    ChallengeStatus,
+    SubmissionStatus,
+)
 from sqlalchemy.exc import IntegrityError
 from src.exceptions import ClientException
 
 
+# multi-row INSERT 한 번에 넣는 행 수 (asyncpg 파라미터 수 제한: 32767)
+INSERT_CHUNK_SIZE = 1000
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def _select_challenges(with_activities: bool = True) -> Select:
+    """ 챌린지와 증명 목록을 한 번의 쿼리로 가져오기
+
+    증명은 상관 서브쿼리에서 json_agg로 묶어서 챌린지 행의 activities 컬럼에 담습니다. (selectinload의 두 번째 쿼리 대신)
+    ORM 객체를 만들지 않고 조회한 행을 바로 도메인으로 바꿉니다. (ChallengeEntity.row_to_domain)
+    상태 확인만 필요하면(with_activities=False) 증명 목록 없이 completed_activity_count만 가져옵니다.
+    """
+    activities = ChallengeActivityEntity.__table__
+    challenges = ChallengeEntity.__table__
+    if not with_activities:
+        return select(*challenges.c)
+    aggregated = (
+        select(func.json_agg(
+            func.json_build_object(
+                'activity_hash', activities.c.activity_hash,
+                'activity_transaction', activities.c.activity_transaction,
+                'activity_date', activities.c.activity_date,
+            ),
+            type_=JSON,
+        ))
+        .where(activities.c.challenge_hash == challenges.c.hash)
+        .scalar_subquery()
+    )
+    return select(*challenges.c, func.coalesce(aggregated, literal([], JSON), type_=JSON).label("activities"))
+
+
 class ChallengeRepository:
     def __init__(self, session_factory: Callable[..., AbstractContextManager[AsyncSession]]):
         self.session_factory = session_factory
@@ -18,29 +67,27 @@ class ChallengeRepository:
         """ 챌린지 ID로 조회하기 """
         async with self.session_factory() as session:
             stmt = (
-                select(ChallengeEntity)
-                .options(selectinload(ChallengeEntity.activities))
+                _select_challenges()
                 .where(ChallengeEntity.id == challenge_id)
             )
             result = await session.execute(stmt)
-            challenge_entity = result.scalar_one_or_none()
-            if challenge_entity is None:
+            row = result.one_or_none()
+            if row is None:
                 return None
-            return challenge_entity.to_domain()
+            return ChallengeEntity.row_to_domain(row)
         
-    async def get_challenge(self, challenge_hash: str) -> Optional[Challenge]:
+    async def get_challenge(self, challenge_hash: str, with_activities: bool = True) -> Optional[Challenge]:
         """ 챌린지 조회하기 """
         async with self.session_factory() as session:
             stmt = (
-                select(ChallengeEntity)
-                .options(selectinload(ChallengeEntity.activities))
+                _select_challenges(with_activities)
                 .where(ChallengeEntity.hash == challenge_hash)
             )
             result = await session.execute(stmt)
-            challenge_entity = result.scalar_one_or_none()
-            if challenge_entity is None:
+            row = result.one_or_none()
+            if row is None:
                 return None
-            return challenge_entity.to_domain()
+            return ChallengeEntity.row_to_domain(row)
         
     async def get_challeges_by_challenger(
         self, 
@@ -50,8 +97,7 @@ class ChallengeRepository:
         """ 유저의 챌린지 목록 가져오기 """
         async with self.session_factory() as session:
             stmt = (
-                select(ChallengeEntity)
-                .options(selectinload(ChallengeEntity.activities))
+                _select_challenges()
                 .where(ChallengeEntity.challenger_address == challenger_address)
             )
             
@@ -60,10 +106,31 @@ class ChallengeRepository:
                 stmt = stmt.where(ChallengeEntity.status.in_(statuses))
             
             result = await session.execute(stmt)
-            challenge_entities = result.scalars().all()
-            challenges = [challenge_entity.to_domain() for challenge_entity in challenge_entities]
-            return challenges
+            return [ChallengeEntity.row_to_domain(row) for row in result.all()]
             
+    async def get_challenges_page(
+        self,
+        challenger_address: str,
+        statuses: List[ChallengeStatus],
+        cursor: Optional[ChallengeCursor],
+        limit: int,
+    ) -> List[Challenge]:
+        """ 유저의 챌린지를 시작일 최신순으로 cursor 다음부터 limit개 가져오기 (keyset pagination) """
+        async with self.session_factory() as session:
+            stmt = (
+                _select_challenges()
+                .where(ChallengeEntity.challenger_address == challenger_address)
+                .where(ChallengeEntity.status.in_([status.value for status in statuses]))
+                .order_by(ChallengeEntity.start_date.desc(), ChallengeEntity.hash.desc())
+                .limit(limit)
+            )
+            if cursor is not None:
+                stmt = stmt.where(
+                    tuple_(ChallengeEntity.start_date, ChallengeEntity.hash) < tuple_(cursor.start_date, cursor.hash)
+                )
+            result = await session.execute(stmt)
+            return [ChallengeEntity.row_to_domain(row) for row in result.all()]
+
     async def create_challenge(self, challenge: Challenge) -> None:
         """ 챌린지 생성하기 """
         async with self.session_factory() as session:
@@ -103,6 +170,82 @@ class ChallengeRepository:
             await session.commit()
             
             
+    async def complete_challenges(self, challenges: List[Challenge]) -> None:
+        """ 여러 OPEN 챌린지를 한 번에 완료하기 (executemany UPDATE 한 번) """
+        await self._update_challenge_results(challenges, only_open=True)
+            
+    async def repair_challenges(self, challenges: List[Challenge]) -> None:
+        """ 블록체인 기준으로 여러 챌린지의 상태와 보상 지급 결과를 한 번에 덮어쓰기 """
+        await self._update_challenge_results(challenges, only_open=False)
+            
+    async def _update_challenge_results(self, challenges: List[Challenge], only_open: bool) -> None:
+        if not challenges:
+            return
+        
+        table = ChallengeEntity.__table__
+        async with self.session_factory() as session:
+            stmt = (
+                update(table)
+                .where(table.c.hash == bindparam('b_hash'))
+                .values(
+                    status=bindparam('b_status'),
+                    payment_transaction=bindparam('b_payment_transaction'),
+                    payment_reward=bindparam('b_payment_reward'),
+                    complete_date=bindparam('b_complete_date'),
+                )
+            )
+            if only_open:
+                stmt = stmt.where(table.c.status == ChallengeStatus.OPEN.value)
+            await session.execute(stmt, [
+                dict(b_hash=challenge.hash,
+                     b_status=challenge.status.value,
+                     b_payment_transaction=challenge.payment_transaction,
+                     b_payment_reward=challenge.payment_reward,
+                     b_complete_date=challenge.complete_date)
+                for challenge in challenges
+            ])
+            await session.commit()
+            
+    async def get_challenges_after(self, after_id: int, limit: int) -> List[Challenge]:
+        """ 블록체인에 등록된 챌린지를 챌린지 ID 순서로 after_id 다음부터 limit개 가져오기 (keyset pagination) """
+        async with self.session_factory() as session:
+            stmt = (
+                _select_challenges()
+                .where(ChallengeEntity.id > after_id)
+                .order_by(ChallengeEntity.id)
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return [ChallengeEntity.row_to_domain(row) for row in result.all()]
+            
+    async def get_completable_challenges(
+        self, 
+        now: datetime,
+        after_id: int = -1,
+        limit: int = 100,
+    ) -> List[Challenge]:
+        """ 완료 처리할 수 있는 OPEN 챌린지 목록 가져오기
+        
+        종료일이 지났거나 완료된 증명 수가 최소 횟수 이상인 챌린지를
+        챌린지 ID 순서로 after_id 다음부터 limit개 가져옵니다. (idx_challenges_status_id)
+        """
+        async with self.session_factory() as session:
+            stmt = (
+                _select_challenges(with_activities=False)
+                .where(
+                    ChallengeEntity.status == ChallengeStatus.OPEN.value,
+                    ChallengeEntity.id > after_id,
+                    or_(
+                        ChallengeEntity.end_date < now,
+                        ChallengeEntity.completed_activity_count >= ChallengeEntity.minimum_activity_count,
+                    ),
+                )
+                .order_by(ChallengeEntity.id)
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return [ChallengeEntity.row_to_domain(row) for row in result.all()]
+            
     async def find_activity(self, challenge_hash: str, activity_hash: str) -> Optional[ChallengeActivity]:
         """ 챌린지 증명 조회하기 """
         async with self.session_factory() as session:
@@ -137,18 +280,26 @@ class ChallengeRepository:
 
 
     async def complete_activity(self, challenge_hash: str, activity: ChallengeActivity) -> None:
-        """ 챌린지 증명 완료하기 """
+        """ 챌린지 증명 완료하기
+        
+        이미 완료된 증명(ex: 인덱서가 먼저 반영)은 그대로 두고, 새로 완료된 경우에만 같은 트랜잭션에서
+        챌린지의 completed_activity_count를 올립니다.
+        """
+        activities = ChallengeActivityEntity.__table__
         async with self.session_factory() as session:
             stmt = (
-                update(ChallengeActivityEntity)
-                .filter(ChallengeActivityEntity.challenge_hash == challenge_hash, 
-                        ChallengeActivityEntity.activity_hash == activity.activity_hash)
+                update(activities)
+                .where(activities.c.challenge_hash == challenge_hash, 
+                       activities.c.activity_hash == activity.activity_hash,
+                       activities.c.activity_transaction.is_(None))
                 .values(
                     activity_transaction=activity.activity_transaction, 
                     activity_date=activity.activity_date
                 )
+                .returning(activities.c.challenge_hash)
             )
-            await session.execute(stmt)
+            result = await session.execute(stmt)
+            await self._count_completed_activities(session, result.scalars().all())
             try:
                 await session.commit()  
             except IntegrityError:
@@ -156,6 +307,324 @@ class ChallengeRepository:
                 raise ClientException(message="이미 동일한 것이 제출되었어요.")
                         
 
+    async def add_submission(self, submission: ActivitySubmission) -> ActivitySubmission:
+        """ 챌린지 증명 제출 요청을 outbox에 추가하기
+        
+        이미 같은 요청이 있으면 그대로 두고, 실패로 끝난 요청만 다시 대기 상태로 되돌립니다.
+        """
+        async with self.session_factory() as session:
+            stmt = insert(ActivitySubmissionEntity).values(
+                challenge_hash=submission.challenge_hash,
+                activity_hash=submission.activity_hash,
+                activity_signature=submission.activity_signature,
+                status=submission.status.value,
+                attempts=submission.attempts,
+                last_error=submission.last_error,
+                next_attempt_at=submission.next_attempt_at,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ActivitySubmissionEntity.challenge_hash, ActivitySubmissionEntity.activity_hash],
+                set_=dict(
+                    activity_signature=stmt.excluded.activity_signature,
+                    status=stmt.excluded.status,
+                    attempts=stmt.excluded.attempts,
+                    last_error=stmt.excluded.last_error,
+                    next_attempt_at=stmt.excluded.next_attempt_at,
+                ),
+                where=ActivitySubmissionEntity.status == SubmissionStatus.FAILED.value,
+            )
+            await session.execute(stmt)
+            await session.commit()
+            
+            return await self.get_submission(submission.challenge_hash, submission.activity_hash)
+        
+    async def find_submission(self, challenge_hash: str, activity_hash: str) -> Optional[ActivitySubmission]:
+        """ 챌린지 증명 제출 요청 조회하기 """
+        async with self.session_factory() as session:
+            stmt = select(ActivitySubmissionEntity).where(
+                ActivitySubmissionEntity.challenge_hash == challenge_hash,
+                ActivitySubmissionEntity.activity_hash == activity_hash,
+            )
+            result = await session.execute(stmt)
+            entity = result.scalar_one_or_none()
+            if entity:
+                return entity.to_domain()
+            return None
+        
+    async def get_submission(self, challenge_hash: str, activity_hash: str) -> ActivitySubmission:
+        """ 챌린지 증명 제출 요청 조회하기 """
+        submission = await self.find_submission(challenge_hash, activity_hash)
+        if submission is None:
+            raise ClientException(message="존재하지 않은 제출 요청이에요.")
+        return submission
+    
+    async def claim_submissions(self, limit: int, lease: timedelta) -> List[ActivitySubmission]:
+        """ 처리할 제출 요청을 가져오기
+        
+        시도 시각이 지난 요청을 FOR UPDATE SKIP LOCKED로 잠그고, lease 동안 다른 워커가 가져가지 못하게 합니다.
+        워커가 처리 도중 종료되면 lease가 지난 뒤 다시 가져갈 수 있습니다.
+        """
+        async with self.session_factory() as session:
+            now = datetime.now(pytz.utc)
+            stmt = (
+                select(ActivitySubmissionEntity)
+                .where(
+                    ActivitySubmissionEntity.status.in_([
+                        SubmissionStatus.PENDING.value, 
+                        SubmissionStatus.PROCESSING.value
+                    ]),
+                    ActivitySubmissionEntity.next_attempt_at <= now,
+                )
+                .order_by(ActivitySubmissionEntity.next_attempt_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(stmt)
+            entities = result.scalars().all()
+            
+            for entity in entities:
+                entity.status = SubmissionStatus.PROCESSING.value
+                entity.attempts += 1
+                entity.next_attempt_at = now + lease
+            submissions = [entity.to_domain() for entity in entities]
+            await session.commit()
+            return submissions
+        
+    async def update_submission(self, submission: ActivitySubmission) -> None:
+        """ 제출 요청의 처리 결과 저장하기 """
+        async with self.session_factory() as session:
+            stmt = (
+                update(ActivitySubmissionEntity)
+                .filter(ActivitySubmissionEntity.challenge_hash == submission.challenge_hash,
+                        ActivitySubmissionEntity.activity_hash == submission.activity_hash)
+                .values(
+                    status=submission.status.value,
+                    attempts=submission.attempts,
+                    last_error=submission.last_error,
+                    next_attempt_at=submission.next_attempt_at,
+                )
+            )
+            await session.execute(stmt)
+            await session.commit()
+                        
+
+    async def repair_activities(self, events: List[ActivitySubmittedEvent]) -> None:
+        """ 블록체인에 제출된 증명을 한 번에 반영하기. DB에 없는 증명은 새로 추가합니다. """
+        async with self.session_factory() as session:
+            await self._upsert_activities(session, events)
+            await session.commit()
+                        
+
+    async def get_checkpoint(self, name: str) -> Optional[int]:
+        """ 마지막으로 반영한 블록 번호 조회하기 """
+        async with self.session_factory() as session:
+            stmt = select(ChainCheckpointEntity.block_number).where(ChainCheckpointEntity.name == name)
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+        
+    async def apply_chain_events(self, name: str, batch: ChainEventBatch) -> None:
+        """ 블록 범위의 이벤트를 한 번에 반영하고, 체크포인트를 갱신하기
+        
+        이벤트 종류별로 하나의 executemany UPDATE를 실행하고, 체크포인트와 같은 트랜잭션으로 커밋합니다.
+        같은 범위를 다시 반영해도 결과가 같습니다.
+        """
+        async with self.session_factory() as session:
+            await self._open_challenges(session, batch.opened)
+            await self._submit_activities(session, batch.submitted)
+            await self._complete_challenges_by_id(session, batch.completed)
+            await self._save_checkpoint(session, name, batch.to_block)
+            await session.commit()
+            
+    async def backfill_chain_events(self, name: str, challenges: List[Challenge], batch: ChainEventBatch) -> None:
+        """ 블록체인 로그로 복원한 챌린지와 이벤트를 한 번에 저장하고, 체크포인트를 갱신하기
+        
+        DB에 없는 챌린지와 증명은 multi-row INSERT로 추가하고, 이미 있는 행은 apply_chain_events와 같이 갱신합니다.
+        """
+        async with self.session_factory() as session:
+            await self._insert_challenges(session, challenges)
+            await self._open_challenges(session, batch.opened)
+            await self._upsert_activities(session, batch.submitted)
+            await self._complete_challenges_by_id(session, batch.completed)
+            await self._save_checkpoint(session, name, batch.to_block)
+            await session.commit()
+            
+    async def _insert_challenges(self, session: AsyncSession, challenges: List[Challenge]) -> None:
+        table = ChallengeEntity.__table__
+        for chunk in _chunks(challenges, INSERT_CHUNK_SIZE):
+            stmt = insert(table).values([
+                dict(hash=challenge.hash,
+                     id=challenge.id,
+                     nonce=challenge.nonce,
+                     status=challenge.status.value,
+                     challenger_address=challenge.challenger_address,
+                     reward_amount=challenge.reward_amount,
+                     title=challenge.title,
+                     type=challenge.type.name,
+                     start_date=challenge.start_date,
+                     end_date=challenge.end_date,
+                     minimum_activity_count=challenge.minimum_activity_count,
+                     payment_transaction=challenge.payment_transaction,
+                     payment_reward=challenge.payment_reward,
+                     complete_date=challenge.complete_date,
+                     completed_activity_count=challenge.completed_activity_count)
+                for challenge in chunk
+            ])
+            await session.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.hash]))
+            
+    async def _open_challenges(self, session: AsyncSession, events: List[ChallengeOpenedEvent]) -> None:
+        if not events:
+            return
+        challenges = ChallengeEntity.__table__
+        stmt = (
+            update(challenges)
+            .where(challenges.c.hash == bindparam('b_hash'),
+                   challenges.c.status == ChallengeStatus.INIT.value)
+            .values(
+                status=ChallengeStatus.OPEN.value,
+                id=bindparam('b_id'),
+                challenger_address=bindparam('b_challenger_address'),
+            )
+        )
+        await session.execute(stmt, [
+            dict(b_hash=event.challenge_hash, 
+                 b_id=event.challenge_id, 
+                 b_challenger_address=event.challenger_address)
+            for event in events
+        ])
+        
+    async def _submit_activities(self, session: AsyncSession, events: List[ActivitySubmittedEvent]) -> None:
+        """ 등록된 증명을 완료 처리하기. 완료 처리된 증명 수만큼 completed_activity_count를 올립니다. """
+        activities = ChallengeActivityEntity.__table__
+        for chunk in _chunks(events, INSERT_CHUNK_SIZE):
+            submitted = values(
+                column('challenge_hash', String),
+                column('activity_hash', String),
+                column('activity_transaction', String),
+                column('activity_date', DateTime(timezone=True)),
+                name='submitted',
+            ).data([
+                (event.challenge_hash, event.activity_hash, event.activity_transaction, event.activity_date)
+                for event in chunk
+            ])
+            stmt = (
+                update(activities)
+                .where(activities.c.challenge_hash == submitted.c.challenge_hash,
+                       activities.c.activity_hash == submitted.c.activity_hash,
+                       activities.c.activity_transaction.is_(None))
+                .values(
+                    activity_transaction=submitted.c.activity_transaction,
+                    activity_date=submitted.c.activity_date,
+                )
+                .returning(activities.c.challenge_hash)
+            )
+            result = await session.execute(stmt)
+            await self._count_completed_activities(session, result.scalars().all())
+        
+    async def _upsert_activities(self, session: AsyncSession, events: List[ActivitySubmittedEvent]) -> None:
+        """ 증명을 블록체인 기준으로 덮어쓰기. DB에 없는 챌린지(ex: 복원하지 못하고 건너뛴 챌린지)의 증명은 넣지 않습니다. """
+        activities = ChallengeActivityEntity.__table__
+        challenges = ChallengeEntity.__table__
+        for chunk in _chunks(events, INSERT_CHUNK_SIZE):
+            submitted = values(
+                column('challenge_hash', String),
+                column('activity_hash', String),
+                column('activity_transaction', String),
+                column('activity_date', DateTime(timezone=True)),
+                name='submitted',
+            ).data([
+                (event.challenge_hash, event.activity_hash, event.activity_transaction, event.activity_date)
+                for event in chunk
+            ])
+            stmt = insert(activities).from_select(
+                ['challenge_hash', 'activity_hash', 'activity_transaction', 'activity_date'],
+                # 증명 취소(NULL)는 타입 없는 NULL로 보내지므로 컬럼 타입으로 바꿉니다
+                select(
+                    submitted.c.challenge_hash,
+                    submitted.c.activity_hash,
+                    cast(submitted.c.activity_transaction, String),
+                    cast(submitted.c.activity_date, DateTime(timezone=True)),
+                ).where(
+                    select(challenges.c.hash).where(challenges.c.hash == submitted.c.challenge_hash).exists()
+                ),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[activities.c.challenge_hash, activities.c.activity_hash],
+                set_=dict(
+                    activity_transaction=stmt.excluded.activity_transaction,
+                    activity_date=stmt.excluded.activity_date,
+                ),
+            )
+            await session.execute(stmt)
+            await self._recount_completed_activities(session, {event.challenge_hash for event in chunk})
+            
+    async def _count_completed_activities(self, session: AsyncSession, challenge_hashes: List[str]) -> None:
+        """ 새로 완료된 증명의 챌린지 해시 목록만큼 completed_activity_count를 올립니다.
+        
+        증명 UPDATE와 같은 트랜잭션에서 더하기로 올리므로, 동시에 완료되어도 개수가 어긋나지 않습니다.
+        """
+        if not challenge_hashes:
+            return
+        challenges = ChallengeEntity.__table__
+        stmt = (
+            update(challenges)
+            .where(challenges.c.hash == bindparam('b_hash'))
+            .values(completed_activity_count=challenges.c.completed_activity_count + bindparam('b_count'))
+        )
+        await session.execute(stmt, [
+            dict(b_hash=challenge_hash, b_count=count)
+            for challenge_hash, count in Counter(challenge_hashes).items()
+        ])
+        
+    async def _recount_completed_activities(self, session: AsyncSession, challenge_hashes: Set[str]) -> None:
+        """ 블록체인 기준으로 덮어쓴 증명은 이전 값을 알 수 없으므로, 해당 챌린지의 completed_activity_count를 다시 셉니다. """
+        activities = ChallengeActivityEntity.__table__
+        challenges = ChallengeEntity.__table__
+        completed_count = (
+            select(func.count())
+            .where(activities.c.challenge_hash == challenges.c.hash,
+                   activities.c.activity_transaction.isnot(None))
+            .scalar_subquery()
+        )
+        stmt = (
+            update(challenges)
+            .where(challenges.c.hash.in_(challenge_hashes))
+            .values(completed_activity_count=completed_count)
+        )
+        await session.execute(stmt)
+            
+    async def _complete_challenges_by_id(self, session: AsyncSession, events: List[ChallengeCompletedEvent]) -> None:
+        if not events:
+            return
+        challenges = ChallengeEntity.__table__
+        stmt = (
+            update(challenges)
+            .where(challenges.c.id == bindparam('b_id'),
+                   challenges.c.status == ChallengeStatus.OPEN.value)
+            .values(
+                status=bindparam('b_status'),
+                payment_transaction=bindparam('b_payment_transaction'),
+                payment_reward=bindparam('b_payment_reward'),
+                complete_date=bindparam('b_complete_date'),
+            )
+        )
+        await session.execute(stmt, [
+            dict(b_id=event.challenge_id,
+                 b_status=event.status.value,
+                 b_payment_transaction=event.payment_transaction,
+                 b_payment_reward=event.payment_reward,
+                 b_complete_date=event.complete_date)
+            for event in events
+        ])
+        
+    async def _save_checkpoint(self, session: AsyncSession, name: str, block_number: int) -> None:
+        stmt = insert(ChainCheckpointEntity).values(name=name, block_number=block_number)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChainCheckpointEntity.name],
+            set_=dict(block_number=stmt.excluded.block_number),
+        )
+        await session.execute(stmt)
+                        
+
     async def _exist_challenge(self, challenge_hash: str, session: AsyncSession) -> bool:
         stmt = select(ChallengeEntity).where(ChallengeEntity.hash == challenge_hash)
         result = await session.execute(stmt)
@@ -1,8 +1,9 @@
+import base64
 from dataclasses import dataclass
 from decimal import Decimal
 import random
 from typing import Dict, List, Literal, Optional, Union
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytz
 from src.exceptions import ClientException
 from web3 import Web3
@@ -40,6 +41,8 @@ class Challenge:
     payment_reward: int = 0
     complete_date: Optional[datetime] = None
     
+    completed_activity_count: int = 0 # 블록체인에 제출된 증명 수 (activities를 불러오지 않아도 알 수 있도록 DB에 저장)
+    
     @staticmethod
     def new(
         nonce: int,
@@ -99,18 +102,15 @@ class Challenge:
         return (
             self.status == ChallengeStatus.OPEN
             and self.end_date >= datetime.now(pytz.utc)
-            and len(self._completed_activites()) < self.minimum_activity_count
+            and self.completed_activity_count < self.minimum_activity_count
         )   
         
-    def _completed_activites(self) -> List[str]:
-        return [activity.activity_hash for activity in self.activities if activity.is_completed()]
-        
     def available_to_complete(self) -> bool:
         """ 챌린지 완료 처리 가능한지 여부 """
         if self.status != ChallengeStatus.OPEN:
             return False
         
-        if len(self._completed_activites()) >= self.minimum_activity_count:
+        if self.completed_activity_count >= self.minimum_activity_count:
             return True
         
         return self.end_date < datetime.now(pytz.utc)
@@ -177,6 +177,127 @@ class ChallengeActivity:
         self.activity_transaction = activity_transaction
         self.activity_date = activity_date
 
+
+@dataclass
+class ChallengeCursor:
+    """ 챌린지 목록 페이지 커서. 마지막으로 내려준 챌린지의 (start_date, hash) """
+    start_date: datetime
+    hash: str
+
+    def encode(self) -> str:
+        value = f"{self.start_date.isoformat()}|{self.hash}"
+        return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> "ChallengeCursor":
+        try:
+            value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            start_date, hash = value.split("|")
+            return ChallengeCursor(start_date=datetime.fromisoformat(start_date), hash=hash)
+        except ValueError:
+            raise ClientException(message=f"Invalid cursor {cursor}")
+
+
+@dataclass
+class ChallengePage:
+    """ 챌린지 목록 한 페이지 """
+    challenges: List[Challenge]
+    next_cursor: Optional[str] # 마지막 페이지이면 None
+
+
+class SubmissionStatus(Enum):
+    """ 챌린지 수행 증명 제출 상태 """
+    PENDING = 'PENDING' # 제출 대기 중인 상태
+    PROCESSING = 'PROCESSING' # 워커가 제출 중인 상태
+    SUCCESS = 'SUCCESS' # 블록체인에 등록된 상태
+    FAILED = 'FAILED' # 재시도 횟수를 모두 소진한 상태
+
+
+@dataclass
+class ActivitySubmission:
+    """ 챌린지 수행 증명 제출 요청 (outbox) """
+    challenge_hash: str
+    activity_hash: str
+    activity_signature: str
+    status: SubmissionStatus
+    
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    
+    @staticmethod
+    def new(challenge_hash: str, activity_hash: str, activity_signature: str) -> "ActivitySubmission":
+        return ActivitySubmission(
+            challenge_hash=challenge_hash,
+            activity_hash=activity_hash,
+            activity_signature=activity_signature,
+            status=SubmissionStatus.PENDING,
+            attempts=0,
+            last_error=None,
+            next_attempt_at=datetime.now(pytz.utc),
+        )
+        
+    def is_finished(self) -> bool:
+        return self.status == SubmissionStatus.SUCCESS or self.status == SubmissionStatus.FAILED
+    
+    def succeed(self):
+        self.status = SubmissionStatus.SUCCESS
+        self.last_error = None
+        
+    def fail(self, error: str):
+        self.status = SubmissionStatus.FAILED
+        self.last_error = error
+        
+    def retry_or_fail(self, error: str, max_attempts: int, backoff: timedelta):
+        """ 재시도 횟수가 남아 있으면 backoff * attempts 뒤에 다시 시도합니다. """
+        self.last_error = error
+        if self.attempts >= max_attempts:
+            self.status = SubmissionStatus.FAILED
+        else:
+            self.status = SubmissionStatus.PENDING
+            self.next_attempt_at = datetime.now(pytz.utc) + backoff * self.attempts
+
+
+@dataclass
+class ChallengeOpenedEvent:
+    """ 챌린지 생성 이벤트 (ChallengeCreated) """
+    challenge_hash: str
+    challenge_id: int
+    challenger_address: str
+
+
+@dataclass
+class ActivitySubmittedEvent:
+    """ 챌린지 수행 증명 제출 이벤트 (SubmitActivity) """
+    challenge_hash: str
+    activity_hash: str
+    activity_transaction: str
+    activity_date: datetime
+
+
+@dataclass
+class ChallengeCompletedEvent:
+    """ 챌린지 완료 이벤트 (ChallengeCompleted) """
+    challenge_id: int
+    status: ChallengeStatus
+    payment_transaction: str
+    payment_reward: int
+    complete_date: datetime
+
+
+@dataclass
+class ChainEventBatch:
+    """ 블록 범위 [from_block, to_block]에서 수집한 이벤트 묶음 """
+    from_block: int
+    to_block: int
+    opened: List[ChallengeOpenedEvent]
+    submitted: List[ActivitySubmittedEvent]
+    completed: List[ChallengeCompletedEvent]
+    
+    def is_empty(self) -> bool:
+        return not self.opened and not self.submitted and not self.completed
+
+
 @dataclass
 class ChallengeSignature:
     """ 챌린지 서명 도메인 """
@@ -1,6 +1,7 @@
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Optional
 from src.database.repository import ChallengeRepository
+from src.registry.batch import TransactionBatcher
 from src.domains import Challenge, ChallengeActivity
 from src.exceptions import ClientException
 from src.registry.grader import ActivityGrader
@@ -28,12 +29,14 @@ class ActivityRegistryService:
         transaction: TransactionManager,
         storage: ObjectRepository,
         grader: ActivityGrader,
+        batcher: TransactionBatcher,
     ):
         self.repository = repository
         self.transaction = transaction
         self.storage = storage
         self.grader = grader
-        self.submit_activity_function = transaction.oguogu_contract().functions.submitActivity        
+        self.batcher = batcher
+        self.submit_activity_function = transaction.aoguogu_contract().functions.submitActivity        
         
     async def find_activity(self, challenge_hash: str, activity_hash: str) -> Optional[ChallengeActivity]:
         return await self.repository.find_activity(challenge_hash, activity_hash)
@@ -76,7 +79,7 @@ class ActivityRegistryService:
         
         activity = await self.repository.get_activity(challenge.hash, activity_hash)
         
-        tx_receipt = await self.transaction.asend_transaction(request)
+        tx_receipt = await self.batcher.submit(request)
         activity_date = await self.transaction.aget_txreceipt_datetime(tx_receipt)
         
         tx_hash = tx_receipt['transactionHash'].to_0x_hex()
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+import time
+from typing import Dict, List, Optional, Set
+import pytz
+from src.database.repository import ChallengeRepository
+from src.domains import ChainEventBatch, Challenge, ChallengeType
+from src.registry.indexer import INDEXED_EVENTS, ChainIndexer
+from src.registry.transaction import TransactionManager
+from src.settings import Settings
+from web3 import Web3
+from web3.types import EventData, LogReceipt, RPCEndpoint
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillReport:
+    from_block: int = 0
+    to_block: int = -1
+    blocks: int = 0
+    challenges: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ChainBackfill:
+    """ 블록체인 로그로 DB 복원하기
+
+    컨트랙트 배포 블록(INDEXER_START_BLOCK)부터 block_range 크기의 블록 범위를 workers개씩 동시에 eth_getLogs로 가져와서,
+    ChallengeCreated 이벤트의 createChallenge 호출 데이터로 챌린지 행을 만들고 나머지 이벤트는 ChainIndexer와 같이 반영합니다.
+    workers개 범위를 한 번의 DB 트랜잭션으로 저장하면서 체크포인트를 갱신하므로, 중단되어도 이어서 실행할 수 있습니다.
+    """
+    CHECKPOINT_NAME = "backfill"
+
+    def __init__(
+        self,
+        repository: ChallengeRepository,
+        transaction: TransactionManager,
+        indexer: ChainIndexer,
+        settings: Settings,
+    ):
+        self.repository = repository
+        self.transaction = transaction
+        self.indexer = indexer
+        self.aweb3 = transaction.aweb3
+        self.decoder = transaction.event_decoder
+        self.contract = transaction.aoguogu_contract()
+        self.address = settings.OGUOGU_ADDRESS
+        self.start_block = settings.INDEXER_START_BLOCK
+        self.confirmations = settings.INDEXER_CONFIRMATIONS
+        self.block_range = settings.BACKFILL_RANGE
+        self.workers = settings.BACKFILL_WORKERS
+        self.batch_size = settings.RPC_BATCH_SIZE
+        self.topics = [self.decoder.topic(name).to_0x_hex() for name in INDEXED_EVENTS]
+        self._skipped: Set[str] = set() # 이번 실행에서 건너뛴 챌린지. 이전 실행에서 건너뛴 챌린지의 증명은 DB에서 걸러집니다
+
+    async def run(self, to_block: Optional[int] = None) -> BackfillReport:
+        checkpoint = await self.repository.get_checkpoint(self.CHECKPOINT_NAME)
+        from_block = self.start_block if checkpoint is None else checkpoint + 1
+        if to_block is None:
+            to_block = await self.aweb3.eth.block_number - self.confirmations
+
+        report = BackfillReport(from_block=from_block, to_block=to_block)
+        start = time.monotonic()
+        while from_block <= to_block:
+            ranges = [
+                (block, min(block + self.block_range - 1, to_block))
+                for block in range(from_block, to_block + 1, self.block_range)
+            ][:self.workers]
+            results = await asyncio.gather(*[self.get_logs(first, last) for first, last in ranges])
+            window_end = ranges[-1][1]
+
+            events = self.decoder.decode_logs([log for logs in results for log in logs])
+            challenges = await self.build_challenges([event for event in events if event['event'] == "ChallengeCreated"])
+            batch = await self.indexer.build_batch(from_block, window_end, [
+                event for event in events
+                if Web3.to_hex(event['args'].get('challengeHash', b'')) not in self._skipped
+            ])
+            await self.repository.backfill_chain_events(self.CHECKPOINT_NAME, challenges, batch)
+
+            report.blocks += window_end - from_block + 1
+            report.challenges += len(challenges)
+            report.elapsed = time.monotonic() - start
+            logger.info(f"backfilled blocks {from_block}-{window_end} challenges={len(challenges)} "
+                        f"({report.blocks_per_second:.0f} blocks/s)")
+            from_block = window_end + 1
+        report.skipped = len(self._skipped)
+        report.elapsed = time.monotonic() - start
+        return report
+
+    async def get_logs(self, from_block: int, to_block: int, topics: Optional[List[str]] = None) -> List[LogReceipt]:
+        """ 노드가 거절하면 범위를 반으로 나눠서 가져옵니다. topics가 없으면 인덱싱하는 모든 이벤트를 가져옵니다. """
+        topics = self.topics if topics is None else topics
+        try:
+            return await self.aweb3.eth.get_logs({
+                'fromBlock': from_block,
+                'toBlock': to_block,
+                'address': self.address,
+                'topics': [topics],
+            })
+        except Exception as e:
+            if from_block == to_block:
+                raise
+            middle = (from_block + to_block) // 2
+            logger.info(f"eth_getLogs failed for {from_block}-{to_block}, split range: {e}")
+            first, second = await asyncio.gather(
+                self.get_logs(from_block, middle, topics),
+                self.get_logs(middle + 1, to_block, topics),
+            )
+            return first + second
+
+    async def build_challenges(self, events: List[EventData]) -> List[Challenge]:
+        """ ChallengeCreated 이벤트의 트랜잭션 호출 데이터(createChallenge)로 챌린지를 만듭니다. """
+        if not events:
+            return []
+
+        inputs = await self.get_transaction_inputs([event['transactionHash'].to_0x_hex() for event in events])
+        challenges = []
+        for event in events:
+            args = event['args']
+            challenge_hash = Web3.to_hex(args['challengeHash'])
+            try:
+                func, params = self.contract.decode_function_input(inputs[event['transactionHash'].to_0x_hex()])
+                if func.fn_name != "createChallenge":
+                    raise ValueError(f"unexpected function {func.fn_name}")
+                challenge = Challenge.new(
+                    nonce=params['nonce'],
+                    challenger_address=args['challenger'],
+                    reward_amount=params['reward'],
+                    title=params['title'],
+                    type=ChallengeType(params['challengeType']),
+                    start_date=datetime.fromtimestamp(params['startDate'], tz=pytz.utc),
+                    end_date=datetime.fromtimestamp(params['endDate'], tz=pytz.utc),
+                    minimum_activity_count=params['minimumActivityCount'],
+                )
+                if challenge.hash != challenge_hash:
+                    raise ValueError(f"challenge hash mismatch {challenge.hash}")
+            except Exception as e:
+                # 다른 컨트랙트를 거쳐서 생성된 챌린지 등은 호출 데이터를 알 수 없으므로 건너뜁니다
+                logger.warning(f"Failed to restore challenge {args['tokenId']} {challenge_hash}: {e}")
+                self._skipped.add(challenge_hash)
+                continue
+            challenge.open(args['tokenId'], args['challenger'])
+            challenges.append(challenge)
+        return challenges
+
+    async def get_transaction_inputs(self, tx_hashes: List[str]) -> Dict[str, str]:
+        """ 트랜잭션 호출 데이터를 batch_size개씩 나눈 배치 요청으로 동시에 가져옵니다. """
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+        chunks = [tx_hashes[index:index + self.batch_size] for index in range(0, len(tx_hashes), self.batch_size)]
+        results = await asyncio.gather(*[self._get_transaction_inputs(chunk) for chunk in chunks])
+        return {tx_hash: tx_input for result in results for tx_hash, tx_input in result.items()}
+
+    async def _get_transaction_inputs(self, tx_hashes: List[str]) -> Dict[str, str]:
+        responses = await self.aweb3.provider.make_batch_request([
+            (RPCEndpoint("eth_getTransactionByHash"), [tx_hash]) for tx_hash in tx_hashes
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Failed to fetch transactions: {responses.get('error')}")
+        return {
+            tx_hash: response["result"]["input"]
+            for tx_hash, response in zip(tx_hashes, responses)
+            if response.get("result")
+        }
+
+
+async def main(to_block: Optional[int]):
+    from src.registry.container import RegistryContainer
+
+    backfill = RegistryContainer().backfill()
+    report = await backfill.run(to_block)
+    print(f"blocks={report.from_block}-{report.to_block} challenges={report.challenges} skipped={report.skipped} "
+          f"elapsed={report.elapsed:.1f}s ({report.blocks_per_second:.0f} blocks/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="블록체인 로그로 챌린지 DB를 복원합니다.")
+    parser.add_argument("--to-block", type=int, default=None, help="복원할 마지막 블록 (기본: 최신 블록 - INDEXER_CONFIRMATIONS)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.to_block))
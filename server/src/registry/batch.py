@@ -0,0 +1,69 @@
+import asyncio
+from typing import List, Optional, Set, Tuple, Union
+from src.registry.transaction import TransactionManager
+from web3.contract.async_contract import AsyncContractFunction
+from web3.contract.contract import ContractFunction
+from web3.types import TxReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionBatcher:
+    """ operator 트랜잭션 묶음 전송기
+
+    window(초) 동안 또는 max_size개까지 모인 요청을 TransactionManager.asend_transactions로 한 번에 전송하고,
+    각 호출자에게 자신의 트랜잭션 결과만 돌려줍니다. 한 요청이 실패해도 같은 묶음의 다른 요청은 영향을 받지 않습니다.
+    """
+    def __init__(
+        self,
+        transaction: TransactionManager,
+        window: float,
+        max_size: int,
+    ):
+        self.transaction = transaction
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[Union[AsyncContractFunction, ContractFunction], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Set[asyncio.Task] = set()
+
+    async def submit(self, func: Union[AsyncContractFunction, ContractFunction]) -> TxReceipt:
+        """ 트랜잭션 요청을 묶음에 추가하고, 전송된 트랜잭션의 영수증을 기다립니다. """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._send(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _send(self, batch: List[Tuple[Union[AsyncContractFunction, ContractFunction], asyncio.Future]]):
+        logger.info(f"send transaction batch size={len(batch)}")
+        try:
+            results = await self.transaction.asend_transactions([func for func, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+import threading
+from typing import Optional, Tuple, Union
+from hexbytes import HexBytes
+from web3.types import BlockData
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BlockTimestampCache:
+    """ 블록 번호 → 블록 타임스탬프 LRU 캐시
+
+    블록 해시를 함께 저장해서, 조회할 때 해시가 다르면(reorg로 바뀐 블록) 캐시를 사용하지 않습니다.
+    새 최신 블록이 관측되었을 때 체인이 이어지지 않으면, 새 최신 블록과 그 조상 중 confirmation_depth개까지의
+    확정되지 않은 블록을 캐시에서 제거합니다.
+    """
+    def __init__(self, maxsize: int, confirmation_depth: int):
+        self.maxsize = maxsize
+        self.confirmation_depth = confirmation_depth
+        self.hits = 0
+        self.misses = 0
+        self._blocks: "OrderedDict[int, Tuple[HexBytes, int]]" = OrderedDict()
+        self._head: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, block_number: int, block_hash: Union[bytes, str, None] = None) -> Optional[int]:
+        with self._lock:
+            timestamp = self._lookup(block_number, block_hash)
+            if timestamp is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return timestamp
+
+    def contains(self, block_number: int, block_hash: Union[bytes, str, None] = None) -> bool:
+        with self._lock:
+            return self._lookup(block_number, block_hash) is not None
+
+    def put(self, block_number: int, block_hash: Union[bytes, str], timestamp: int) -> None:
+        with self._lock:
+            self._blocks[block_number] = (HexBytes(block_hash), timestamp)
+            self._blocks.move_to_end(block_number)
+            while len(self._blocks) > self.maxsize:
+                self._blocks.popitem(last=False)
+
+    def observe_head(self, block: BlockData) -> None:
+        """ 새로 관측한 최신 블록을 캐시에 넣고, reorg가 감지되면 확정되지 않은 블록을 제거합니다. """
+        number = block['number']
+        with self._lock:
+            reorged = self._head is not None and number < self._head
+            if (cached := self._blocks.get(number)) is not None and cached[0] != HexBytes(block['hash']):
+                reorged = True
+            if (parent := self._blocks.get(number - 1)) is not None and parent[0] != HexBytes(block['parentHash']):
+                reorged = True
+            if reorged:
+                self._invalidate_above(number - 1 - self.confirmation_depth)
+            self._head = number
+        self.put(number, block['hash'], block['timestamp'])
+
+    @property
+    def head(self) -> Optional[int]:
+        """ 마지막으로 관측한 최신 블록 번호 """
+        return self._head
+
+    def invalidate_above(self, block_number: int) -> None:
+        """ block_number보다 높은 블록을 캐시에서 제거합니다. """
+        with self._lock:
+            self._invalidate_above(block_number)
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def _lookup(self, block_number: int, block_hash: Union[bytes, str, None]) -> Optional[int]:
+        cached = self._blocks.get(block_number)
+        if cached is None:
+            return None
+        if block_hash is not None and cached[0] != HexBytes(block_hash):
+            return None
+        self._blocks.move_to_end(block_number)
+        return cached[1]
+
+    def _invalidate_above(self, block_number: int) -> None:
+        stale = [number for number in self._blocks if number > block_number]
+        for number in stale:
+            del self._blocks[number]
+        if stale:
+            logger.info(f"block timestamp cache invalidated {len(stale)} blocks above {block_number}")
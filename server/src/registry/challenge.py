@@ -1,7 +1,7 @@
 from typing import List, Optional
 from eth_typing import ChecksumAddress
 from src.database.repository import ChallengeRepository
-from src.domains import Challenge, ChallengeSignature, ChallengeStatus
+from src.domains import Challenge, ChallengeCursor, ChallengePage, ChallengeSignature, ChallengeStatus
 from src.exceptions import ClientException
 from src.registry.transaction import TransactionManager
 from web3 import Web3
@@ -31,7 +31,6 @@ class ChallengeRegistryService:
     ):
         self.repository = repository
         self.transaction = transaction
-        self.challenge_created_event = transaction.oguogu_contract().events.ChallengeCreated()
         
     async def get_user_challenge(
         self, 
@@ -44,14 +43,14 @@ class ChallengeRegistryService:
         return challenge
     
     async def find_challenge(
-        self, challenge_hash: str
+        self, challenge_hash: str, with_activities: bool = True
     ) -> Optional[Challenge]:
-        return await self.repository.get_challenge(challenge_hash)
+        return await self.repository.get_challenge(challenge_hash, with_activities)
         
     async def get_challenge(
-        self, challenge_hash: str
+        self, challenge_hash: str, with_activities: bool = True
     ) -> Challenge:
-        challenge = await self.find_challenge(challenge_hash)
+        challenge = await self.find_challenge(challenge_hash, with_activities)
         if challenge is None:
             raise ClientException(message=f"Challenge {challenge_hash} not found")
         return challenge
@@ -59,18 +58,27 @@ class ChallengeRegistryService:
     async def get_active_challenges(
         self,
         user_address: str,
-    ) -> List[Challenge]:
-        challenges = await self.repository.get_challeges_by_challenger(
-            user_address, 
-            [ChallengeStatus.OPEN, 
-             ChallengeStatus.SUCCESS, 
-             ChallengeStatus.FAILED]
-        )
-        return sorted(
-            challenges, 
-            key=lambda x: x.start_date, 
-            reverse=True
+        statuses: Optional[List[ChallengeStatus]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> ChallengePage:
+        """ 유저의 챌린지 목록을 시작일 최신순으로 limit개씩 가져옵니다. (서명만 된 INIT 챌린지는 제외) """
+        active_statuses = [ChallengeStatus.OPEN, ChallengeStatus.SUCCESS, ChallengeStatus.FAILED]
+        if statuses is not None:
+            active_statuses = [status for status in active_statuses if status in statuses]
+        
+        # 한 개 더 가져와서 다음 페이지가 있는지 확인
+        challenges = await self.repository.get_challenges_page(
+            user_address,
+            active_statuses,
+            ChallengeCursor.decode(cursor) if cursor else None,
+            limit + 1,
         )
+        next_cursor = None
+        if len(challenges) > limit:
+            challenges = challenges[:limit]
+            next_cursor = ChallengeCursor(challenges[-1].start_date, challenges[-1].hash).encode()
+        return ChallengePage(challenges=challenges, next_cursor=next_cursor)
         
     async def sign_new_challenge(
         self, 
@@ -102,13 +110,22 @@ class ChallengeRegistryService:
     async def register_challenge(
         self, 
         transaction_hash: str,
+        challenge_hash: Optional[str] = None,
     ):
-        """ 챌린지를 서버에 등록합니다. """
+        """ 챌린지를 서버에 등록합니다.
+        
+        인덱서가 이미 ChallengeCreated 이벤트를 반영했다면 트랜잭션 영수증을 조회하지 않습니다.
+        """
         logger.info(f"Opening challenge {transaction_hash}")
         
+        if challenge_hash is not None:
+            challenge = await self.repository.get_challenge(challenge_hash)
+            if challenge is not None and challenge.status != ChallengeStatus.INIT:
+                return
+        
         events = await self.transaction.aget_events_from_transcation(
             transaction_hash,
-            self.challenge_created_event
+            "ChallengeCreated"
             )
 
         for event in events:
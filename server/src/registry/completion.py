@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+import pytz
+from src.database.database import SessionManager
+from src.database.repository import ChallengeRepository
+from src.registry.reward import ChallengeRewardService
+from src.settings import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 서버(워커)가 여러 개여도 챌린지 완료는 한 곳에서만 실행되도록 잡는 advisory lock 키
+COMPLETION_LOCK_ID = 4848_0002
+
+
+class ChallengeCompletionScheduler:
+    """ 종료된 챌린지 자동 완료 스케줄러
+
+    interval초마다 종료일이 지났거나 최소 증명 횟수를 채운 OPEN 챌린지를 batch_size개씩 챌린지 ID 순서로 가져와서
+    ChallengeRewardService.complete_challenges로 한 번에 완료합니다.
+    한 번에 전송하는 트랜잭션 수는 batch_size로 제한되고, 완료하지 못한 챌린지는 다음 주기에 다시 시도합니다.
+    워커마다 operator 계정의 nonce를 따로 관리하므로, 주기마다 advisory lock을 잡은 워커만 완료합니다.
+    """
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        repository: ChallengeRepository,
+        reward: ChallengeRewardService,
+        settings: Settings,
+    ):
+        self.session_manager = session_manager
+        self.repository = repository
+        self.reward = reward
+        self.interval = settings.COMPLETION_INTERVAL
+        self.batch_size = settings.COMPLETION_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+
+    async def complete_once(self) -> int:
+        """ 완료할 수 있는 챌린지를 모두 완료하고, 완료한 챌린지 수를 반환합니다. """
+        now = datetime.now(pytz.utc)
+        after_id = -1
+        completed = 0
+        while True:
+            challenges = await self.repository.get_completable_challenges(now, after_id, self.batch_size)
+            if not challenges:
+                break
+            after_id = challenges[-1].id
+            completed += len(await self.reward.complete_challenges(challenges))
+            if len(challenges) < self.batch_size:
+                break
+
+        if completed:
+            logger.info(f"completed {completed} challenges")
+        return completed
+
+    async def run_once(self) -> int:
+        """ advisory lock을 잡으면 complete_once를 실행합니다. 다른 워커가 완료 중이면 0을 반환합니다. """
+        async with self.session_manager.try_advisory_lock(COMPLETION_LOCK_ID) as acquired:
+            if not acquired:
+                return 0
+            return await self.complete_once()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Failed to complete challenges: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
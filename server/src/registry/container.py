@@ -2,8 +2,14 @@ from dependency_injector import containers, providers
 
 from src.database.container import DataBaseContainer
 from src.registry.challenge import ChallengeRegistryService
+from src.registry.completion import ChallengeCompletionScheduler
 from src.registry.grader import ActivityGrader
+from src.registry.indexer import ChainIndexer
 from src.registry.activity import ActivityRegistryService
+from src.registry.backfill import ChainBackfill
+from src.registry.batch import TransactionBatcher
+from src.registry.outbox import ActivitySubmissionOutbox
+from src.registry.reconcile import ChainReconciler
 from src.registry.reward import ChallengeRewardService
 from src.registry.transaction import TransactionManager
 from src.settings import Settings
@@ -20,6 +26,11 @@ class RegistryContainer(containers.DeclarativeContainer):
     grader = providers.Singleton(ActivityGrader, 
                                  settings=settings)
     
+    activity_batcher = providers.Singleton(TransactionBatcher,
+                                           transaction=transaction,
+                                           window=settings.provided.ACTIVITY_BATCH_WINDOW,
+                                           max_size=settings.provided.ACTIVITY_BATCH_SIZE)
+    
     registry = providers.Singleton(ChallengeRegistryService, 
                                    repository=database.repository,
                                    transaction=transaction)
@@ -28,8 +39,38 @@ class RegistryContainer(containers.DeclarativeContainer):
                                    repository=database.repository,
                                     transaction=transaction,
                                     storage=storage.repository,
-                                    grader=grader)
+                                    grader=grader,
+                                    batcher=activity_batcher)
+
+    outbox = providers.Singleton(ActivitySubmissionOutbox,
+                                 repository=database.repository,
+                                 activity=activity,
+                                 settings=settings)
+
+    indexer = providers.Singleton(ChainIndexer,
+                                  session_manager=database.session_manager,
+                                  repository=database.repository,
+                                  transaction=transaction,
+                                  settings=settings)
 
     reward = providers.Singleton(ChallengeRewardService, 
                                  repository=database.repository,
                                  transaction=transaction)
+
+    completion = providers.Singleton(ChallengeCompletionScheduler,
+                                      session_manager=database.session_manager,
+                                      repository=database.repository,
+                                      reward=reward,
+                                      settings=settings)
+
+    backfill = providers.Singleton(ChainBackfill,
+                                   repository=database.repository,
+                                   transaction=transaction,
+                                   indexer=indexer,
+                                   settings=settings)
+
+    reconciler = providers.Singleton(ChainReconciler,
+                                     repository=database.repository,
+                                     transaction=transaction,
+                                     backfill=backfill,
+                                     settings=settings)
@@ -0,0 +1,63 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from eth_abi.codec import ABICodec
+from eth_typing import ABIEvent
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3._utils.events import get_event_data
+from web3.types import EventData, LogReceipt, TxReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EventDecoder:
+    """ Oguogu 컨트랙트 이벤트 디코더
+
+    ABI의 모든 이벤트에 대해 topic0 → 이벤트 ABI를 미리 계산해 두고,
+    컨트랙트 주소와 topic0가 맞지 않는 로그는 ABI 디코딩 없이 건너뜁니다.
+    (ex: USDT Transfer, 같은 트랜잭션의 다른 컨트랙트 로그)
+    """
+    def __init__(self, codec: ABICodec, address: str, abi: Sequence[Dict[str, Any]]):
+        self.codec = codec
+        self.address = HexBytes(address)
+        self.events: Dict[HexBytes, ABIEvent] = {
+            HexBytes(event_abi_to_log_topic(event_abi)): event_abi
+            for event_abi in abi
+            if event_abi['type'] == 'event' and not event_abi.get('anonymous', False)
+        }
+        self.topics: Dict[str, HexBytes] = {
+            event_abi['name']: topic for topic, event_abi in self.events.items()
+        }
+
+    def topic(self, event_name: str) -> HexBytes:
+        """ 이벤트 이름의 topic0를 반환합니다. """
+        return self.topics[event_name]
+
+    def decode_log(self, log: LogReceipt, topics: Optional[Iterable[HexBytes]] = None) -> Optional[EventData]:
+        """ 로그 하나를 디코딩합니다. Oguogu 이벤트가 아니면 None을 반환합니다. """
+        if not log['topics'] or HexBytes(log['address']) != self.address:
+            return None
+        topic0 = HexBytes(log['topics'][0])
+        if topics is not None and topic0 not in topics:
+            return None
+        event_abi = self.events.get(topic0)
+        if event_abi is None:
+            return None
+        return get_event_data(self.codec, event_abi, log)
+
+    def decode_logs(self, logs: Iterable[LogReceipt], *event_names: str) -> List[EventData]:
+        """ 로그들을 한 번에 디코딩합니다. event_names가 주어지면 해당 이벤트만 반환합니다. """
+        topics = {self.topics[name] for name in event_names} if event_names else None
+        events = []
+        for log in logs:
+            try:
+                event = self.decode_log(log, topics)
+            except Exception as e:
+                logger.warning(f"Failed to decode log {log}: {e}")
+                continue
+            if event is not None:
+                events.append(event)
+        return events
+
+    def decode_receipt(self, receipt: TxReceipt, *event_names: str) -> List[EventData]:
+        return self.decode_logs(receipt['logs'], *event_names)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple, Union
+from src.registry.block import BlockTimestampCache
+from web3 import AsyncWeb3
+from web3.contract.async_contract import AsyncContractFunction
+from web3.contract.contract import ContractFunction
+from web3.types import TxParams, TxReceipt, Wei
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FeeOracle:
+    """ 트랜잭션 수수료 / gas 오라클
+
+    - chain id는 한 번만 조회합니다.
+    - base fee와 priority fee는 eth_feeHistory로 조회해 두고, 새 블록이 관측되거나(block_cache의 최신 블록)
+      max_age초가 지나면 다음 요청 때 한 번만 다시 조회합니다.
+    - gas는 상태에 따라 달라지므로(ex: 보상 지급 여부, 증명 수) 매번 추정하고 margin을 곱해서 사용합니다.
+      (컨트랙트 주소, 함수 selector)별로 실제 사용한 gas를 기억해서 하한으로만 사용합니다.
+    """
+    def __init__(
+        self,
+        aweb3: AsyncWeb3,
+        block_cache: BlockTimestampCache,
+        max_age: float,
+        history_blocks: int,
+        priority_percentile: float,
+        base_fee_multiplier: float,
+        gas_margin: float,
+    ):
+        self.aweb3 = aweb3
+        self.block_cache = block_cache
+        self.max_age = max_age
+        self.history_blocks = history_blocks
+        self.priority_percentile = priority_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+        self.gas_margin = gas_margin
+
+        self._chain_id: Optional[int] = None
+        self._fees: Optional[Tuple[Wei, Wei]] = None
+        self._fees_block: int = -1
+        self._fees_updated_at: float = 0.0
+        self._gas: Dict[Tuple[str, str], int] = {}
+        self._lock = asyncio.Lock()
+
+    async def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = await self.aweb3.eth.chain_id
+        return self._chain_id
+
+    async def fees(self) -> Tuple[Wei, Wei]:
+        """ (maxFeePerGas, maxPriorityFeePerGas)를 반환합니다. """
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self.refresh()
+        return self._fees
+
+    async def refresh(self):
+        history = await self.aweb3.eth.fee_history(self.history_blocks, 'latest', [self.priority_percentile])
+        # baseFeePerGas의 마지막 값은 다음 블록의 base fee입니다
+        base_fee = history['baseFeePerGas'][-1]
+        rewards = sorted(reward[0] for reward in history['reward'] if reward)
+        if rewards:
+            priority_fee = rewards[len(rewards) // 2]
+        else:
+            priority_fee = await self.aweb3.eth.max_priority_fee
+
+        self._fees = (Wei(int(base_fee * self.base_fee_multiplier) + priority_fee), Wei(priority_fee))
+        self._fees_block = history['oldestBlock'] + len(history['gasUsedRatio']) - 1
+        self._fees_updated_at = time.monotonic()
+        logger.info(f"fee refreshed block={self._fees_block} max_fee={self._fees[0]} priority_fee={self._fees[1]}")
+
+    async def estimate_gas(
+        self,
+        func: Union[AsyncContractFunction, ContractFunction],
+        transaction: TxParams,
+    ) -> int:
+        if isinstance(func, AsyncContractFunction):
+            estimated = await func.estimate_gas(transaction)
+        else:
+            estimated = await asyncio.to_thread(func.estimate_gas, transaction)
+        return max(int(estimated * self.gas_margin), self._gas.get(self._gas_key(func), 0))
+
+    def observe_receipt(
+        self,
+        func: Union[AsyncContractFunction, ContractFunction],
+        transaction: TxParams,
+        receipt: TxReceipt,
+    ):
+        """ 실제 사용한 gas로 gas 하한을 올립니다. """
+        key = self._gas_key(func)
+        if receipt['status'] != 1 and receipt['gasUsed'] >= transaction['gas']:
+            # gas 부족으로 실패했을 수 있으므로 보낸 gas보다 많이 사용합니다
+            needed = int(transaction['gas'] * self.gas_margin)
+        else:
+            needed = int(receipt['gasUsed'] * self.gas_margin)
+        if needed > self._gas.get(key, 0):
+            self._gas[key] = needed
+
+    def _is_stale(self) -> bool:
+        if self._fees is None:
+            return True
+        if time.monotonic() - self._fees_updated_at > self.max_age:
+            return True
+        head = self.block_cache.head
+        return head is not None and head > self._fees_block
+
+    @staticmethod
+    def _gas_key(func: Union[AsyncContractFunction, ContractFunction]) -> Tuple[str, str]:
+        return func.address, func.selector
@@ -0,0 +1,182 @@
+import asyncio
+from typing import List, Optional, Tuple
+from src.database.database import SessionManager
+from src.database.repository import ChallengeRepository
+from src.domains import (
+    ActivitySubmittedEvent,
+    ChainEventBatch,
+    ChallengeCompletedEvent,
+    ChallengeOpenedEvent,
+    ChallengeStatus,
+)
+from src.registry.transaction import TransactionManager
+from src.settings import Settings
+from web3 import Web3
+from web3.types import EventData, LogReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+INDEXED_EVENTS = (
+    "ChallengeCreated",
+    "SubmitActivity",
+    "ChallengeCompleted",
+    "DepositReward",
+    "WithdrawReward",
+)
+
+# 서버(워커)가 여러 개여도 인덱싱은 한 곳에서만 실행되도록 잡는 advisory lock 키
+INDEXER_LOCK_ID = 4848_0003
+
+
+class ChainIndexer:
+    """ Oguogu 이벤트 인덱서
+
+    eth_getLogs로 블록 범위의 Oguogu 이벤트를 가져와서 ChallengeRepository에 한 번에 반영합니다.
+    범위 크기는 노드가 거절하면 절반으로 줄이고, 결과가 적으면 두 배로 늘립니다.
+    반영한 마지막 블록은 체크포인트로 같은 DB 트랜잭션에 저장하므로, 재시작해도 이어서 인덱싱합니다.
+    reorg를 피하기 위해 최신 블록에서 confirmations만큼 떨어진 블록까지만 인덱싱합니다.
+    워커마다 eth_getLogs를 중복으로 호출하지 않도록, 주기마다 advisory lock을 잡은 워커만 인덱싱합니다.
+    """
+    CHECKPOINT_NAME = "oguogu"
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        repository: ChallengeRepository,
+        transaction: TransactionManager,
+        settings: Settings,
+    ):
+        self.session_manager = session_manager
+        self.repository = repository
+        self.transaction = transaction
+        self.aweb3 = transaction.aweb3
+        self.decoder = transaction.event_decoder
+        self.address = settings.OGUOGU_ADDRESS
+        self.start_block = settings.INDEXER_START_BLOCK
+        self.confirmations = settings.INDEXER_CONFIRMATIONS
+        self.poll_interval = settings.INDEXER_POLL_INTERVAL
+        self.max_range = settings.INDEXER_MAX_RANGE
+        self.target_logs = settings.INDEXER_TARGET_LOGS
+        self.block_range = settings.INDEXER_MAX_RANGE
+        self.topics = [self.decoder.topic(name).to_0x_hex() for name in INDEXED_EVENTS]
+        self._last_block: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def index_once(self) -> int:
+        """ 다음 블록 범위를 인덱싱하고, 인덱싱한 블록 수를 반환합니다. """
+        if self._last_block is None:
+            checkpoint = await self.repository.get_checkpoint(self.CHECKPOINT_NAME)
+            self._last_block = self.start_block - 1 if checkpoint is None else checkpoint
+
+        head = await self.aweb3.eth.block_number - self.confirmations
+        from_block = self._last_block + 1
+        if from_block > head:
+            return 0
+
+        to_block, logs = await self.get_logs(from_block, min(head, from_block + self.block_range - 1))
+        batch = await self.build_batch(from_block, to_block, self.decoder.decode_logs(logs))
+        await self.repository.apply_chain_events(self.CHECKPOINT_NAME, batch)
+
+        logger.info(f"indexed blocks {from_block}-{to_block} "
+                    f"opened={len(batch.opened)} submitted={len(batch.submitted)} completed={len(batch.completed)}")
+        self._last_block = to_block
+        return to_block - from_block + 1
+
+    async def run_once(self) -> int:
+        """ advisory lock을 잡으면 index_once를 실행합니다. 다른 워커가 인덱싱 중이면 0을 반환합니다. """
+        async with self.session_manager.try_advisory_lock(INDEXER_LOCK_ID) as acquired:
+            if not acquired:
+                # 그동안 다른 워커가 체크포인트를 옮기므로, 다음에 lock을 잡으면 체크포인트부터 다시 읽습니다
+                self._last_block = None
+                return 0
+            return await self.index_once()
+
+    async def get_logs(self, from_block: int, to_block: int) -> Tuple[int, List[LogReceipt]]:
+        """ 범위를 조절하면서 로그를 가져옵니다. 실제로 가져온 마지막 블록과 로그를 반환합니다. """
+        while True:
+            try:
+                logs = await self.aweb3.eth.get_logs({
+                    'fromBlock': from_block,
+                    'toBlock': to_block,
+                    'address': self.address,
+                    'topics': [self.topics],
+                })
+            except Exception as e:
+                if to_block == from_block:
+                    raise
+                # 응답 크기 제한이나 타임아웃: 범위를 줄여서 다시 시도합니다
+                self.block_range = max(1, (to_block - from_block + 1) // 2)
+                to_block = from_block + self.block_range - 1
+                logger.info(f"eth_getLogs failed, shrink range to {self.block_range}: {e}")
+                continue
+
+            if len(logs) > self.target_logs:
+                self.block_range = max(1, self.block_range // 2)
+            elif len(logs) < self.target_logs // 2:
+                self.block_range = min(self.max_range, self.block_range * 2)
+            return to_block, logs
+
+    async def build_batch(self, from_block: int, to_block: int, events: List[EventData]) -> ChainEventBatch:
+        batch = ChainEventBatch(from_block=from_block, to_block=to_block, opened=[], submitted=[], completed=[])
+
+        # 블록 시간이 필요한 이벤트의 블록을 한 번에 가져옵니다
+        await self.transaction.receipt_watcher.fetch_block_timestamps([
+            event for event in events if event['event'] in ("SubmitActivity", "ChallengeCompleted")
+        ])
+
+        for event in events:
+            args = event['args']
+            tx_hash = event['transactionHash'].to_0x_hex()
+
+            if event['event'] == "ChallengeCreated":
+                batch.opened.append(ChallengeOpenedEvent(
+                    challenge_hash=Web3.to_hex(args['challengeHash']),
+                    challenge_id=args['tokenId'],
+                    challenger_address=args['challenger'],
+                ))
+            elif event['event'] == "SubmitActivity":
+                batch.submitted.append(ActivitySubmittedEvent(
+                    challenge_hash=Web3.to_hex(args['challengeHash']),
+                    activity_hash=Web3.to_hex(args['activityHash']),
+                    activity_transaction=tx_hash,
+                    activity_date=await self.transaction.aget_txreceipt_datetime(event),
+                ))
+            elif event['event'] == "ChallengeCompleted":
+                batch.completed.append(ChallengeCompletedEvent(
+                    challenge_id=args['tokenId'],
+                    status=ChallengeStatus.SUCCESS if args['status'] == 1 else ChallengeStatus.FAILED,
+                    payment_transaction=tx_hash,
+                    payment_reward=args['paymentReward'],
+                    complete_date=await self.transaction.aget_txreceipt_datetime(event),
+                ))
+            else:
+                # 보상 입출금은 DB에 저장하지 않습니다
+                logger.info(f"{event['event']} {args['challenger']} {args['amount']} tx={tx_hash}")
+        return batch
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                indexed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Failed to index chain events: {e}", exc_info=True)
+                indexed = 0
+            if indexed == 0:
+                await asyncio.sleep(self.poll_interval)
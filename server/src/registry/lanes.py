@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+import time
+from typing import Any, Dict, Iterator, List
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+
+class OperatorLanes:
+    """ operator 계정별 트랜잭션 lane 스케줄러
+
+    계정마다 nonce가 따로 증가하므로, 한 계정의 트랜잭션이 멈춰도 다른 계정의 트랜잭션은 영향을 받지 않습니다.
+    select()는 응답을 기다리는 트랜잭션이 가장 적은 계정을 고르고, 가장 오래된 트랜잭션이
+    stall_timeout보다 오래 기다리고 있는 계정(멈춘 lane)은 다른 계정이 모두 멈추지 않은 한 고르지 않습니다.
+    assign()은 같은 기준으로 여러 트랜잭션의 계정을 한 번에 고릅니다.
+    """
+    def __init__(self, accounts: List[LocalAccount], stall_timeout: float):
+        self.accounts = accounts
+        self.stall_timeout = stall_timeout
+        self._inflight: Dict[str, List[float]] = {account.address: [] for account in accounts}
+
+    def select(self) -> LocalAccount:
+        """ 트랜잭션을 보낼 계정을 고릅니다. """
+        return self.assign(1)[0]
+
+    def assign(self, count: int) -> List[LocalAccount]:
+        """ 트랜잭션 count개를 보낼 계정을 순서대로 고릅니다. 앞에서 배정한 트랜잭션도 lane의 부하로 셉니다. """
+        now = time.monotonic()
+        assigned = {account.address: 0 for account in self.accounts}
+
+        def load(account: LocalAccount):
+            starts = self._inflight[account.address]
+            stalled = bool(starts) and now - starts[0] > self.stall_timeout
+            return stalled, len(starts) + assigned[account.address]
+
+        accounts = []
+        for _ in range(count):
+            account = min(self.accounts, key=load)
+            assigned[account.address] += 1
+            accounts.append(account)
+        return accounts
+
+    @contextmanager
+    def track(self, account: Account, count: int = 1) -> Iterator[None]:
+        """ 블록에 포함될 때까지 account의 lane에 트랜잭션 count개가 진행 중임을 기록합니다. """
+        starts = self._inflight.get(account.address)
+        if starts is None:
+            yield
+            return
+
+        start = time.monotonic()
+        starts.extend([start] * count)
+        try:
+            yield
+        finally:
+            for _ in range(count):
+                starts.remove(start)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "address": address,
+                "inflight": len(starts),
+                "oldest": now - starts[0] if starts else None,
+            }
+            for address, starts in self._inflight.items()
+        ]
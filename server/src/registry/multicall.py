@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, List, Optional, Union
+from eth_utils import get_abi_output_types
+from src.abis.constants import MULTICALL3_ABI
+from web3 import AsyncWeb3
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract.async_contract import AsyncContractFunction
+from web3.exceptions import ContractLogicError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Multicall:
+    """ 여러 view 함수 호출(eth_call)을 한 번에 보내는 도우미
+
+    Multicall3(aggregate3)가 배포된 체인이면 max_calls개씩 묶어서 eth_call 한 번으로 호출합니다.
+    배포되지 않은 체인(로컬 노드 등)이면 각 eth_call을 JSON-RPC 배치 요청으로 보냅니다.
+    각 호출의 결과(디코딩된 값 또는 예외)를 요청 순서대로 반환하며, 하나가 revert되어도 나머지에는 영향을 주지 않습니다.
+    """
+    def __init__(self, aweb3: AsyncWeb3, address: str, max_calls: int):
+        self.aweb3 = aweb3
+        self.max_calls = max_calls
+        self.contract = aweb3.eth.contract(address=address, abi=MULTICALL3_ABI)
+        self._deployed: Optional[bool] = None
+
+    async def call(self, funcs: List[AsyncContractFunction]) -> List[Union[Any, Exception]]:
+        if not funcs:
+            return []
+        if not await self.is_deployed():
+            return list(await asyncio.gather(*[func.call() for func in funcs], return_exceptions=True))
+
+        chunks = await asyncio.gather(*[
+            self._aggregate(funcs[index:index + self.max_calls])
+            for index in range(0, len(funcs), self.max_calls)
+        ])
+        return [result for chunk in chunks for result in chunk]
+
+    async def is_deployed(self) -> bool:
+        if self._deployed is None:
+            code = await self.aweb3.eth.get_code(self.contract.address)
+            self._deployed = len(code) > 0
+            if not self._deployed:
+                logger.warning(f"Multicall3 is not deployed at {self.contract.address}, use batched eth_call")
+        return self._deployed
+
+    async def _aggregate(self, funcs: List[AsyncContractFunction]) -> List[Union[Any, Exception]]:
+        responses = await self.contract.functions.aggregate3([
+            (func.address, True, func._encode_transaction_data()) for func in funcs
+        ]).call()
+
+        results: List[Union[Any, Exception]] = []
+        for func, (success, return_data) in zip(funcs, responses):
+            if not success:
+                results.append(ContractLogicError(f"{func.fn_name} reverted", data=return_data.hex()))
+                continue
+            output_types = get_abi_output_types(func.abi)
+            values = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, self.aweb3.codec.decode(output_types, return_data))
+            results.append(values[0] if len(values) == 1 else list(values))
+        return results
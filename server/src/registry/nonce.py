@@ -0,0 +1,40 @@
+import asyncio
+from typing import List, Optional
+from eth_typing import ChecksumAddress
+from web3 import AsyncWeb3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NonceManager:
+    """ 계정의 nonce를 로컬에서 할당합니다.
+
+    처음 할당할 때 한 번만 pending 트랜잭션 수로 nonce를 초기화하고,
+    이후에는 동시에 실행되는 코루틴들에게 RPC 호출 없이 순서대로 nonce를 나눠줍니다.
+    트랜잭션이 거절되거나 유실되면 resync()로 다음 할당 때 노드의 pending nonce와 다시 맞춥니다.
+    """
+    def __init__(self, aweb3: AsyncWeb3, address: ChecksumAddress):
+        self.aweb3 = aweb3
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> int:
+        nonce, = await self.allocate_many(1)
+        return nonce
+
+    async def allocate_many(self, count: int) -> List[int]:
+        """ 연속된 nonce를 count개 할당합니다. """
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self.aweb3.eth.get_transaction_count(self.address, 'pending')
+                logger.info(f"nonce synced {self.address} {self._next_nonce}")
+            nonces = list(range(self._next_nonce, self._next_nonce + count))
+            self._next_nonce += count
+            return nonces
+
+    def resync(self) -> None:
+        """ 다음 할당 때 노드의 pending nonce로 다시 초기화합니다. """
+        logger.info(f"nonce resync {self.address}")
+        self._next_nonce = None
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+from src.database.repository import ChallengeRepository
+from src.domains import ActivitySubmission, Challenge
+from src.exceptions import ClientException
+from src.registry.activity import ActivityRegistryService
+from src.settings import Settings
+from src.utils import verify_signature
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ActivitySubmissionOutbox:
+    """ 챌린지 수행 증명 제출 outbox
+
+    API 요청은 서명만 검증하고 제출 요청을 DB(outbox)에 저장한 뒤 바로 응답합니다.
+    백그라운드 워커가 outbox에서 요청을 가져와 ActivityRegistryService.submit_activity로 블록체인에 등록하고,
+    실패하면 backoff 후 재시도합니다. 요청은 DB에 남아 있으므로 서버가 재시작되어도 유실되지 않습니다.
+    """
+    def __init__(
+        self,
+        repository: ChallengeRepository,
+        activity: ActivityRegistryService,
+        settings: Settings,
+    ):
+        self.repository = repository
+        self.activity = activity
+        self.poll_interval = settings.OUTBOX_POLL_INTERVAL
+        self.batch_size = settings.OUTBOX_BATCH_SIZE
+        self.max_attempts = settings.OUTBOX_MAX_ATTEMPTS
+        self.retry_backoff = timedelta(seconds=settings.OUTBOX_RETRY_BACKOFF)
+        self.lease = timedelta(seconds=settings.OUTBOX_LEASE)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def enqueue(self, challenge: Challenge, activity_hash: str, activity_signature: str) -> ActivitySubmission:
+        """ 제출 요청을 검증하고 outbox에 저장합니다. """
+        if not verify_signature(challenge.challenger_address, activity_signature, activity_hash):
+            raise ClientException(message="서명이 유효하지 않아요.")
+
+        activity = await self.repository.get_activity(challenge.hash, activity_hash)
+        if activity.is_completed():
+            raise ClientException(message="이미 제출한 제출물이에요.")
+
+        submission = await self.repository.add_submission(
+            ActivitySubmission.new(challenge.hash, activity_hash, activity_signature)
+        )
+        self._wakeup.set()
+        return submission
+
+    async def get_submission(self, challenge_hash: str, activity_hash: str) -> ActivitySubmission:
+        return await self.repository.get_submission(challenge_hash, activity_hash)
+
+    async def process_pending(self) -> int:
+        """ 처리할 제출 요청을 한 묶음 가져와 동시에 처리하고, 처리한 요청 수를 반환합니다. """
+        submissions = await self.repository.claim_submissions(self.batch_size, self.lease)
+        # 동시에 제출해야 TransactionBatcher가 하나의 배치로 묶어서 전송합니다
+        await asyncio.gather(*[self._process(submission) for submission in submissions])
+        return len(submissions)
+
+    async def _process(self, submission: ActivitySubmission):
+        try:
+            activity = await self.repository.get_activity(submission.challenge_hash, submission.activity_hash)
+            # 이전 시도에서 등록은 끝났지만 결과를 저장하지 못한 경우
+            if not activity.is_completed():
+                challenge = await self.repository.get_challenge(submission.challenge_hash, with_activities=False)
+                await self.activity.submit_activity(challenge, submission.activity_hash, submission.activity_signature)
+            submission.succeed()
+        except ClientException as e:
+            # 재시도해도 결과가 같은 요청입니다
+            logger.warning(f"Rejected activity submission {submission.activity_hash}: {e.message}")
+            submission.fail(e.message)
+        except Exception as e:
+            logger.warning(f"Failed to submit activity {submission.activity_hash} (attempt {submission.attempts}): {e}")
+            submission.retry_or_fail(str(e), self.max_attempts, self.retry_backoff)
+        await self.repository.update_submission(submission)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.process_pending()
+            except Exception as e:
+                logger.error(f"Failed to process activity submissions: {e}", exc_info=True)
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,316 @@
+import asyncio
+from collections import deque
+import time
+from urllib.parse import urlparse
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar, Union
+from web3 import AsyncWeb3
+from web3.providers.async_base import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _provider_name(index: int, provider: AsyncBaseProvider) -> str:
+    """ 지표와 로그에 남기는 provider 이름. URL의 경로 / 쿼리 / 계정 정보에는 API 키가 있을 수 있으므로 호스트만 남깁니다. """
+    host = urlparse(str(getattr(provider, "endpoint_uri", None) or "")).hostname
+    return f"{index}:{host}" if host else str(index)
+
+
+async def _disconnect(provider: AsyncBaseProvider):
+    """ provider의 연결을 닫습니다. AsyncBaseProvider.disconnect는 구현하지 않으면 NotImplementedError를 던집니다. """
+    try:
+        await provider.disconnect()
+    except NotImplementedError:
+        pass
+
+
+class ProviderStats:
+    """ RPC 노드별 응답 시간 / 에러 통계 """
+    def __init__(self, name: str, alpha: float = 0.2, window: int = 200):
+        self.name = name
+        self.alpha = alpha
+        self.requests = 0
+        self.errors = 0
+        self.latency: Optional[float] = None # 응답 시간 이동 평균(초)
+        self.error_rate = 0.0 # 에러 비율 이동 평균
+        self._latencies: deque = deque(maxlen=window)
+        self._inflight: List[float] = [] # 응답을 기다리는 요청의 시작 시각
+        
+    def begin(self) -> float:
+        start = time.monotonic()
+        self._inflight.append(start)
+        return start
+    
+    def end(self, start: float) -> float:
+        self._inflight.remove(start)
+        return time.monotonic() - start
+
+    def record_latency(self, latency: float):
+        self._latencies.append(latency)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.record_latency(latency)
+        self.error_rate = (1 - self.alpha) * self.error_rate
+
+    def record_error(self, latency: float):
+        self.requests += 1
+        self.errors += 1
+        self.record_latency(latency)
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+
+    def score(self) -> float:
+        """ 낮을수록 좋은 노드입니다. 아직 호출한 적 없는 노드는 먼저 시도해 봅니다.
+        
+        응답이 오지 않은 요청이 있으면 그 요청이 기다린 시간도 응답 시간으로 봅니다.
+        """
+        latency = self.latency or 0.0
+        if self._inflight:
+            latency = max(latency, time.monotonic() - self._inflight[0])
+        return latency * (1 + 10 * self.error_rate)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "inflight": len(self._inflight),
+            "latency": self.latency,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class ProviderPool(AsyncBaseProvider):
+    """ 여러 RPC 노드를 묶은 AsyncWeb3 provider
+
+    - 쓰기(트랜잭션 전송, nonce 조회)는 항상 첫 번째 노드(primary)로 보냅니다.
+    - 읽기는 응답 시간 / 에러 비율 점수가 가장 좋은 노드로 보내고, 그 노드의 응답 시간 percentile만큼
+      기다려도 응답이 없으면 두 번째 노드에도 같은 요청을 보내서(hedging) 먼저 온 응답을 사용합니다.
+      늦은 요청도 끝까지 기다려서 해당 노드의 응답 시간 통계에 반영합니다.
+    - JSON-RPC 에러 응답(ex: revert)은 노드 장애가 아니므로 에러로 세지 않습니다.
+    """
+    PRIMARY_METHODS = {
+        RPCEndpoint("eth_sendRawTransaction"),
+        RPCEndpoint("eth_sendTransaction"),
+        RPCEndpoint("eth_getTransactionCount"),
+    }
+
+    def __init__(
+        self,
+        providers: Sequence[AsyncBaseProvider],
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+    ):
+        super().__init__()
+        if not providers:
+            raise ValueError("ProviderPool requires at least one provider")
+        self.providers = list(providers)
+        self.stats = [ProviderStats(_provider_name(index, provider)) for index, provider in enumerate(self.providers)]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedged = 0
+        self._stragglers: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def from_urls(urls: Sequence[str], hedge_percentile: float, hedge_min_delay: float) -> "ProviderPool":
+        return ProviderPool(
+            [AsyncWeb3.AsyncHTTPProvider(url) for url in dict.fromkeys(urls)],
+            hedge_percentile=hedge_percentile,
+            hedge_min_delay=hedge_min_delay,
+        )
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return await self._route(
+            method in self.PRIMARY_METHODS,
+            lambda provider: provider.make_request(method, params),
+        )
+
+    async def make_batch_request(
+        self, requests: List[Tuple[RPCEndpoint, Any]]
+    ) -> Union[List[RPCResponse], RPCResponse]:
+        return await self._route(
+            any(method in self.PRIMARY_METHODS for method, _ in requests),
+            lambda provider: provider.make_batch_request(requests),
+        )
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return await self.providers[0].is_connected(show_traceback)
+
+    async def disconnect(self) -> None:
+        # 종료할 때는 아직 끝나지 않은 hedging 요청을 취소하고 끝날 때까지 기다립니다
+        stragglers = list(self._stragglers)
+        for task in stragglers:
+            task.cancel()
+        await asyncio.gather(*stragglers, return_exceptions=True)
+        for provider in self.providers:
+            await _disconnect(provider)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [stats.to_dict() for stats in self.stats]
+
+    async def _route(self, primary: bool, call: Callable[[AsyncBaseProvider], Awaitable[T]]) -> T:
+        if primary or len(self.providers) == 1:
+            return await self._call(0, call)
+        order = sorted(range(len(self.providers)), key=lambda index: self.stats[index].score())
+        return await self._hedged_call(order[0], order[1], call)
+
+    async def _call(self, index: int, call: Callable[[AsyncBaseProvider], Awaitable[T]]) -> T:
+        stats = self.stats[index]
+        start = stats.begin()
+        try:
+            result = await call(self.providers[index])
+        except asyncio.CancelledError:
+            stats.end(start)
+            raise
+        except Exception:
+            stats.record_error(stats.end(start))
+            raise
+        stats.record_success(stats.end(start))
+        return result
+
+    async def _hedged_call(self, first: int, second: int, call: Callable[[AsyncBaseProvider], Awaitable[T]]) -> T:
+        delay = max(self.hedge_min_delay, self.stats[first].percentile(self.hedge_percentile) or 0.0)
+        tasks = [asyncio.create_task(self._call(first, call))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done and not tasks[0].exception():
+                return tasks[0].result()
+
+            if done:
+                logger.warning(f"RPC request failed on {self.stats[first].name}, retry on {self.stats[second].name}")
+            else:
+                self.hedged += 1
+            tasks.append(asyncio.create_task(self._call(second, call)))
+
+            error: Optional[BaseException] = None
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error or tasks[0].exception()
+        finally:
+            # 늦게 끝난 요청은 취소하지 않고 끝까지 기다려서 실제 응답 시간을 기록합니다
+            for task in tasks:
+                if not task.done():
+                    self._stragglers.add(task)
+                    task.add_done_callback(self._discard_straggler)
+
+    def _discard_straggler(self, task: asyncio.Task):
+        self._stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+
+class BatchingProvider(AsyncBaseProvider):
+    """ JSON-RPC 요청 묶음 provider
+
+    같은 이벤트 루프 tick(또는 window초) 안에 여러 코루틴이 보낸 요청을 하나의 JSON-RPC 배치 요청으로 합쳐서
+    inner provider로 보내고, 결과를 각 호출자에게 나눠줍니다. 요청이 하나뿐이면 배치 없이 그대로 보냅니다.
+    호출하는 쪽(AsyncWeb3)의 코드는 바꿀 필요가 없습니다.
+    """
+    def __init__(self, inner: AsyncBaseProvider, window: float = 0.0, max_size: int = 100):
+        super().__init__()
+        self.inner = inner
+        self.window = window
+        self.max_size = max_size
+        self.batches = 0
+        self.batched_requests = 0
+        self._pending: List[Tuple[RPCEndpoint, Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._flushing: Set[asyncio.Task] = set()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, params, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    async def make_batch_request(
+        self, requests: List[Tuple[RPCEndpoint, Any]]
+    ) -> Union[List[RPCResponse], RPCResponse]:
+        return await self.inner.make_batch_request(requests)
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return await self.inner.is_connected(show_traceback)
+
+    async def disconnect(self) -> None:
+        # 종료할 때는 아직 보내지 않은 요청과 응답을 기다리는 배치를 취소해서, 호출자가 계속 기다리지 않게 합니다
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        for _, _, future in batch:
+            future.cancel()
+        flushing = list(self._flushing)
+        for task in flushing:
+            task.cancel()
+        await asyncio.gather(*flushing, return_exceptions=True)
+        await _disconnect(self.inner)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._send(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _send(self, batch: List[Tuple[RPCEndpoint, Any, asyncio.Future]]):
+        try:
+            if len(batch) == 1:
+                method, params, _ = batch[0]
+                responses = [await self.inner.make_request(method, params)]
+            else:
+                self.batches += 1
+                self.batched_requests += len(batch)
+                responses = await self.inner.make_batch_request([(method, params) for method, params, _ in batch])
+                if not isinstance(responses, list):
+                    # 배치 전체가 거절된 경우 (ex: 배치 요청을 지원하지 않는 노드)
+                    raise ValueError(f"Failed to send batch request: {responses.get('error')}")
+                if len(responses) != len(batch):
+                    raise ValueError(f"Batch response size mismatch: {len(responses)} != {len(batch)}")
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
@@ -0,0 +1,140 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Union
+from hexbytes import HexBytes
+from src.registry.block import BlockTimestampCache
+from web3 import AsyncWeb3
+from web3._utils.method_formatters import block_result_formatter, receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import RPCEndpoint, TxReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiptWatcher:
+    """ 트랜잭션 영수증 대기 관리자
+
+    트랜잭션마다 영수증을 폴링하지 않고, 하나의 백그라운드 태스크가 블록 번호를 따라가면서
+    새 블록이 생길 때마다 대기 중인 모든 트랜잭션의 영수증을 한 번의 JSON-RPC 배치 요청으로 조회합니다.
+    RPC 호출 수는 대기 중인 트랜잭션 수가 아니라 블록 수에 비례합니다.
+    
+    관측한 최신 블록과 영수증이 포함된 블록의 타임스탬프는 block_cache에 채워 두어서,
+    영수증을 받은 뒤 블록 시간을 조회할 때 다시 블록을 가져오지 않도록 합니다.
+    """
+    def __init__(self, aweb3: AsyncWeb3, poll_interval: float, block_cache: BlockTimestampCache):
+        self.aweb3 = aweb3
+        self.poll_interval = poll_interval
+        self.block_cache = block_cache
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._unchecked: Set[str] = set()
+        self._last_block_number: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(
+        self,
+        transaction_hash: Union[str, bytes],
+        timeout: float = 120,
+    ) -> TxReceipt:
+        """ 트랜잭션이 블록에 포함될 때까지 기다린 후, 영수증을 반환합니다. """
+        tx_hash = HexBytes(transaction_hash).to_0x_hex()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tx_hash, []).append(future)
+        self._unchecked.add(tx_hash)
+        self._ensure_running()
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Timeout waiting for transaction receipt {tx_hash}")
+        finally:
+            self._remove_waiter(tx_hash, future)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _remove_waiter(self, tx_hash: str, future: asyncio.Future):
+        futures = self._waiters.get(tx_hash)
+        if futures is None:
+            return
+        if future in futures:
+            futures.remove(future)
+        if not futures:
+            del self._waiters[tx_hash]
+            self._unchecked.discard(tx_hash)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning(f"Failed to poll transaction receipts: {e}")
+            if not self._waiters:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self):
+        block = await self.aweb3.eth.get_block('latest')
+        self.block_cache.observe_head(block)
+        block_number = block['number']
+        if block_number != self._last_block_number:
+            self._last_block_number = block_number
+            tx_hashes = list(self._waiters)
+        else:
+            # 같은 블록이라도 새로 등록된 트랜잭션은 이미 포함되었을 수 있으므로 확인합니다
+            tx_hashes = [tx_hash for tx_hash in self._unchecked if tx_hash in self._waiters]
+        self._unchecked.clear()
+
+        if not tx_hashes:
+            return
+
+        receipts = await self.fetch_receipts(tx_hashes)
+        try:
+            await self.fetch_block_timestamps(receipts.values())
+        except Exception as e:
+            logger.warning(f"Failed to fetch block timestamps: {e}")
+        for tx_hash, receipt in receipts.items():
+            for future in self._waiters.pop(tx_hash, []):
+                if not future.done():
+                    future.set_result(receipt)
+
+    async def fetch_receipts(self, tx_hashes: List[str]) -> Dict[str, TxReceipt]:
+        """ 여러 트랜잭션의 영수증을 한 번의 배치 요청으로 조회합니다. 아직 포함되지 않은 트랜잭션은 제외합니다. """
+        responses = await self.aweb3.provider.make_batch_request([
+            (RPCEndpoint("eth_getTransactionReceipt"), [tx_hash]) for tx_hash in tx_hashes
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Failed to fetch transaction receipts: {responses.get('error')}")
+
+        receipts = {}
+        for tx_hash, response in zip(tx_hashes, responses):
+            if response.get("error"):
+                logger.warning(f"Failed to fetch transaction receipt {tx_hash}: {response['error']}")
+                continue
+            if response.get("result") is None:
+                continue
+            receipts[tx_hash] = AttributeDict.recursive(receipt_formatter(response["result"]))
+        return receipts
+
+    async def fetch_block_timestamps(self, receipts: Iterable[TxReceipt]) -> None:
+        """ 영수증이 포함된 블록 중 캐시에 없는 블록의 타임스탬프를 한 번의 배치 요청으로 채웁니다. """
+        block_hashes = list({
+            HexBytes(receipt['blockHash']).to_0x_hex()
+            for receipt in receipts
+            if not self.block_cache.contains(receipt['blockNumber'], receipt['blockHash'])
+        })
+        if not block_hashes:
+            return
+
+        responses = await self.aweb3.provider.make_batch_request([
+            (RPCEndpoint("eth_getBlockByHash"), [block_hash, False]) for block_hash in block_hashes
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Failed to fetch blocks: {responses.get('error')}")
+
+        for response in responses:
+            if response.get("result") is None:
+                continue
+            block = block_result_formatter(response["result"])
+            self.block_cache.put(block["number"], block["hash"], block["timestamp"])
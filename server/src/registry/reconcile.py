@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import Any, Dict, List, Set
+from src.database.repository import ChallengeRepository
+from src.domains import ActivitySubmittedEvent, Challenge, ChallengeStatus
+from src.registry.backfill import ChainBackfill
+from src.registry.reward import CHAIN_STATUS_SUCCESS
+from src.registry.transaction import TransactionManager
+from src.settings import Settings
+from web3 import Web3
+from web3.types import EventData
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChallengeDiff:
+    """ DB와 블록체인의 챌린지 상태 차이 """
+    challenge_id: int
+    challenge_hash: str
+    field: str # hash / status / activities / payment_reward / payment_transaction
+    database: Any
+    chain: Any
+
+
+@dataclass
+class ReconcileReport:
+    checked: int = 0
+    diffs: List[ChallengeDiff] = field(default_factory=list)
+    repaired_challenges: int = 0
+    repaired_activities: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class PendingLookups:
+    """ 블록체인 로그로 확인해야 하는 챌린지 """
+    challenges: Dict[int, Challenge] = field(default_factory=dict)
+    closed: Set[int] = field(default_factory=set) # 완료 결과가 DB에 없거나 블록체인과 다른 챌린지
+    missing_activities: Dict[int, Set[str]] = field(default_factory=dict) # DB에서 완료되지 않은 증명
+
+    def __len__(self) -> int:
+        return len(self.challenges)
+
+
+class ChainReconciler:
+    """ DB / 블록체인 챌린지 상태 비교
+
+    DB의 챌린지를 챌린지 ID 순서로 batch_size개씩 가져오고(keyset pagination), 블록체인의 getChallenge와
+    getChallengeStatus를 Multicall3 aggregate3로 한 번에 조회해서 챌린지 해시, 완료 상태(SUCCESS / FAILED),
+    제출된 증명을 비교합니다.
+    보상 지급 결과와 증명 제출 트랜잭션은 컨트랙트에 저장되지 않으므로 로그로 확인합니다. 완료 상태가 블록체인과 같고
+    지급 결과가 저장된 챌린지는 인덱서가 반영한 DB 값을 기준으로 하고, 완료 상태가 다르거나 완료 결과나 증명이 DB에
+    없는 챌린지만 모아서 batch_size개마다 블록 범위를 나눈 eth_getLogs로 한 번에 찾습니다. (ChainBackfill.get_logs)
+    repair=True이면 블록체인 기준으로 DB를 bulk UPDATE로 고칩니다. 블록체인에서 완료되지 않았는데 DB에서
+    완료된 챌린지처럼 블록체인에 근거가 없는 차이는 보고만 합니다.
+    """
+    def __init__(
+        self,
+        repository: ChallengeRepository,
+        transaction: TransactionManager,
+        backfill: ChainBackfill,
+        settings: Settings,
+    ):
+        self.repository = repository
+        self.transaction = transaction
+        self.backfill = backfill
+        self.aweb3 = transaction.aweb3
+        self.decoder = transaction.event_decoder
+        self.multicall = transaction.multicall
+        self.start_block = settings.INDEXER_START_BLOCK
+        self.batch_size = settings.RECONCILE_BATCH_SIZE
+        self.block_range = settings.BACKFILL_RANGE
+        self.workers = settings.BACKFILL_WORKERS
+        contract = transaction.aoguogu_contract()
+        self.challenge_function = contract.functions.getChallenge
+        self.status_function = contract.functions.getChallengeStatus
+
+    async def run(self, repair: bool = False) -> ReconcileReport:
+        report = ReconcileReport()
+        start = time.monotonic()
+        pending = PendingLookups()
+        after_id = -1
+        while True:
+            challenges = await self.repository.get_challenges_after(after_id, self.batch_size)
+            if not challenges:
+                break
+            after_id = challenges[-1].id
+            await self.compare(challenges, report, pending)
+            if len(pending) >= self.batch_size:
+                await self.resolve(pending, report, repair)
+                pending = PendingLookups()
+            logger.info(f"reconciled {report.checked} challenges, {len(report.diffs)} diffs "
+                        f"({report.checked / (time.monotonic() - start):.0f} challenges/s)")
+        await self.resolve(pending, report, repair)
+        report.elapsed = time.monotonic() - start
+        return report
+
+    async def reconcile(self, challenges: List[Challenge], report: ReconcileReport, repair: bool = False):
+        """ 챌린지 한 묶음을 비교하고, 차이를 report에 추가합니다. """
+        pending = PendingLookups()
+        await self.compare(challenges, report, pending)
+        await self.resolve(pending, report, repair)
+
+    async def compare(self, challenges: List[Challenge], report: ReconcileReport, pending: PendingLookups):
+        """ getChallenge / getChallengeStatus로 해시, 상태, 제출된 증명을 비교하고, 로그로 확인할 챌린지를 pending에 추가합니다. """
+        calls = []
+        for challenge in challenges:
+            calls.append(self.challenge_function(challenge.id))
+            calls.append(self.status_function(challenge.id))
+        results = await self.multicall.call(calls)
+
+        for challenge, detail, status in zip(challenges, results[0::2], results[1::2]):
+            error = next((result for result in (detail, status) if isinstance(result, Exception)), None)
+            if error is not None:
+                logger.warning(f"Failed to read challenge {challenge.id}: {error}")
+                continue
+            chain_hash, activity_hashes, _, _, _, _, is_closed = detail
+            if Web3.to_hex(chain_hash) != challenge.hash:
+                report.diffs.append(ChallengeDiff(challenge.id, challenge.hash, "hash", challenge.hash, Web3.to_hex(chain_hash)))
+            if is_closed:
+                # 완료된 뒤에는 증명을 제출할 수 없으므로 getChallengeStatus가 완료 당시의 결과입니다
+                chain_status = ChallengeStatus.SUCCESS if status == CHAIN_STATUS_SUCCESS else ChallengeStatus.FAILED
+                if challenge.status != chain_status or challenge.payment_transaction is None:
+                    pending.closed.add(challenge.id)
+                    pending.challenges[challenge.id] = challenge
+            elif challenge.is_completed():
+                report.diffs.append(ChallengeDiff(challenge.id, challenge.hash, "status", challenge.status.value, ChallengeStatus.OPEN.value))
+
+            chain_activities = {Web3.to_hex(activity_hash) for activity_hash in activity_hashes}
+            db_activities = {activity.activity_hash for activity in challenge.activities if activity.is_completed()}
+            if chain_activities != db_activities:
+                report.diffs.append(ChallengeDiff(challenge.id, challenge.hash, "activities", sorted(db_activities), sorted(chain_activities)))
+            if chain_activities - db_activities:
+                pending.missing_activities[challenge.id] = chain_activities - db_activities
+                pending.challenges[challenge.id] = challenge
+        report.checked += len(challenges)
+
+    async def resolve(self, pending: PendingLookups, report: ReconcileReport, repair: bool = False):
+        """ pending 챌린지의 완료 결과와 증명 제출 트랜잭션을 로그에서 찾아서 비교하고, repair=True이면 DB를 고칩니다. """
+        if not pending:
+            return
+        events = await self.get_events(pending)
+        completed_events = [
+            event for event in events
+            if event['event'] == "ChallengeCompleted" and event['args']['tokenId'] in pending.closed
+        ]
+        submitted_events = [
+            event for event in events
+            if event['event'] == "SubmitActivity" and event['args']['tokenId'] in pending.missing_activities
+        ]
+        missing_activities = pending.missing_activities
+        await self.transaction.receipt_watcher.fetch_block_timestamps([*completed_events, *submitted_events])
+
+        by_id = pending.challenges
+        repaired_challenges: List[Challenge] = []
+        for event in completed_events:
+            challenge = by_id[event['args']['tokenId']]
+            chain_status = ChallengeStatus.SUCCESS if event['args']['status'] == 1 else ChallengeStatus.FAILED
+            payment_reward = event['args']['paymentReward']
+            payment_transaction = event['transactionHash'].to_0x_hex()
+
+            diffs = [
+                ChallengeDiff(challenge.id, challenge.hash, name, database, chain)
+                for name, database, chain in (
+                    ("status", challenge.status.value, chain_status.value),
+                    ("payment_reward", challenge.payment_reward, payment_reward),
+                    ("payment_transaction", challenge.payment_transaction, payment_transaction),
+                )
+                if database != chain
+            ]
+            if not diffs:
+                continue
+            report.diffs.extend(diffs)
+
+            complete_date = await self.transaction.aget_txreceipt_datetime(event)
+            if chain_status == ChallengeStatus.SUCCESS:
+                challenge.success(payment_transaction, payment_reward, complete_date)
+            else:
+                challenge.fail(payment_transaction, payment_reward, complete_date)
+            repaired_challenges.append(challenge)
+
+        repaired_activities: List[ActivitySubmittedEvent] = []
+        for event in submitted_events:
+            activity_hash = Web3.to_hex(event['args']['activityHash'])
+            if activity_hash not in missing_activities.get(event['args']['tokenId'], set()):
+                continue
+            repaired_activities.append(ActivitySubmittedEvent(
+                challenge_hash=by_id[event['args']['tokenId']].hash,
+                activity_hash=activity_hash,
+                activity_transaction=event['transactionHash'].to_0x_hex(),
+                activity_date=await self.transaction.aget_txreceipt_datetime(event),
+            ))
+
+        if repair:
+            await self.repository.repair_challenges(repaired_challenges)
+            await self.repository.repair_activities(repaired_activities)
+            report.repaired_challenges += len(repaired_challenges)
+            report.repaired_activities += len(repaired_activities)
+
+    async def get_events(self, pending: PendingLookups) -> List[EventData]:
+        """ 시작 블록부터 최신 블록까지 block_range 크기의 범위를 workers개씩 동시에 가져와서, pending 챌린지의 이벤트만 남깁니다.
+
+        tokenId를 topic으로 걸지 않으므로 확인할 챌린지 수와 관계없이 요청 크기가 같고,
+        노드가 범위나 결과 크기 때문에 거절하면 범위를 나눠서 다시 가져옵니다.
+        """
+        event_names = [
+            name for name, challenge_ids in (("ChallengeCompleted", pending.closed), ("SubmitActivity", pending.missing_activities))
+            if challenge_ids
+        ]
+        topics = [self.decoder.topic(name).to_0x_hex() for name in event_names]
+        to_block = await self.aweb3.eth.block_number
+        ranges = [
+            (block, min(block + self.block_range - 1, to_block))
+            for block in range(self.start_block, to_block + 1, self.block_range)
+        ]
+
+        events = []
+        for index in range(0, len(ranges), self.workers):
+            results = await asyncio.gather(*[
+                self.backfill.get_logs(first, last, topics) for first, last in ranges[index:index + self.workers]
+            ])
+            events.extend(
+                event for event in self.decoder.decode_logs([log for logs in results for log in logs], *event_names)
+                if event['args']['tokenId'] in pending.challenges
+            )
+        return events
+
+
+async def main(repair: bool):
+    from src.registry.container import RegistryContainer
+
+    reconciler = RegistryContainer().reconciler()
+    report = await reconciler.run(repair=repair)
+    for diff in report.diffs:
+        print(f"{diff.challenge_id}\t{diff.challenge_hash}\t{diff.field}\tdb={diff.database}\tchain={diff.chain}")
+    print(f"checked={report.checked} diffs={len(report.diffs)} "
+          f"repaired_challenges={report.repaired_challenges} repaired_activities={report.repaired_activities} "
+          f"elapsed={report.elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB와 블록체인의 챌린지 상태를 비교합니다.")
+    parser.add_argument("--repair", action="store_true", help="블록체인 기준으로 DB를 수정합니다.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.repair))
@@ -0,0 +1,116 @@
+import asyncio
+import math
+import time
+from typing import Dict, Optional
+from eth_account import Account
+from src.registry.block import BlockTimestampCache
+from src.registry.fee import FeeOracle
+from src.registry.receipt import ReceiptWatcher
+from web3 import AsyncWeb3
+from web3.exceptions import TimeExhausted
+from web3.types import TxParams, TxReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionReplacer:
+    """ 멈춘 트랜잭션 수수료 올려서 다시 보내기
+
+    전송한 트랜잭션이 stuck_blocks개의 블록이 지나도록 포함되지 않으면, 같은 nonce로 수수료를 bump_ratio배 이상
+    올려서 다시 서명하고 전송합니다. 원래 트랜잭션과 교체 트랜잭션 중 먼저 블록에 포함된 쪽의 영수증을 반환합니다.
+    """
+    def __init__(
+        self,
+        aweb3: AsyncWeb3,
+        receipt_watcher: ReceiptWatcher,
+        block_cache: BlockTimestampCache,
+        fee_oracle: FeeOracle,
+        stuck_blocks: int,
+        bump_ratio: float,
+        max_replacements: int,
+    ):
+        self.aweb3 = aweb3
+        self.receipt_watcher = receipt_watcher
+        self.block_cache = block_cache
+        self.fee_oracle = fee_oracle
+        self.stuck_blocks = stuck_blocks
+        self.bump_ratio = bump_ratio
+        self.max_replacements = max_replacements
+        self.replaced = 0
+
+    async def wait(
+        self,
+        account: Account,
+        transaction: TxParams,
+        transaction_hash: str,
+        timeout: float = 120,
+    ) -> TxReceipt:
+        """ transaction(nonce 포함)이 블록에 포함될 때까지 기다리고, 필요하면 교체 트랜잭션을 보냅니다. """
+        deadline = time.monotonic() + timeout
+        waiters: Dict[str, asyncio.Task] = {
+            transaction_hash: asyncio.create_task(self.receipt_watcher.wait(transaction_hash, timeout)),
+        }
+        sent_block = self.block_cache.head
+        replacements = 0
+        error: Optional[BaseException] = None
+
+        try:
+            while waiters:
+                done, _ = await asyncio.wait(
+                    waiters.values(),
+                    timeout=self.receipt_watcher.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for tx_hash, task in list(waiters.items()):
+                    if task not in done:
+                        continue
+                    del waiters[tx_hash]
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+                head = self.block_cache.head
+                if sent_block is None:
+                    sent_block = head
+                if (
+                    waiters
+                    and head is not None
+                    and head - sent_block >= self.stuck_blocks
+                    and replacements < self.max_replacements
+                ):
+                    transaction = await self.bump_fee(transaction)
+                    replacement_hash = await self._send_replacement(account, transaction)
+                    sent_block = head
+                    replacements += 1
+                    if replacement_hash is not None:
+                        remaining = max(0.0, deadline - time.monotonic())
+                        waiters[replacement_hash] = asyncio.create_task(
+                            self.receipt_watcher.wait(replacement_hash, remaining)
+                        )
+            raise error or TimeExhausted(f"Timeout waiting for transaction receipt {transaction_hash}")
+        finally:
+            for task in waiters.values():
+                task.cancel()
+
+    async def bump_fee(self, transaction: TxParams) -> TxParams:
+        """ 수수료를 bump_ratio배 이상, 그리고 현재 오라클 수수료 이상으로 올립니다. """
+        max_fee, priority_fee = await self.fee_oracle.fees()
+        return {
+            **transaction,
+            'maxFeePerGas': max(math.ceil(transaction['maxFeePerGas'] * self.bump_ratio), max_fee),
+            'maxPriorityFeePerGas': max(math.ceil(transaction['maxPriorityFeePerGas'] * self.bump_ratio), priority_fee),
+        }
+
+    async def _send_replacement(self, account: Account, transaction: TxParams) -> Optional[str]:
+        signed_txn = account.sign_transaction(transaction)
+        try:
+            tx_hash = await self.aweb3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        except Exception as e:
+            # 이미 이전 트랜잭션이 포함되어 nonce가 지나간 경우 등: 기존 트랜잭션을 계속 기다립니다
+            logger.warning(f"Failed to send replacement transaction nonce={transaction['nonce']}: {e}")
+            return None
+        self.replaced += 1
+        logger.info(f"replaced transaction nonce={transaction['nonce']} "
+                    f"max_fee={transaction['maxFeePerGas']} tx_hash={tx_hash.to_0x_hex()}")
+        return tx_hash.to_0x_hex()
@@ -1,6 +1,18 @@
+import asyncio
+from typing import Dict, List, Tuple
+from eth_account.signers.local import LocalAccount
 from src.database.repository import ChallengeRepository
 from src.domains import Challenge, ChallengeStatus
+from src.exceptions import ClientException
 from src.registry.transaction import TransactionManager
+from web3.types import TxReceipt
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+CHAIN_STATUS_OPEN = 0 # Oguogu.ChallengeStatus.OPEN
+CHAIN_STATUS_SUCCESS = 1 # Oguogu.ChallengeStatus.SUCCESS
 
 
 class ChallengeRewardService:
@@ -10,9 +22,11 @@ class ChallengeRewardService:
                  transaction: TransactionManager):
         self.repository = repository
         self.transaction = transaction
-        contract = transaction.oguogu_contract()
+        contract = transaction.aoguogu_contract()
         self.complete_function = contract.functions.completeChallenge
-        self.challenge_completed_event = contract.events.ChallengeCompleted()
+        self.status_function = contract.functions.getChallengeStatus
+        self.challenge_function = contract.functions.getChallenge
+        self.owner_function = contract.functions.ownerOf
 
     async def complete_challenge(self, challenge_hash: str) -> Challenge:
         """ 챌린지를 완료하고, 보상 트랜잭션을 지급합니다.
@@ -23,18 +37,64 @@ class ChallengeRewardService:
         
         if not challenge.available_to_complete():
             raise ValueError("Challenge is not available to complete")
+        
+        # 컨트랙트에서 revert될 트랜잭션에 수수료를 쓰지 않도록 먼저 확인합니다
+        completable, = await self.check_completable([challenge])
+        if not completable:
+            raise ClientException(message="블록체인에서 아직 완료할 수 없는 챌린지예요.")
         request = self.complete_function(challenge.challenger_address, challenge.id)
                 
-        tx_receipt = await self.transaction.asend_transaction(request)
-        tx_hash = tx_receipt['transactionHash'].to_0x_hex()
+        tx_receipt = await self.transaction.asend_transaction_on_lane(request)
+        if await self._apply_receipt(challenge, tx_receipt):
+            await self.repository.complete_challenge(challenge)
+        return challenge
+    
+    async def complete_challenges(self, challenges: List[Challenge]) -> List[Challenge]:
+        """ 여러 챌린지를 한 번에 완료하고, 완료된 챌린지 목록을 반환합니다.
         
-        events = await self.transaction.aget_events_from_transcation(
-            tx_hash, 
-            self.challenge_completed_event
-        )
+        컨트랙트에서 완료할 수 있는 챌린지만 골라서 lane 스케줄러가 배정한 operator 계정(lane)별로 트랜잭션을 한 번에 전송하고,
+        결과는 한 번의 bulk UPDATE로 저장합니다. 실패한 트랜잭션의 챌린지는 OPEN으로 남습니다.
+        """
+        challenges = [challenge for challenge in challenges if challenge.available_to_complete()]
+        if not challenges:
+            return []
         
-        complete_date = await self.transaction.aget_txreceipt_datetime(tx_receipt)
+        completable = await self.check_completable(challenges)
+        challenges = [challenge for challenge, ok in zip(challenges, completable) if ok]
+        
+        # 멈춘 lane이나 진행 중인 트랜잭션이 많은 lane에는 챌린지를 덜 배정합니다
+        lanes: Dict[str, Tuple[LocalAccount, List[Challenge]]] = {}
+        for account, challenge in zip(self.transaction.lanes.assign(len(challenges)), challenges):
+            lanes.setdefault(account.address, (account, []))[1].append(challenge)
+        lanes = list(lanes.values())
+        results = await asyncio.gather(*[
+            self.transaction.asend_transactions(
+                [self.complete_function(challenge.challenger_address, challenge.id) for challenge in lane],
+                account,
+            )
+            for account, lane in lanes
+        ])
         
+        completed = []
+        for (_, lane), receipts in zip(lanes, results):
+            for challenge, tx_receipt in zip(lane, receipts):
+                if isinstance(tx_receipt, Exception):
+                    logger.warning(f"Failed to complete challenge {challenge.id}: {tx_receipt}")
+                    continue
+                if await self._apply_receipt(challenge, tx_receipt):
+                    completed.append(challenge)
+        
+        await self.repository.complete_challenges(completed)
+        return completed
+    
+    async def _apply_receipt(self, challenge: Challenge, tx_receipt: TxReceipt) -> bool:
+        """ ChallengeCompleted 이벤트의 결과를 챌린지에 반영합니다. """
+        tx_hash = tx_receipt['transactionHash'].to_0x_hex()
+        events = self.transaction.event_decoder.decode_receipt(tx_receipt, "ChallengeCompleted")
+        if not events:
+            return False
+        
+        complete_date = await self.transaction.aget_txreceipt_datetime(tx_receipt)
         for event in events:
             status = event['args']['status']
             payment_reward = event['args']['paymentReward']
@@ -42,6 +102,26 @@ class ChallengeRewardService:
                 challenge.success(tx_hash, payment_reward, complete_date)
             else:
                 challenge.fail(tx_hash, payment_reward, complete_date)
-            await self.repository.complete_challenge(challenge)
-        return challenge
-        
\ No newline at end of file
+        return True
+        
+    async def check_completable(self, challenges: List[Challenge]) -> List[bool]:
+        """ 컨트랙트 기준으로 completeChallenge가 성공할 챌린지인지 eth_call로 확인합니다.
+        
+        챌린지 NFT가 존재하고(ownerOf), getChallengeStatus가 OPEN이 아니고, getChallenge의 완료 여부가 false여야 합니다.
+        여러 챌린지를 Multicall3로 묶어서 한 번에 조회합니다.
+        """
+        calls = []
+        for challenge in challenges:
+            calls.append(self.status_function(challenge.id))
+            calls.append(self.challenge_function(challenge.id))
+            calls.append(self.owner_function(challenge.id))
+        results = await self.transaction.multicall.call(calls)
+        
+        completable = []
+        for status, detail, owner in zip(results[0::3], results[1::3], results[2::3]):
+            if any(isinstance(result, Exception) for result in (status, detail, owner)):
+                completable.append(False)
+                continue
+            is_closed = detail[-1]
+            completable.append(status != CHAIN_STATUS_OPEN and not is_closed)
+        return completable
@@ -1,16 +1,27 @@
 import asyncio
 from datetime import datetime
 import time
-from typing import List, Optional
+from typing import List, Optional, Union
 from hexbytes import HexBytes
 import pytz
 from src.abis.constants import OGUOGU_EVENT_ABI
+from src.registry.block import BlockTimestampCache
+from src.registry.events import EventDecoder
+from src.registry.fee import FeeOracle
+from src.registry.lanes import OperatorLanes
+from src.registry.multicall import Multicall
+from src.registry.nonce import NonceManager
+from src.registry.provider import BatchingProvider, ProviderPool
+from src.registry.receipt import ReceiptWatcher
+from src.registry.replacement import TransactionReplacer
 from src.settings import Settings
 from src.utils import create_signature
 from web3 import Web3, AsyncWeb3
 from eth_account import Account
-from web3.contract.contract import ContractFunction, ContractEvent, Contract
-from web3.types import TxReceipt, EventData
+from web3.contract.contract import ContractFunction, Contract
+from web3.contract.async_contract import AsyncContract, AsyncContractFunction
+from web3.exceptions import TimeExhausted
+from web3.types import RPCEndpoint, TxParams, TxReceipt, EventData
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,32 +33,72 @@ class TransactionManager:
     def __init__(self, settings: Settings):
         self.operator = Account.from_key(settings.OPERATOR_PRIVATE_KEY)
         self.web3 = Web3(Web3.HTTPProvider(settings.WEB3_PROVIDER_URL))
-        self.aweb3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(settings.WEB3_PROVIDER_URL))
+        self.provider_pool = ProviderPool.from_urls(
+            [settings.WEB3_PROVIDER_URL, *settings.WEB3_PROVIDER_URLS],
+            hedge_percentile=settings.RPC_HEDGE_PERCENTILE,
+            hedge_min_delay=settings.RPC_HEDGE_MIN_DELAY,
+        )
+        self.aweb3 = AsyncWeb3(BatchingProvider(
+            self.provider_pool,
+            window=settings.RPC_BATCH_WINDOW,
+            max_size=settings.RPC_BATCH_SIZE,
+        ))
+        # operator(컨트랙트 owner) 외의 계정은 권한이 필요 없는 함수(completeChallenge)에만 사용합니다
+        self.operators = list({
+            account.address: account
+            for account in [self.operator, *[Account.from_key(key) for key in settings.OPERATOR_PRIVATE_KEYS]]
+        }.values())
+        self.nonce_managers = {
+            account.address: NonceManager(self.aweb3, account.address) for account in self.operators
+        }
+        self.nonce_manager = self.nonce_managers[self.operator.address]
+        self.lanes = OperatorLanes(self.operators, settings.OPERATOR_LANE_STALL_TIMEOUT)
+        self.block_cache = BlockTimestampCache(settings.BLOCK_CACHE_SIZE, settings.BLOCK_CONFIRMATION_DEPTH)
+        self.receipt_watcher = ReceiptWatcher(self.aweb3, settings.RECEIPT_POLL_INTERVAL, self.block_cache)
+        self.fee_oracle = FeeOracle(
+            self.aweb3, 
+            self.block_cache,
+            max_age=settings.FEE_MAX_AGE,
+            history_blocks=settings.FEE_HISTORY_BLOCKS,
+            priority_percentile=settings.FEE_PRIORITY_PERCENTILE,
+            base_fee_multiplier=settings.FEE_BASE_FEE_MULTIPLIER,
+            gas_margin=settings.GAS_ESTIMATE_MARGIN,
+        )
+        self.replacer = TransactionReplacer(
+            self.aweb3,
+            self.receipt_watcher,
+            self.block_cache,
+            self.fee_oracle,
+            stuck_blocks=settings.TX_STUCK_BLOCKS,
+            bump_ratio=settings.TX_FEE_BUMP_RATIO,
+            max_replacements=settings.TX_MAX_REPLACEMENTS,
+        )
         self.contract = self.web3.eth.contract(
             address=settings.OGUOGU_ADDRESS,
             abi=OGUOGU_EVENT_ABI
         )
+        self.acontract = self.aweb3.eth.contract(
+            address=settings.OGUOGU_ADDRESS,
+            abi=OGUOGU_EVENT_ABI
+        )
+        self.event_decoder = EventDecoder(self.aweb3.codec, settings.OGUOGU_ADDRESS, OGUOGU_EVENT_ABI)
+        self.multicall = Multicall(self.aweb3, settings.MULTICALL3_ADDRESS, settings.MULTICALL_BATCH_SIZE)
         
     def oguogu_contract(self) -> Contract:
         return self.contract
+    
+    def aoguogu_contract(self) -> AsyncContract:
+        """ AsyncWeb3 기반 컨트랙트. 이벤트 루프 안에서는 이 컨트랙트를 사용합니다. """
+        return self.acontract
         
     def get_events_from_transaction(
         self, 
         transaction_hash: str, 
-        contract_event: ContractEvent,
+        event_name: str,
     ) -> List[EventData]:
         logger.info(f"get_events_from_transaction {transaction_hash}")
         receipt = self.wait_tx_receipt(transaction_hash)
-        
-        events = []
-        for log in receipt['logs']:
-            try:
-                event = contract_event.process_log(log)
-                events.append(event)
-            except Exception as e:
-                logger.info(f"skip {log}")
-                continue
-        return events
+        return self.event_decoder.decode_receipt(receipt, event_name)
     
     def create_signature(self, challenge_hash: str, account: Account=None) -> HexBytes:
         logger.info(f"create_signature {challenge_hash}")
@@ -57,20 +108,11 @@ class TransactionManager:
     async def aget_events_from_transcation(
         self, 
         transaction_hash,
-        contract_event: ContractEvent,
+        event_name: str,
     ) -> List[EventData]:
         logger.info(f"aget_event_from_transcation {transaction_hash}")
         receipt = await self.await_tx_receipt(transaction_hash)
-        
-        events = []
-        for log in receipt['logs']:
-            try:
-                event = contract_event.process_log(log)
-                events.append(event)
-            except Exception as e:
-                logger.info(f"skip {log}")
-                continue
-        return events
+        return self.event_decoder.decode_receipt(receipt, event_name)
 
     def send_transaction(
         self,
@@ -92,22 +134,138 @@ class TransactionManager:
         
     async def asend_transaction(
         self,
-        func: ContractFunction,
+        func: Union[AsyncContractFunction, ContractFunction],
         account: Account = None,
     ) -> TxReceipt:
         logger.info(f"asend_transaction {func}")
+        result, = await self.asend_transactions([func], account)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    async def asend_transaction_on_lane(
+        self,
+        func: Union[AsyncContractFunction, ContractFunction],
+    ) -> TxReceipt:
+        """ 가장 한가한 operator 계정으로 트랜잭션을 전송합니다.
+        
+        onlyOwner 함수는 owner(operator) 계정만 호출할 수 있으므로, 권한이 필요 없는 함수에만 사용합니다.
+        """
+        return await self.asend_transaction(func, self.lanes.select())
+    
+    async def asend_transactions(
+        self,
+        funcs: List[Union[AsyncContractFunction, ContractFunction]],
+        account: Account = None,
+    ) -> List[Union[TxReceipt, Exception]]:
+        """ 여러 트랜잭션을 연속된 nonce로 한 번에 전송합니다.
+        
+        트랜잭션 전송은 하나의 JSON-RPC 배치 요청으로 보내고, 각 트랜잭션의 결과(영수증 또는 예외)를
+        요청 순서대로 반환합니다. 하나가 실패해도 나머지 트랜잭션에는 영향을 주지 않습니다.
+        """
         if account is None:
             account = self.operator
-            
-        nonce = await self.aweb3.eth.get_transaction_count(account.address)
-        tx = func.build_transaction({ 'from': account.address, 'nonce': nonce })
-        signed_txn = account.sign_transaction(tx)
         
-        txn_hash = await self.aweb3.eth.send_raw_transaction(signed_txn.raw_transaction)
-        tx_receipt = await self.aweb3.eth.wait_for_transaction_receipt(txn_hash)
+        with self.lanes.track(account, len(funcs)):
+            return await self._asend_transactions(funcs, account)
+    
+    async def _asend_transactions(
+        self,
+        funcs: List[Union[AsyncContractFunction, ContractFunction]],
+        account: Account,
+    ) -> List[Union[TxReceipt, Exception]]:
+        results: List[Union[TxReceipt, Exception]] = list(await asyncio.gather(
+            *[self.abuild_transaction(func, { 'from': account.address }) for func in funcs],
+            return_exceptions=True
+        ))
+        built = [index for index, result in enumerate(results) if not isinstance(result, Exception)]
+        if not built:
+            return results
         
-        verify_transaction(tx_receipt)
-        return tx_receipt    
+        nonce_manager = self.get_nonce_manager(account)
+        if nonce_manager is None:
+            base_nonce = await self.aweb3.eth.get_transaction_count(account.address)
+            nonces = [base_nonce + offset for offset in range(len(built))]
+        else:
+            nonces = await nonce_manager.allocate_many(len(built))
+        
+        transactions = {index: { **results[index], 'nonce': nonce } for index, nonce in zip(built, nonces)}
+        raw_transactions = []
+        for index in built:
+            signed_txn = account.sign_transaction(transactions[index])
+            raw_transactions.append(signed_txn.raw_transaction.to_0x_hex())
+        
+        try:
+            responses = await self.aweb3.provider.make_batch_request([
+                (RPCEndpoint("eth_sendRawTransaction"), [raw_transaction]) 
+                for raw_transaction in raw_transactions
+            ])
+            if not isinstance(responses, list):
+                raise Exception(f"Failed to send transactions: {responses.get('error')}")
+        except Exception as e:
+            if nonce_manager is not None:
+                nonce_manager.resync()
+            for index in built:
+                results[index] = e
+            return results
+        
+        waiting = {}
+        for index, response in zip(built, responses):
+            if response.get("error"):
+                results[index] = Exception(f"Failed to send transaction: {response['error']}")
+            else:
+                # 오래 포함되지 않으면 같은 nonce로 수수료를 올려서 다시 보냅니다
+                waiting[index] = self.replacer.wait(account, transactions[index], response["result"])
+        
+        if len(waiting) < len(built) and nonce_manager is not None:
+            # 거절된 트랜잭션의 nonce는 노드 기준으로 다시 맞춥니다
+            nonce_manager.resync()
+        
+        receipts = await asyncio.gather(*waiting.values(), return_exceptions=True)
+        for index, receipt in zip(waiting, receipts):
+            if isinstance(receipt, TimeExhausted) and nonce_manager is not None:
+                nonce_manager.resync()
+            if not isinstance(receipt, Exception):
+                self.fee_oracle.observe_receipt(funcs[index], transactions[index], receipt)
+                try:
+                    verify_transaction(receipt)
+                except Exception as e:
+                    receipt = e
+            results[index] = receipt
+        return results
+    
+    def get_nonce_manager(self, account: Account) -> Optional[NonceManager]:
+        """ 로컬에서 nonce를 관리하는 계정(operator)이면 NonceManager를 반환합니다.
+        
+        다른 계정은 서버 밖에서도 트랜잭션을 보낼 수 있으므로 매번 노드에서 nonce를 조회합니다.
+        """
+        return self.nonce_managers.get(account.address)
+    
+    async def abuild_transaction(
+        self,
+        func: Union[AsyncContractFunction, ContractFunction],
+        transaction: TxParams,
+    ) -> TxParams:
+        """ 이벤트 루프를 막지 않고 트랜잭션을 생성합니다.
+        
+        chain id와 수수료는 FeeOracle의 캐시 값을 채워 넣고, gas는 상태에 따라 달라지므로 매번 추정합니다.
+        동기 컨트랙트 함수는 별도 스레드에서 실행합니다.
+        """
+        chain_id, (max_fee, priority_fee), gas = await asyncio.gather(
+            self.fee_oracle.chain_id(),
+            self.fee_oracle.fees(),
+            self.fee_oracle.estimate_gas(func, transaction),
+        )
+        transaction = {
+            'chainId': chain_id,
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': priority_fee,
+            'gas': gas,
+            **transaction,
+        }
+        if isinstance(func, AsyncContractFunction):
+            return await func.build_transaction(transaction)
+        return await asyncio.to_thread(func.build_transaction, transaction)
     
     def get_txreceipt_datetime(self, tx_receipt: TxReceipt) -> Optional[datetime]:
         logger.info(f"get_txreceipt_datetime {tx_receipt}")
@@ -121,8 +279,12 @@ class TransactionManager:
     async def aget_txreceipt_datetime(self, tx_receipt: TxReceipt) -> Optional[datetime]:
         logger.info(f"aget_txreceipt_datetime {tx_receipt}")
         try:
-            block = await self.aweb3.eth.get_block(tx_receipt.blockNumber)
-            return datetime.fromtimestamp(block.timestamp, tz=pytz.utc)
+            timestamp = self.block_cache.get(tx_receipt.blockNumber, tx_receipt.blockHash)
+            if timestamp is None:
+                block = await self.aweb3.eth.get_block(tx_receipt.blockHash)
+                self.block_cache.put(block.number, block.hash, block.timestamp)
+                timestamp = block.timestamp
+            return datetime.fromtimestamp(timestamp, tz=pytz.utc)
         except Exception as e:
             logger.error(f"Failed to get tx receipt datetime: {e}")
             return None
@@ -150,20 +312,9 @@ class TransactionManager:
         self, 
         transaction_hash: str,
         timeout: float = 120,
-        poll_latency: float = 0.1,
-    ) -> bool:
+    ) -> TxReceipt:
         """ 트랜잭션 수행 후, 트랜잭션 수행 결과를 반환합니다 """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                receipt = await self.aweb3.eth.get_transaction_receipt(transaction_hash)
-                if receipt is not None:
-                    return receipt
-            except Exception:
-                continue
-            await asyncio.sleep(poll_latency)
-        
-        raise Exception(f"Timeout waiting for transaction receipt {transaction_hash}")        
+        return await self.receipt_watcher.wait(transaction_hash, timeout)
 
 def verify_transaction(tx_receipt: TxReceipt) -> bool:
     if tx_receipt.status != 1:
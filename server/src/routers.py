@@ -1,34 +1,44 @@
 from datetime import datetime
 import json
-from typing import Annotated, Dict, List, Literal, Optional
+from typing import Annotated, AsyncGenerator, Dict, List, Literal, Optional
 from eth_typing import ChecksumAddress
-from fastapi import APIRouter, Depends, Form, UploadFile
+from fastapi import APIRouter, Depends, Form, Query, UploadFile, status
 from dependency_injector.wiring import Provide, inject
 from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from src.auth import Authenticator
 from src.container import AppContainer
-from src.domains import Challenge, ChallengeActivity, ChallengeSignature, ChallengeStatus
+from src.database.database import SessionManager
+from src.domains import ActivitySubmission, Challenge, ChallengeActivity, ChallengePage, ChallengeSignature, ChallengeStatus
 from src.exceptions import ClientException
 from src.registry.challenge import ChallengeRegistryService
 from pydantic import BaseModel, Field
 from src.registry.activity import ActivityRegistryService
+from src.registry.outbox import ActivitySubmissionOutbox
 from src.registry.reward import ChallengeRewardService
-from src.utils import generate_photo_activity, recover_address
+from src.registry.transaction import TransactionManager
+from src.utils import generate_photo_activity
 
 
 RegistryDependency = Depends(Provide[AppContainer.registry.registry])
 ActivityDependency = Depends(Provide[AppContainer.registry.activity])
 RewardDependency = Depends(Provide[AppContainer.registry.reward])
+OutboxDependency = Depends(Provide[AppContainer.registry.outbox])
+TransactionDependency = Depends(Provide[AppContainer.registry.transaction])
+AuthenticatorDependency = Depends(Provide[AppContainer.authenticator])
+SessionManagerDependency = Depends(Provide[AppContainer.registry.database.session_manager])
 
 
 class ChallengeListDTO(BaseModel):
     """ Challenge List DTO """
     challenges: List['ChallengeDTO'] = Field(description="Challenges")
+    next_cursor: Optional[str] = Field(description="Cursor of the next page (null on the last page)")
     
     @staticmethod
-    def from_domain(challenges: List[Challenge]) -> 'ChallengeListDTO':
+    def from_domain(page: ChallengePage) -> 'ChallengeListDTO':
         return ChallengeListDTO(
-            challenges=[ChallengeDTO.from_domain(challenge) for challenge in challenges]
+            challenges=[ChallengeDTO.from_domain(challenge) for challenge in page.challenges],
+            next_cursor=page.next_cursor,
         )
 
 class ChallengeDTO(BaseModel):
@@ -47,6 +57,7 @@ class ChallengeDTO(BaseModel):
     start_date: datetime = Field(description="Challenge Start Date")
     end_date: datetime = Field(description="Challenge End Date")
     minimum_activity_count: int = Field(description="Minimum Activity Count", examples=[3])
+    completed_activity_count: int = Field(description="Completed Activity Count", examples=[1])
     
     activities: List['ActivityDTO'] = Field(description="Activities")
     
@@ -68,6 +79,7 @@ class ChallengeDTO(BaseModel):
             start_date=challenge.start_date,
             end_date=challenge.end_date,
             minimum_activity_count=challenge.minimum_activity_count,
+            completed_activity_count=challenge.completed_activity_count,
             activities=[ActivityDTO.from_domain(activity) for activity in challenge.activities if activity.is_completed()],
             payment_transaction=challenge.payment_transaction,
             payment_reward=str(int(challenge.payment_reward)),
@@ -126,23 +138,143 @@ class ActivityHashDTO(BaseModel):
     activity_hash: str = Field(description="Activity Hash")
 
 
+class ActivitySubmissionDTO(BaseModel):
+    """ Activity Submission DTO """
+    challenge_hash: str = Field(description="Challenge Hash")
+    activity_hash: str = Field(description="Activity Hash")
+    status: Literal["PENDING", "PROCESSING", "SUCCESS", "FAILED"] = Field(description="Submission Status")
+    attempts: int = Field(description="Submission Attempts")
+    last_error: Optional[str] = Field(description="Last Error Message")
+    status_url: str = Field(description="Submission Status URL")
+    
+    @staticmethod
+    def from_domain(submission: ActivitySubmission) -> 'ActivitySubmissionDTO':
+        return ActivitySubmissionDTO(
+            challenge_hash=submission.challenge_hash,
+            activity_hash=submission.activity_hash,
+            status=submission.status.value,
+            attempts=submission.attempts,
+            last_error=submission.last_error,
+            status_url=f"/challenges/{submission.challenge_hash}/photo-activities/{submission.activity_hash}/submission",
+        )
+
+
+class ProviderStatsDTO(BaseModel):
+    """ RPC Provider Stats DTO """
+    name: str = Field(description="Provider name (index:host, URL path and query removed)")
+    requests: int = Field(description="Request Count")
+    errors: int = Field(description="Error Count")
+    error_rate: float = Field(description="Error Rate (moving average)")
+    inflight: int = Field(description="In-flight Request Count")
+    latency: Optional[float] = Field(description="Latency in seconds (moving average)")
+    p50: Optional[float] = Field(description="Latency p50 in seconds")
+    p95: Optional[float] = Field(description="Latency p95 in seconds")
+    p99: Optional[float] = Field(description="Latency p99 in seconds")
+
+
+class RPCMetricsDTO(BaseModel):
+    """ RPC Metrics DTO """
+    providers: List[ProviderStatsDTO] = Field(description="Per-provider stats")
+    hedged: int = Field(description="Hedged read count")
+
+
+class DatabasePoolMetricsDTO(BaseModel):
+    """ Database Connection Pool Metrics DTO """
+    size: int = Field(description="Pool Size")
+    checked_out: int = Field(description="In-use Connection Count")
+    idle: int = Field(description="Idle Connection Count")
+    overflow: int = Field(description="Overflow Connection Count")
+    waiting: int = Field(description="Checkout count waiting for a connection to be returned (pool exhausted)")
+    checkouts: int = Field(description="Checkout Count")
+    timeouts: int = Field(description="Checkout Timeout Count")
+    wait: Optional[float] = Field(description="Checkout wait in seconds (average)")
+    p50: Optional[float] = Field(description="Checkout wait p50 in seconds")
+    p95: Optional[float] = Field(description="Checkout wait p95 in seconds")
+    p99: Optional[float] = Field(description="Checkout wait p99 in seconds")
+
+
+class SessionTokenDTO(BaseModel):
+    """ Session Token DTO """
+    token: str = Field(description="Session Token")
+    expires_at: datetime = Field(description="Session Token Expiration Date")
+
+
 router = APIRouter()
 
 security = HTTPBearer()
 
 
+@inject
+def authenticate_metrics(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    authenticator: Authenticator = AuthenticatorDependency,
+) -> None:
+    authenticator.authenticate_metrics(credentials.credentials)
+
+
+# 운영 지표. 공개 API 문서에 노출하지 않고, METRICS_TOKEN으로만 조회합니다
+metrics_router = APIRouter(
+    prefix="/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(authenticate_metrics)],
+)
+
+
 @router.get("/", include_in_schema=False)
 async def read_root():
     return {"message": "Oguogu API Server"}
 
 
+@metrics_router.get("/rpc")
+@inject
+async def get_rpc_metrics(
+    transaction: TransactionManager = TransactionDependency
+) -> RPCMetricsDTO:
+    pool = transaction.provider_pool
+    return RPCMetricsDTO(
+        providers=[ProviderStatsDTO(**stats) for stats in pool.get_stats()],
+        hedged=pool.hedged,
+    )
+
+
+@metrics_router.get("/db")
+@inject
+async def get_db_metrics(
+    session_manager: SessionManager = SessionManagerDependency
+) -> DatabasePoolMetricsDTO:
+    return DatabasePoolMetricsDTO(**session_manager.get_pool_stats())
+
+
+@inject
 def authenticate_by_signature(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    authenticator: Authenticator = AuthenticatorDependency,
 ) -> ChecksumAddress:
-    print("credentials: ", credentials)
-    token = credentials.credentials
-    message, signature = token.split(":")
-    return recover_address(message, signature)
+    return authenticator.authenticate(credentials.credentials)
+
+
+@inject
+async def unit_of_work(
+    session_manager: SessionManager = SessionManagerDependency,
+) -> AsyncGenerator[None, None]:
+    """ 요청의 저장소 호출을 커넥션 하나, 트랜잭션 하나로 묶고 응답 전에 커밋합니다. (DB만 사용하는 요청에만 사용) """
+    async with session_manager.unit_of_work():
+        yield
+
+
+UnitOfWorkDependency = Depends(unit_of_work)
+
+
+@router.post("/sessions", operation_id="create_session")
+@inject
+async def create_session(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    authenticator: Authenticator = AuthenticatorDependency,
+) -> SessionTokenDTO:
+    """ 지갑 서명 토큰(message:signature)을 검증하고, 세션 토큰을 발급합니다. """
+    user_address = authenticator.authenticate_signature(credentials.credentials)
+    token, expires_at = authenticator.issue_session_token(user_address)
+    return SessionTokenDTO(token=token, expires_at=expires_at)
 
 
 @router.get("/challenges/{challenge_hash}", operation_id="get_challenge")
@@ -160,12 +292,15 @@ async def get_challenge(
 @inject
 async def get_challenges(
     user_address: Annotated[ChecksumAddress, Depends(authenticate_by_signature)],
+    cursor: Annotated[Optional[str], Query(description="next_cursor of the previous page")] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    statuses: Annotated[Optional[List[ChallengeStatus]], Query(alias="status", description="Challenge Status filter")] = None,
     registry: ChallengeRegistryService = RegistryDependency
 ) -> ChallengeListDTO:
-    challenges = await registry.get_active_challenges(user_address)
-    return ChallengeListDTO.from_domain(challenges)
+    page = await registry.get_active_challenges(user_address, statuses, cursor, limit)
+    return ChallengeListDTO.from_domain(page)
 
-@router.post("/challenges", operation_id="create_challenge")
+@router.post("/challenges", operation_id="create_challenge", dependencies=[UnitOfWorkDependency])
 @inject
 async def create_challenge(
     user_address: Annotated[ChecksumAddress, Depends(authenticate_by_signature)],
@@ -201,7 +336,7 @@ async def register_challenge(
     request: ChallengeRegisterDTO,
     registry: ChallengeRegistryService = RegistryDependency
 ) -> OkResponse:
-    await registry.register_challenge(request.transaction_hash)
+    await registry.register_challenge(request.transaction_hash, challenge_hash)
     return OkResponse(ok=True)
 
 
@@ -211,27 +346,33 @@ async def create_photo_activity(
     challenge_hash: str,
     activity_file: UploadFile,
     registry: ChallengeRegistryService = RegistryDependency,
-    activity_service: ActivityRegistryService = ActivityDependency
+    activity_service: ActivityRegistryService = ActivityDependency,
+    session_manager: SessionManager = SessionManagerDependency,
 ) -> ActivityHashDTO:
+    """ 사진 증명을 채점하고 업로드한 뒤 등록합니다.
+    
+    중복 확인과 등록은 한 트랜잭션이 아닙니다. 같은 사진을 동시에 올리면 두 요청 모두 채점과 업로드를 하고,
+    등록할 때 기본 키로 하나만 남깁니다. (나머지 요청은 "이미 동일한 것이 제출되었어요.")
+    """
     activity_content = await generate_photo_activity(activity_file)
     
     activity = ChallengeActivity.new(activity_content)
-    if activity := await activity_service.find_activity(challenge_hash, activity.activity_hash):
-        if activity.is_completed():
-            raise ClientException(message="이미 제출한 제출물이에요.")
-        return ActivityHashDTO(activity_hash=activity.activity_hash)
-    else:
-        activity = ChallengeActivity.new(activity_content)
+    # 조회만 커넥션 하나로 묶고, 채점(OpenAI) / 업로드 중에는 커넥션을 잡지 않습니다
+    async with session_manager.unit_of_work():
+        if activity := await activity_service.find_activity(challenge_hash, activity.activity_hash):
+            if activity.is_completed():
+                raise ClientException(message="이미 제출한 제출물이에요.")
+            return ActivityHashDTO(activity_hash=activity.activity_hash)
         
+        challenge = await registry.get_challenge(challenge_hash, with_activities=False)
     
-    challenge = await registry.get_challenge(challenge_hash)
-    
+    activity = ChallengeActivity.new(activity_content)
     await activity_service.register_activity(challenge, activity_content)
     
     return ActivityHashDTO(activity_hash=activity.activity_hash)
 
 
-@router.get("/challenges/{challenge_hash}/photo-activities/{activity_hash}", operation_id="get_photo_activity")
+@router.get("/challenges/{challenge_hash}/photo-activities/{activity_hash}", operation_id="get_photo_activity", dependencies=[UnitOfWorkDependency])
 @inject
 async def get_photo_activity(
     challenge_hash: str,
@@ -240,7 +381,7 @@ async def get_photo_activity(
     registry: ChallengeRegistryService = RegistryDependency,
     activity_service: ActivityRegistryService = ActivityDependency
 ) -> StreamingResponse:
-    challenge = await registry.get_challenge(challenge_hash)
+    challenge = await registry.get_challenge(challenge_hash, with_activities=False)
     
     if challenge.challenger_address != user_address:
         raise ClientException(message="접근 권한이 없어요.")
@@ -262,18 +403,34 @@ async def get_photo_activity(
     )
 
 
-@router.post("/challenges/{challenge_hash}/photo-activities/{activity_hash}/register", operation_id="register_photo_activity")
+@router.post(
+    "/challenges/{challenge_hash}/photo-activities/{activity_hash}/register", 
+    operation_id="register_photo_activity",
+    status_code=status.HTTP_202_ACCEPTED,
+)
 @inject
 async def register_photo_activity(
     challenge_hash: str,
     activity_hash: str,
     activity_signature: str = Form(..., description="Activity Signature"),
     registry: ChallengeRegistryService = RegistryDependency,
-    activity_service: ActivityRegistryService = ActivityDependency
-) -> OkResponse:
-    challenge = await registry.get_challenge(challenge_hash)
-    await activity_service.submit_activity(challenge, activity_hash, activity_signature)
-    return OkResponse(ok=True)
+    outbox: ActivitySubmissionOutbox = OutboxDependency
+) -> ActivitySubmissionDTO:
+    """ 제출 요청을 접수하고 바로 응답합니다. 블록체인 등록 결과는 status_url로 확인합니다. """
+    challenge = await registry.get_challenge(challenge_hash, with_activities=False)
+    submission = await outbox.enqueue(challenge, activity_hash, activity_signature)
+    return ActivitySubmissionDTO.from_domain(submission)
+
+
+@router.get("/challenges/{challenge_hash}/photo-activities/{activity_hash}/submission", operation_id="get_photo_activity_submission")
+@inject
+async def get_photo_activity_submission(
+    challenge_hash: str,
+    activity_hash: str,
+    outbox: ActivitySubmissionOutbox = OutboxDependency
+) -> ActivitySubmissionDTO:
+    submission = await outbox.get_submission(challenge_hash, activity_hash)
+    return ActivitySubmissionDTO.from_domain(submission)
 
 
 @router.post("/challenges/{challenge_hash}/complete", operation_id="complete_challenge")
@@ -1,3 +1,4 @@
+from typing import List
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -27,7 +28,37 @@ class Settings(BaseSettings):
         default="admin123",
         description="디비 패스워드 이름"
     )
-    
+
+    DB_POOL_SIZE: int = Field(
+        default=10,
+        description="커넥션 풀에 유지하는 커넥션 수",
+    )
+
+    DB_MAX_OVERFLOW: int = Field(
+        default=20,
+        description="풀이 가득 찼을 때 추가로 열 수 있는 커넥션 수",
+    )
+
+    DB_POOL_TIMEOUT: float = Field(
+        default=30.0,
+        description="풀에서 커넥션을 가져오기 위해 기다리는 최대 시간(초)",
+    )
+
+    DB_POOL_RECYCLE: int = Field(
+        default=1800,
+        description="이 시간(초)보다 오래된 커넥션은 다시 연결합니다. -1이면 재연결하지 않음",
+    )
+
+    DB_POOL_PRE_PING: bool = Field(
+        default=True,
+        description="커넥션을 가져올 때 살아 있는지 확인합니다 (failover 후 끊어진 커넥션 제거)",
+    )
+
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=100,
+        description="커넥션별 asyncpg prepared statement 캐시 크기. pgbouncer transaction 모드에서는 0",
+    )
+
     S3_URL: str = Field(
         default="http://localhost:9000",
         description="s3 url",
@@ -53,16 +84,201 @@ class Settings(BaseSettings):
         description="web3 provider url",
     )
     
+    WEB3_PROVIDER_URLS: List[str] = Field(
+        default=[],
+        description="읽기 요청을 나눠 보낼 추가 web3 provider url 목록 (WEB3_PROVIDER_URL이 primary)",
+    )
+    
+    RPC_HEDGE_PERCENTILE: float = Field(
+        default=0.95,
+        description="읽기 요청을 다른 노드에도 보내기 전에 기다리는 응답 시간 percentile",
+    )
+    
+    RPC_HEDGE_MIN_DELAY: float = Field(
+        default=0.05,
+        description="읽기 요청을 다른 노드에도 보내기 전에 기다리는 최소 시간(초)",
+    )
+    
+    RPC_BATCH_WINDOW: float = Field(
+        default=0.0,
+        description="JSON-RPC 요청을 하나의 배치로 묶기 위해 기다리는 시간(초). 0이면 같은 이벤트 루프 tick의 요청만 묶습니다",
+    )
+    
+    RPC_BATCH_SIZE: int = Field(
+        default=100,
+        description="JSON-RPC 배치 요청의 최대 크기",
+    )
+    
     OPERATOR_PRIVATE_KEY: str = Field(
         default="0x0000000000000000000000000000000000000000000000000000000000000000",
         description="operator private key",
     )
     
+    OPERATOR_PRIVATE_KEYS: List[str] = Field(
+        default=[],
+        description="권한이 필요 없는 트랜잭션(completeChallenge)을 나눠 보낼 추가 operator 키 목록",
+    )
+    
+    OPERATOR_LANE_STALL_TIMEOUT: float = Field(
+        default=60.0,
+        description="operator 계정의 트랜잭션이 이 시간(초)보다 오래 대기 중이면 그 계정에 새 트랜잭션을 배정하지 않습니다",
+    )
+    
+    RECEIPT_POLL_INTERVAL: float = Field(
+        default=0.25,
+        description="트랜잭션 영수증 대기 시 블록 번호 확인 주기(초)",
+    )
+    
+    BLOCK_CACHE_SIZE: int = Field(
+        default=1024,
+        description="블록 타임스탬프 캐시 크기",
+    )
+    
+    BLOCK_CONFIRMATION_DEPTH: int = Field(
+        default=12,
+        description="reorg가 감지되었을 때 캐시를 유지할 확정 블록 깊이",
+    )
+    
+    FEE_MAX_AGE: float = Field(
+        default=12.0,
+        description="새 블록이 관측되지 않아도 수수료를 다시 조회하는 주기(초)",
+    )
+    
+    FEE_HISTORY_BLOCKS: int = Field(
+        default=10,
+        description="priority fee 계산에 사용할 eth_feeHistory 블록 수",
+    )
+    
+    FEE_PRIORITY_PERCENTILE: float = Field(
+        default=50.0,
+        description="priority fee로 사용할 eth_feeHistory reward percentile",
+    )
+    
+    FEE_BASE_FEE_MULTIPLIER: float = Field(
+        default=2.0,
+        description="maxFeePerGas 계산 시 다음 블록 base fee에 곱하는 값",
+    )
+    
+    GAS_ESTIMATE_MARGIN: float = Field(
+        default=1.2,
+        description="함수별로 캐시한 gas 추정값에 곱하는 여유 비율",
+    )
+
+    TX_STUCK_BLOCKS: int = Field(
+        default=3,
+        description="트랜잭션이 이 블록 수만큼 포함되지 않으면 수수료를 올려서 다시 보냄",
+    )
+
+    TX_FEE_BUMP_RATIO: float = Field(
+        default=1.125,
+        description="교체 트랜잭션의 수수료 증가 비율 (노드는 보통 10% 이상 증가를 요구)",
+    )
+
+    TX_MAX_REPLACEMENTS: int = Field(
+        default=5,
+        description="트랜잭션 하나당 최대 교체 횟수",
+    )
+
+    ACTIVITY_BATCH_WINDOW: float = Field(
+        default=0.05,
+        description="챌린지 수행 증명 제출 트랜잭션을 묶어서 보내기 위해 기다리는 시간(초)",
+    )
+    
+    ACTIVITY_BATCH_SIZE: int = Field(
+        default=20,
+        description="챌린지 수행 증명 제출 트랜잭션 묶음의 최대 크기",
+    )
+    
+    OUTBOX_POLL_INTERVAL: float = Field(
+        default=1.0,
+        description="챌린지 수행 증명 제출 outbox 확인 주기(초)",
+    )
+    
+    OUTBOX_BATCH_SIZE: int = Field(
+        default=20,
+        description="outbox 워커가 한 번에 가져오는 제출 요청 수",
+    )
+    
+    OUTBOX_MAX_ATTEMPTS: int = Field(
+        default=5,
+        description="제출 요청 최대 시도 횟수",
+    )
+    
+    OUTBOX_RETRY_BACKOFF: float = Field(
+        default=10.0,
+        description="제출 실패 시 재시도 대기 시간(초). 시도 횟수만큼 곱해집니다",
+    )
+    
+    OUTBOX_LEASE: float = Field(
+        default=300.0,
+        description="워커가 가져간 제출 요청을 다른 워커가 다시 가져갈 수 있을 때까지의 시간(초)",
+    )
+    
+    INDEXER_START_BLOCK: int = Field(
+        default=0,
+        description="체크포인트가 없을 때 인덱싱을 시작할 블록 (컨트랙트 배포 블록)",
+    )
+    
+    INDEXER_CONFIRMATIONS: int = Field(
+        default=2,
+        description="인덱싱할 때 최신 블록에서 제외할 블록 수",
+    )
+    
+    INDEXER_POLL_INTERVAL: float = Field(
+        default=2.0,
+        description="새 블록 확인 주기(초)",
+    )
+    
+    INDEXER_MAX_RANGE: int = Field(
+        default=2000,
+        description="eth_getLogs 한 번에 조회할 최대 블록 범위",
+    )
+    
+    INDEXER_TARGET_LOGS: int = Field(
+        default=1000,
+        description="eth_getLogs 한 번에 가져올 로그 수 목표. 이보다 많으면 범위를 줄입니다",
+    )
+
+    COMPLETION_INTERVAL: float = Field(
+        default=60.0,
+        description="종료된 챌린지를 자동으로 완료하는 주기(초)",
+    )
+
+    COMPLETION_BATCH_SIZE: int = Field(
+        default=50,
+        description="챌린지 자동 완료 시 한 번에 처리하는 챌린지 수",
+    )
+
+    RECONCILE_BATCH_SIZE: int = Field(
+        default=1000,
+        description="DB / 블록체인 상태 비교 시 한 번에 가져오는 챌린지 수",
+    )
+
+    BACKFILL_RANGE: int = Field(
+        default=2000,
+        description="DB 복원 시 eth_getLogs 하나로 조회할 블록 범위",
+    )
+
+    BACKFILL_WORKERS: int = Field(
+        default=4,
+        description="DB 복원 시 동시에 조회하는 블록 범위 수",
+    )
+    
     OGUOGU_ADDRESS: str = Field(
         default="0x0000000000000000000000000000000000000000",
         description="oguogu contract address",
     )
-    
+
+    MULTICALL3_ADDRESS: str = Field(
+        default="0xcA11bde05977b3631167028862bE2a173976CA11",
+        description="Multicall3 컨트랙트 주소 (배포되지 않은 체인이면 eth_call을 배치 요청으로 보냄)",
+    )
+
+    MULTICALL_BATCH_SIZE: int = Field(
+        default=500,
+        description="Multicall3 aggregate3 호출 하나에 묶는 최대 호출 수",
+    )
+
     OPENAI_API_KEY: str = Field(
         default="sk-proj-****",
         description="openai api key",
@@ -76,4 +292,29 @@ class Settings(BaseSettings):
     OPENAI_MODEL_TEMPERATURE: float = Field(
         default=0.0,
         description="openai model temperature",
-    )
\ No newline at end of file
+    )
+
+    AUTH_CACHE_SIZE: int = Field(
+        default=10000,
+        description="서명 토큰 인증 캐시 최대 크기",
+    )
+
+    AUTH_CACHE_TTL: float = Field(
+        default=300.0,
+        description="서명 토큰 인증 캐시 유지 시간(초)",
+    )
+
+    SESSION_SECRET_KEY: str = Field(
+        default="",
+        description="세션 토큰 HMAC 서명 키. 비어 있으면 operator 키에서 유도",
+    )
+
+    SESSION_TOKEN_TTL: int = Field(
+        default=3600,
+        description="세션 토큰 유효 시간(초)",
+    )
+
+    METRICS_TOKEN: str = Field(
+        default="",
+        description="운영 지표(/metrics/*) 조회용 Bearer 토큰. 비어 있으면 지표 엔드포인트를 막습니다",
+    )
@@ -16,6 +16,7 @@ import json
 
 from src.database.container import DataBaseContainer
 from src.database.database import SessionManager
+from src.database.migration import SchemaMigrator
 from src.database.entity import Base
 from src.settings import Settings
 
@@ -163,13 +164,27 @@ def oguogu_contract(
     return deployed_contract
 
 
+@pytest.fixture(scope="session")
+def multicall3_contract(
+    web3: Web3,
+    oguogu_operator: Account,
+) -> Contract:
+    # 로컬 노드에는 Multicall3가 없으므로 aggregate3만 구현한 테스트용 컨트랙트를 배포합니다 (tests/contracts/Multicall3.vy)
+    with open(os.path.join(os.path.dirname(__file__), "contracts/Multicall3.json"), "r") as f:
+        abi = json.load(f)
+    contract = web3.eth.contract(abi=abi['abi'], bytecode=abi['bytecode']['object'])
+    tx_receipt = send_transaction(web3, oguogu_operator, contract.constructor())
+    return web3.eth.contract(abi=abi['abi'], address=tx_receipt.contractAddress)
+
+
 @pytest.fixture(scope="session")
 def local_settings(
     postgres_container: PostgresContainer, 
     anvil_container: DockerContainer,
     minio_container: MinioContainer,
     oguogu_operator_private_key: str,
-    oguogu_contract: Contract
+    oguogu_contract: Contract,
+    multicall3_contract: Contract,
 ):
     return Settings(
         DB_HOST=postgres_container.get_container_host_ip(),
@@ -183,6 +198,10 @@ def local_settings(
         S3_URL=f"http://{minio_container.get_container_host_ip()}:{minio_container.get_exposed_port(9000)}",
         S3_ACCESS_KEY=minio_container.access_key,
         S3_SECRET_KEY=minio_container.secret_key,
+        INDEXER_CONFIRMATIONS=0,
+        MULTICALL3_ADDRESS=multicall3_contract.address,
+        # 테스트용 Multicall3는 aggregate3 호출 하나에 128개까지 묶을 수 있습니다
+        MULTICALL_BATCH_SIZE=100,
     )
 
 
@@ -192,11 +211,13 @@ async def create_table_on_local_db(local_settings: Settings):
 
     async with session_manager.connect() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await SchemaMigrator(session_manager).migrate()
 
     yield session_manager
 
     async with session_manager.connect() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+        await conn.exec_driver_sql("DROP TABLE IF EXISTS schema_migrations")
 
 
     
@@ -247,6 +268,22 @@ def activity_registry_service(local_registry_container) -> ActivityRegistryServi
 def transaction_manager(local_registry_container):
     return local_registry_container.transaction()
 
+@pytest.fixture(scope='session')
+def chain_indexer(local_registry_container):
+    return local_registry_container.indexer()
+
+@pytest.fixture(scope='session')
+def challenge_completion_scheduler(local_registry_container):
+    return local_registry_container.completion()
+
+@pytest.fixture(scope='session')
+def chain_reconciler(local_registry_container):
+    return local_registry_container.reconciler()
+
+@pytest.fixture(scope='session')
+def chain_backfill(local_registry_container):
+    return local_registry_container.backfill()
+
 class AsyncMock(MagicMock):
     async def __call__(self, *args, **kwargs):
         return super(AsyncMock, self).__call__(*args, **kwargs)
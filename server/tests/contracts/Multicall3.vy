@@ -0,0 +1,24 @@
+# @version 0.3.10
+# 테스트용 Multicall3: aggregate3만 구현했고, 호출 / 응답 형식은 Multicall3와 같습니다.
+# Multicall3.json은 `vyper -f abi,bytecode Multicall3.vy`로 만듭니다.
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[1024]
+
+struct Result:
+    success: bool
+    returnData: Bytes[4096]
+
+@external
+@payable
+def aggregate3(calls: DynArray[Call3, 128]) -> DynArray[Result, 128]:
+    results: DynArray[Result, 128] = []
+    for c in calls:
+        success: bool = False
+        data: Bytes[4096] = b""
+        success, data = raw_call(c.target, c.callData, max_outsize=4096, revert_on_failure=False)
+        assert success or c.allowFailure, "Multicall3: call failed"
+        results.append(Result({success: success, returnData: data}))
+    return results
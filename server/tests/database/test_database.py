@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+from eth_account import Account
+import pytest
+import pytz
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from src.database.database import SessionManager
+from src.database.repository import ChallengeRepository
+from src.domains import Challenge, ChallengeActivity
+from src.exceptions import ClientException
+from src.settings import Settings
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pool_stats(local_settings: Settings):
+    settings = local_settings.model_copy(update={"DB_POOL_SIZE": 1, "DB_MAX_OVERFLOW": 0, "DB_POOL_TIMEOUT": 0.5})
+    session_manager = SessionManager(settings=settings)
+
+    async def hold_connection():
+        async with session_manager.session() as session:
+            await session.execute(text("SELECT pg_sleep(0.2)"))
+
+    # 1. 커넥션 하나를 두 요청이 나눠 쓰면, 두 번째 요청은 기다립니다
+    first = asyncio.create_task(hold_connection())
+    await asyncio.sleep(0.05)
+    assert session_manager.get_pool_stats()["waiting"] == 0
+    second = asyncio.create_task(hold_connection())
+    await asyncio.sleep(0.05)
+    assert session_manager.get_pool_stats()["waiting"] == 1
+    await asyncio.gather(first, second)
+
+    stats = session_manager.get_pool_stats()
+    assert stats["size"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["waiting"] == 0
+    assert stats["p99"] >= 0.1
+
+    # 2. 풀 대기 시간을 넘기면 timeout으로 기록합니다
+    async with session_manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        assert session_manager.get_pool_stats()["checked_out"] == 1
+        with pytest.raises(TimeoutError):
+            await asyncio.create_task(hold_connection())
+    assert session_manager.get_pool_stats()["timeouts"] == 1
+
+    await session_manager._engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unit_of_work(create_table_on_local_db: SessionManager, user0_account: Account):
+    session_manager = create_table_on_local_db
+    repository = ChallengeRepository(session_factory=session_manager.session)
+
+    def new_challenge(nonce: int) -> Challenge:
+        return Challenge.new(
+            nonce=nonce,
+            challenger_address=user0_account.address,
+            reward_amount=100,
+            title="unit of work",
+            type="photos",
+            start_date=datetime.now(pytz.utc),
+            end_date=datetime.now(pytz.utc) + timedelta(days=1),
+            minimum_activity_count=1,
+        )
+
+    # 1. 요청 하나의 저장소 호출은 커넥션 하나를 같이 쓰고, 끝날 때 커밋합니다
+    challenge = new_challenge(100)
+    activity = ChallengeActivity.new({"test": "unit of work"})
+    checkouts = session_manager.get_pool_stats()["checkouts"]
+    async with session_manager.unit_of_work():
+        # 커넥션은 처음 저장소를 사용할 때 가져옵니다
+        await asyncio.sleep(0)
+        assert session_manager.get_pool_stats()["checkouts"] == checkouts
+        assert await repository.get_challenge(challenge.hash) is None
+        await repository.create_challenge(challenge)
+        await repository.add_activity(challenge.hash, activity)
+        assert (await repository.get_challenge(challenge.hash)).activities == [activity]
+
+        # 커밋 전에는 다른 세션에서 보이지 않습니다
+        other = await asyncio.create_task(repository.get_challenge(challenge.hash))
+        assert other is None
+    assert session_manager.get_pool_stats()["checkouts"] - checkouts == 2
+    assert (await repository.get_challenge(challenge.hash)).activities == [activity]
+
+    # 2. 요청이 실패하면 저장소 메소드가 커밋한 것도 모두 롤백합니다
+    challenge = new_challenge(101)
+    with pytest.raises(ClientException):
+        async with session_manager.unit_of_work():
+            await repository.create_challenge(challenge)
+            await repository.add_activity(challenge.hash, activity)
+            await repository.add_activity(challenge.hash, activity)
+    assert await repository.get_challenge(challenge.hash) is None
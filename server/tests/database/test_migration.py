@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+import json
+from typing import Any, Dict, List
+from eth_account import Account
+import pytest
+import pytz
+from sqlalchemy import delete, event, insert
+from src.database.database import SessionManager
+from src.database.entity import ActivitySubmissionEntity, ChallengeActivityEntity, ChallengeEntity
+from src.database.migration import SchemaMigrator
+from src.database.repository import ChallengeRepository
+from src.domains import Challenge, ChallengeActivity, ChallengeCursor, ChallengeStatus, SubmissionStatus
+
+
+SEED_PREFIX = "0xseed"
+SEED_COUNT = 5000
+SEED_ID = 1_000_000
+# 인덱스로 찾은 행을 이보다 많이 버리면 쿼리 모양에 맞지 않는 인덱스를 쓴 것입니다
+MAX_ROWS_REMOVED = 50
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_migrate_once(create_table_on_local_db: SessionManager):
+    migrator = SchemaMigrator(create_table_on_local_db)
+    assert await migrator.migrate() == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_migrate_baseline_database(create_table_on_local_db: SessionManager):
+    # init.sql로 만든 기존 DB에는 outbox / 체크포인트 테이블이 없습니다
+    async with create_table_on_local_db.connect() as conn:
+        await conn.exec_driver_sql("DROP TABLE activity_submissions")
+        await conn.exec_driver_sql("DROP TABLE chain_checkpoints")
+        await conn.exec_driver_sql("DELETE FROM schema_migrations")
+
+    migrator = SchemaMigrator(create_table_on_local_db)
+    assert await migrator.migrate() == [version for version, _ in migrator.get_migrations()]
+
+    repository = ChallengeRepository(session_factory=create_table_on_local_db.session)
+    assert await repository.claim_submissions(10, timedelta(minutes=5)) == []
+    assert await repository.get_checkpoint("baseline") is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_repository_queries_use_indexes(create_table_on_local_db: SessionManager):
+    session_manager = create_table_on_local_db
+    repository = ChallengeRepository(session_factory=session_manager.session)
+
+    challenger = Account.create()
+    challenge = Challenge.new(
+        nonce=1,
+        challenger_address=challenger.address,
+        reward_amount=100,
+        title="explain",
+        type="photos",
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge.open(20000, challenger.address)
+    await repository.create_challenge(challenge)
+    activity = ChallengeActivity.new({"test": "explain"})
+    await repository.add_activity(challenge.hash, activity)
+
+    # 1. 플래너가 인덱스를 고를 만큼 데이터 채우기
+    await seed(session_manager)
+    try:
+        # 2. 저장소의 조회 쿼리를 모으기
+        statements = []
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(session_manager.engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await repository.get_challenge(challenge.hash)
+            await repository.get_challenge_by_id(challenge.id)
+            await repository.get_challeges_by_challenger(challenger.address, [ChallengeStatus.OPEN])
+            await repository.get_challenges_page(challenger.address, [ChallengeStatus.OPEN], None, 10)
+            await repository.get_challenges_page(
+                challenger.address, [ChallengeStatus.OPEN], ChallengeCursor(challenge.start_date, challenge.hash), 10
+            )
+            await repository.get_challenges_after(challenge.id - 1, 10)
+            await repository.get_completable_challenges(datetime.now(pytz.utc), challenge.id - 1, 10)
+            await repository.find_activity(challenge.hash, activity.activity_hash)
+            await repository.find_submission(challenge.hash, activity.activity_hash)
+            await repository.claim_submissions(0, timedelta(minutes=5))
+        finally:
+            event.remove(session_manager.engine.sync_engine, "before_cursor_execute", capture)
+        assert len(statements) >= 10
+
+        # 3. Seq Scan, 조건 없는 인덱스 전체 스캔, 많은 행을 Filter로 버리는 스캔이 없어야 합니다
+        async with session_manager.connect() as conn:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()[0]["Plan"]
+                assert not full_scans(plan), f"{statement}\n{json.dumps(plan, indent=2)}"
+    finally:
+        await unseed(session_manager)
+
+
+def full_scans(plan: Dict[str, Any]) -> List[str]:
+    scans = []
+    if plan["Node Type"] == "Seq Scan":
+        scans.append(plan["Relation Name"])
+    elif plan["Node Type"] in ("Index Scan", "Index Only Scan", "Bitmap Index Scan") and "Index Cond" not in plan:
+        scans.append(plan["Index Name"])
+    elif plan.get("Rows Removed by Filter", 0) > MAX_ROWS_REMOVED:
+        scans.append(plan.get("Index Name", plan.get("Relation Name")))
+    for child in plan.get("Plans", []):
+        scans.extend(full_scans(child))
+    return scans
+
+
+async def seed(session_manager: SessionManager):
+    now = datetime.now(pytz.utc)
+    # 대부분 완료된 챌린지이고, 일부만 진행 중인 챌린지
+    statuses = [ChallengeStatus.SUCCESS, ChallengeStatus.FAILED, ChallengeStatus.INIT]
+    def status(index: int) -> ChallengeStatus:
+        return ChallengeStatus.OPEN if index % 50 == 0 else statuses[index % len(statuses)]
+
+    challenges = [
+        {
+            "hash": f"{SEED_PREFIX}{index:060x}",
+            "id": None if status(index) == ChallengeStatus.INIT else SEED_ID + index,
+            "status": status(index).value,
+            "nonce": index,
+            "challenger_address": f"{SEED_PREFIX}{index % 500:036x}",
+            "reward_amount": 100,
+            "title": "seed",
+            "type": "photos",
+            "start_date": now - timedelta(hours=index),
+            "end_date": now - timedelta(hours=index) + timedelta(days=1),
+            "minimum_activity_count": 1,
+            "payment_reward": 0,
+        }
+        for index in range(SEED_COUNT)
+    ]
+    async with session_manager.connect() as conn:
+        await conn.execute(insert(ChallengeEntity), challenges)
+        await conn.execute(insert(ChallengeActivityEntity), [
+            {"challenge_hash": challenge["hash"], "activity_hash": f"0xactivity{index}"}
+            for index, challenge in enumerate(challenges)
+        ])
+        await conn.execute(insert(ActivitySubmissionEntity), [
+            {
+                "challenge_hash": challenge["hash"],
+                "activity_hash": f"0xactivity{index}",
+                "activity_signature": "0x",
+                "status": SubmissionStatus.SUCCESS.value,
+                "attempts": 1,
+                "next_attempt_at": now,
+            }
+            for index, challenge in enumerate(challenges)
+        ])
+    async with session_manager.connect() as conn:
+        for table in ("challenges", "challenge_activities", "activity_submissions"):
+            await conn.exec_driver_sql(f"ANALYZE {table}")
+
+
+async def unseed(session_manager: SessionManager):
+    async with session_manager.connect() as conn:
+        await conn.execute(delete(ActivitySubmissionEntity).where(ActivitySubmissionEntity.challenge_hash.startswith(SEED_PREFIX)))
+        await conn.execute(delete(ChallengeActivityEntity).where(ChallengeActivityEntity.challenge_hash.startswith(SEED_PREFIX)))
+        await conn.execute(delete(ChallengeEntity).where(ChallengeEntity.hash.startswith(SEED_PREFIX)))
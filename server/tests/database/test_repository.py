@@ -2,8 +2,10 @@ from datetime import datetime, timedelta
 from eth_account import Account
 import pytest
 import pytz
+from sqlalchemy import event
+from src.database.database import SessionManager
 from src.database.repository import ChallengeRepository
-from src.domains import Challenge, ChallengeActivity, ChallengeStatus
+from src.domains import ActivitySubmission, ActivitySubmittedEvent, ChainEventBatch, Challenge, ChallengeActivity, ChallengeStatus, SubmissionStatus
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -66,3 +68,147 @@ async def test_submit_proofs(challenge_repository: ChallengeRepository, user0_ac
     challenge = await challenge_repository.get_challenge(challenge.hash)
     assert challenge.status == ChallengeStatus.SUCCESS
     
+    
+    
+@pytest.mark.asyncio(loop_scope="session")
+async def test_activity_submission_outbox(challenge_repository: ChallengeRepository, user0_account: Account):
+    submission = ActivitySubmission.new("0xchallenge", "0xactivity", "0xsignature")
+    await challenge_repository.add_submission(submission)
+    
+    claimed = await challenge_repository.claim_submissions(10, timedelta(minutes=5))
+    assert [(s.activity_hash, s.status, s.attempts) for s in claimed] == [("0xactivity", SubmissionStatus.PROCESSING, 1)]
+    
+    # lease가 끝나기 전에는 다시 가져갈 수 없습니다
+    assert await challenge_repository.claim_submissions(10, timedelta(minutes=5)) == []
+    
+    submission = claimed[0]
+    submission.fail("error")
+    await challenge_repository.update_submission(submission)
+    
+    # 실패한 요청만 다시 접수할 수 있습니다
+    resubmitted = await challenge_repository.add_submission(ActivitySubmission.new("0xchallenge", "0xactivity", "0xsignature"))
+    assert resubmitted.status == SubmissionStatus.PENDING
+    assert resubmitted.attempts == 0
+    
+    claimed = await challenge_repository.claim_submissions(10, timedelta(minutes=5))
+    claimed[0].succeed()
+    await challenge_repository.update_submission(claimed[0])
+    
+    await challenge_repository.add_submission(ActivitySubmission.new("0xchallenge", "0xactivity", "0xsignature"))
+    result = await challenge_repository.get_submission("0xchallenge", "0xactivity")
+    assert result.status == SubmissionStatus.SUCCESS
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_challenge_in_one_query(
+    create_table_on_local_db: SessionManager,
+    challenge_repository: ChallengeRepository,
+    user0_account: Account,
+):
+    challenge = Challenge.new(
+        nonce=3,
+        challenger_address=user0_account.address,
+        reward_amount=100,
+        title="test",
+        type="photos",
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=2,
+    )
+    await challenge_repository.create_challenge(challenge)
+
+    activity0 = ChallengeActivity.new({"test": "one query 0"})
+    activity1 = ChallengeActivity.new({"test": "one query 1"})
+    await challenge_repository.add_activity(challenge.hash, activity0)
+    await challenge_repository.add_activity(challenge.hash, activity1)
+    activity1.complete("0x1234567890", datetime.now(pytz.utc))
+    await challenge_repository.complete_activity(challenge.hash, activity1)
+
+    # 챌린지와 증명 목록을 쿼리 한 번으로 가져옵니다
+    repository = ChallengeRepository(session_factory=create_table_on_local_db.session)
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(create_table_on_local_db.engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        result = await repository.get_challenge(challenge.hash)
+    finally:
+        event.remove(create_table_on_local_db.engine.sync_engine, "before_cursor_execute", capture)
+    assert len([statement for statement in statements if statement.lstrip().startswith("SELECT")]) == 1
+
+    activities = {activity.activity_hash: activity for activity in result.activities}
+    assert activities.keys() == {activity0.activity_hash, activity1.activity_hash}
+    assert not activities[activity0.activity_hash].is_completed()
+    assert activities[activity1.activity_hash] == activity1
+    
+    # 증명이 없는 챌린지
+    challenge = Challenge.new(
+        nonce=4,
+        challenger_address=user0_account.address,
+        reward_amount=100,
+        title="test",
+        type="photos",
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=2,
+    )
+    await challenge_repository.create_challenge(challenge)
+    assert (await repository.get_challenge(challenge.hash)).activities == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_completed_activity_count(challenge_repository: ChallengeRepository, user0_account: Account):
+    challenge = Challenge.new(
+        nonce=5,
+        challenger_address=user0_account.address,
+        reward_amount=100,
+        title="test",
+        type="photos",
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=3,
+    )
+    await challenge_repository.create_challenge(challenge)
+    challenge.open(5, user0_account.address)
+    await challenge_repository.open_challenge(challenge)
+
+    activity0 = ChallengeActivity.new({"test": "count 0"})
+    activity1 = ChallengeActivity.new({"test": "count 1"})
+    activity2 = ChallengeActivity.new({"test": "count 2"})
+    await challenge_repository.add_activity(challenge.hash, activity0)
+    await challenge_repository.add_activity(challenge.hash, activity1)
+    await challenge_repository.add_activity(challenge.hash, activity2)
+
+    # 1. 증명을 완료하면 완료된 증명 수가 올라갑니다. 같은 증명을 다시 완료해도 한 번만 셉니다
+    activity0.complete("0x01", datetime.now(pytz.utc))
+    await challenge_repository.complete_activity(challenge.hash, activity0)
+    await challenge_repository.complete_activity(challenge.hash, activity0)
+
+    result = await challenge_repository.get_challenge(challenge.hash, with_activities=False)
+    assert result.activities == []
+    assert result.completed_activity_count == 1
+    assert result.available_to_submit_activity()
+    assert not result.available_to_complete()
+
+    # 2. 인덱서가 같은 범위를 다시 반영해도 새로 완료된 증명만 셉니다
+    batch = ChainEventBatch(1, 1, [], [
+        ActivitySubmittedEvent(challenge.hash, activity0.activity_hash, "0x01", activity0.activity_date),
+        ActivitySubmittedEvent(challenge.hash, activity1.activity_hash, "0x02", datetime.now(pytz.utc)),
+    ], [])
+    await challenge_repository.apply_chain_events("test_completed_activity_count", batch)
+    await challenge_repository.apply_chain_events("test_completed_activity_count", batch)
+
+    result = await challenge_repository.get_challenge(challenge.hash, with_activities=False)
+    assert result.completed_activity_count == 2
+
+    # 3. 블록체인 기준으로 덮어쓴 증명은 다시 셉니다
+    await challenge_repository.repair_activities([
+        ActivitySubmittedEvent(challenge.hash, activity1.activity_hash, "0x02", datetime.now(pytz.utc)),
+        ActivitySubmittedEvent(challenge.hash, activity2.activity_hash, "0x03", datetime.now(pytz.utc)),
+    ])
+
+    result = await challenge_repository.get_challenge(challenge.hash, with_activities=False)
+    assert result.completed_activity_count == 3
+    assert not result.available_to_submit_activity()
+    assert result.available_to_complete()
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from eth_account import Account
+import pytest
+
+import pytz
+from sqlalchemy import delete
+from src.database.entity import ChallengeActivityEntity, ChallengeEntity
+from src.domains import ActivitySubmittedEvent, ChainEventBatch, Challenge, ChallengeActivity, ChallengeStatus, ChallengeType
+from src.registry.activity import ActivityRegistryService
+from src.registry.backfill import ChainBackfill
+from src.registry.challenge import ChallengeRegistryService
+from src.registry.reward import ChallengeRewardService
+from src.registry.transaction import TransactionManager
+from web3 import Web3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_backfill_challenges(
+    chain_backfill: ChainBackfill,
+    challenge_reward_service: ChallengeRewardService,
+    challenge_registry_service: ChallengeRegistryService,
+    mock_activity_registry_service: ActivityRegistryService,
+    transaction_manager: TransactionManager,
+    user0_account: Account,
+    given_user_usdt,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    func = transaction_manager.oguogu_contract().functions.depositReward(user0_account.address, Web3.to_wei(1, 'ether'))
+    await transaction_manager.asend_transaction(func, user0_account)
+
+    # 1. 증명을 제출하고 완료한 챌린지 만들기
+    given_challenge = Challenge.new(
+        nonce=8,
+        challenger_address=user0_account.address,
+        reward_amount=Web3.to_wei(1, 'ether'),
+        title="Backfill Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc).replace(microsecond=0),
+        end_date=datetime.now(pytz.utc).replace(microsecond=0) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge_signature = await challenge_registry_service.sign_new_challenge(given_challenge)
+    func = transaction_manager.oguogu_contract().functions.createChallenge(
+            title=given_challenge.title,
+            reward=given_challenge.reward_amount,
+            challengeType=given_challenge.type.value,
+            challengeSignature=challenge_signature.signature,
+            startDate=int(given_challenge.start_date.timestamp()),
+            endDate=int(given_challenge.end_date.timestamp()),
+            nonce=given_challenge.nonce,
+            minimumActivityCount=given_challenge.minimum_activity_count,
+    )
+    txreceipt = await transaction_manager.asend_transaction(func, user0_account)
+    await challenge_registry_service.register_challenge(txreceipt.transactionHash.hex())
+    challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+
+    activity_content = {
+        "content_type": "image/jpeg",
+        "image": "test8",
+        'image_bytes': b'test8'
+    }
+    activity = ChallengeActivity.new(activity_content)
+    activity_signature = transaction_manager.create_signature(activity.activity_hash, user0_account).to_0x_hex()
+    await mock_activity_registry_service.register_activity(challenge=challenge, content=activity_content)
+    await mock_activity_registry_service.submit_activity(
+        challenge=challenge,
+        activity_hash=activity.activity_hash,
+        activity_signature=activity_signature
+    )
+    completed = await challenge_reward_service.complete_challenge(challenge.hash)
+
+    # 2. DB에서 챌린지가 사라진 경우
+    repository = chain_backfill.repository
+    async with repository.session_factory() as session:
+        await session.execute(delete(ChallengeActivityEntity).where(ChallengeActivityEntity.challenge_hash == challenge.hash))
+        await session.execute(delete(ChallengeEntity).where(ChallengeEntity.hash == challenge.hash))
+        await session.commit()
+    assert await repository.get_challenge(challenge.hash) is None
+
+    # 3. 블록체인 로그로 복원합니다 (트랜잭션 조회는 batch_size개씩 나눠서 보냅니다)
+    monkeypatch.setattr(chain_backfill, "batch_size", 1)
+    to_block = await transaction_manager.aweb3.eth.block_number
+    report = await chain_backfill.run(to_block)
+    assert report.blocks == to_block - report.from_block + 1
+    assert report.challenges >= 1
+    assert await repository.get_checkpoint(ChainBackfill.CHECKPOINT_NAME) == to_block
+
+    output_challenge = await repository.get_challenge(challenge.hash)
+    assert output_challenge.id == challenge.id
+    assert output_challenge.title == given_challenge.title
+    assert output_challenge.start_date == given_challenge.start_date
+    assert output_challenge.status == ChallengeStatus.SUCCESS
+    assert output_challenge.payment_transaction == completed.payment_transaction
+    assert output_challenge.payment_reward == completed.payment_reward
+    assert [activity.activity_hash for activity in output_challenge.activities] == [activity.activity_hash]
+    assert output_challenge.activities[0].is_completed()
+
+    # 4. 체크포인트 이후부터 이어서 실행합니다
+    report = await chain_backfill.run(to_block)
+    assert report.blocks == 0
+
+    # 5. 이전 실행에서 건너뛴 챌린지의 증명은 DB에 넣지 않고 넘어갑니다
+    skipped = ActivitySubmittedEvent("0xskipped", activity.activity_hash, completed.payment_transaction, datetime.now(pytz.utc))
+    batch = ChainEventBatch(to_block + 1, to_block + 1, [], [skipped], [])
+    await repository.backfill_chain_events(ChainBackfill.CHECKPOINT_NAME, [], batch)
+    assert await repository.get_checkpoint(ChainBackfill.CHECKPOINT_NAME) == to_block + 1
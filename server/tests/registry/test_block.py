@@ -0,0 +1,42 @@
+from src.registry.block import BlockTimestampCache
+
+
+def block(number: int, hash: str, parent_hash: str, timestamp: int):
+    return {
+        'number': number,
+        'hash': bytes.fromhex(hash * 32),
+        'parentHash': bytes.fromhex(parent_hash * 32),
+        'timestamp': timestamp,
+    }
+
+
+def test_block_timestamp_cache_eviction():
+    cache = BlockTimestampCache(maxsize=2, confirmation_depth=1)
+    cache.put(1, b"\x01" * 32, 100)
+    cache.put(2, b"\x02" * 32, 200)
+    cache.get(1)
+    cache.put(3, b"\x03" * 32, 300)
+
+    assert cache.get(1) == 100
+    assert cache.get(2) is None
+    assert cache.get(3, b"\x03" * 32) == 300
+    assert cache.get(3, b"\x04" * 32) is None
+    
+
+def test_block_timestamp_cache_reorg():
+    cache = BlockTimestampCache(maxsize=10, confirmation_depth=1)
+    cache.observe_head(block(1, "01", "00", 100))
+    cache.observe_head(block(2, "02", "01", 200))
+    cache.observe_head(block(3, "03", "02", 300))
+    assert len(cache) == 3
+
+    # 3번 블록이 다른 블록으로 바뀌면 확정되지 않은 블록(1번 초과)은 제거됩니다
+    cache.observe_head(block(3, "13", "12", 310))
+    assert cache.get(1) == 100
+    assert cache.get(2) is None
+    assert cache.get(3) == 310
+
+    # 부모 해시가 이어지지 않는 경우도 reorg로 봅니다
+    cache.observe_head(block(4, "14", "23", 400))
+    assert cache.get(3) is None
+    assert cache.get(4) == 400
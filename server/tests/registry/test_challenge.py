@@ -59,3 +59,49 @@ async def test_open_challenge_scenario(
     # 6. 챌린지를 조회하기
     output_challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
     assert output_challenge.status == ChallengeStatus.OPEN
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_active_challenges_by_page(
+    challenge_registry_service: ChallengeRegistryService,
+):
+    challenger = Account.create()
+    start_date = datetime.now(pytz.utc).replace(microsecond=0)
+
+    # 1. 시작일이 같은 챌린지를 섞어서 만들기
+    challenges = []
+    for nonce in range(5):
+        challenge = Challenge.new(
+            nonce=nonce,
+            challenger_address=challenger.address,
+            reward_amount=Web3.to_wei(1, 'ether'),
+            title=f"Page Challenge {nonce}",
+            type=ChallengeType.photos,
+            start_date=start_date - timedelta(days=nonce // 2),
+            end_date=start_date + timedelta(days=1),
+            minimum_activity_count=1,
+        )
+        if nonce != 4:
+            challenge.open(10000 + nonce, challenger.address)
+        await challenge_registry_service.repository.create_challenge(challenge)
+        challenges.append(challenge)
+
+    # INIT 챌린지는 제외하고 시작일 최신순
+    expected = sorted(
+        [challenge for challenge in challenges if challenge.status == ChallengeStatus.OPEN],
+        key=lambda challenge: (challenge.start_date, challenge.hash),
+        reverse=True,
+    )
+
+    # 2. 커서로 다음 페이지 가져오기
+    first_page = await challenge_registry_service.get_active_challenges(challenger.address, limit=3)
+    assert [challenge.hash for challenge in first_page.challenges] == [challenge.hash for challenge in expected[:3]]
+    assert first_page.next_cursor is not None
+
+    second_page = await challenge_registry_service.get_active_challenges(challenger.address, cursor=first_page.next_cursor, limit=3)
+    assert [challenge.hash for challenge in second_page.challenges] == [challenge.hash for challenge in expected[3:]]
+    assert second_page.next_cursor is None
+
+    # 3. 상태로 거르기
+    page = await challenge_registry_service.get_active_challenges(challenger.address, statuses=[ChallengeStatus.SUCCESS])
+    assert page.challenges == []
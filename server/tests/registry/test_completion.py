@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from eth_account import Account
+import pytest
+
+import pytz
+from src.domains import Challenge, ChallengeActivity, ChallengeStatus, ChallengeType
+from src.registry.activity import ActivityRegistryService
+from src.registry.challenge import ChallengeRegistryService
+from src.registry.completion import COMPLETION_LOCK_ID, ChallengeCompletionScheduler
+from src.registry.transaction import TransactionManager
+from web3 import Web3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_complete_challenges_on_schedule(
+    challenge_completion_scheduler: ChallengeCompletionScheduler,
+    challenge_registry_service: ChallengeRegistryService,
+    mock_activity_registry_service: ActivityRegistryService,
+    transaction_manager: TransactionManager,
+    user0_account: Account,
+    given_user_usdt,
+):
+    func = transaction_manager.oguogu_contract().functions.depositReward(user0_account.address, Web3.to_wei(1, 'ether'))
+    await transaction_manager.asend_transaction(func, user0_account)
+
+    # 1. 최소 증명 횟수를 채운 챌린지 만들기
+    given_challenge = Challenge.new(
+        nonce=6,
+        challenger_address=user0_account.address,
+        reward_amount=Web3.to_wei(1, 'ether'),
+        title="Test Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge_signature = await challenge_registry_service.sign_new_challenge(given_challenge)
+    func = transaction_manager.oguogu_contract().functions.createChallenge(
+            title=given_challenge.title,
+            reward=given_challenge.reward_amount,
+            challengeType=given_challenge.type.value,
+            challengeSignature=challenge_signature.signature,
+            startDate=int(given_challenge.start_date.timestamp()),
+            endDate=int(given_challenge.end_date.timestamp()),
+            nonce=given_challenge.nonce,
+            minimumActivityCount=given_challenge.minimum_activity_count,
+    )
+    txreceipt = await transaction_manager.asend_transaction(func, user0_account)
+    await challenge_registry_service.register_challenge(txreceipt.transactionHash.hex())
+    challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+
+    activity_content = {
+        "content_type": "image/jpeg",
+        "image": "test6",
+        'image_bytes': b'test6'
+    }
+    activity = ChallengeActivity.new(activity_content)
+    activity_signature = transaction_manager.create_signature(activity.activity_hash, user0_account).to_0x_hex()
+    await mock_activity_registry_service.register_activity(challenge=challenge, content=activity_content)
+    await mock_activity_registry_service.submit_activity(
+        challenge=challenge,
+        activity_hash=activity.activity_hash,
+        activity_signature=activity_signature
+    )
+
+    # 2. 스케줄러가 완료 처리
+    assert await challenge_completion_scheduler.complete_once() >= 1
+
+    output_challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+    assert output_challenge.status == ChallengeStatus.SUCCESS
+    assert output_challenge.payment_transaction is not None
+
+    # 3. 완료된 챌린지는 다시 가져오지 않습니다
+    completable = await challenge_completion_scheduler.repository.get_completable_challenges(datetime.now(pytz.utc))
+    assert given_challenge.hash not in [challenge.hash for challenge in completable]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_complete_on_one_worker(
+    challenge_completion_scheduler: ChallengeCompletionScheduler,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls = []
+    async def complete_once():
+        calls.append(1)
+        return 1
+    monkeypatch.setattr(challenge_completion_scheduler, "complete_once", complete_once)
+    
+    # 다른 워커가 lock을 잡고 있으면 완료하지 않습니다
+    session_manager = challenge_completion_scheduler.session_manager
+    async with session_manager.try_advisory_lock(COMPLETION_LOCK_ID) as acquired:
+        assert acquired
+        assert await challenge_completion_scheduler.run_once() == 0
+        assert calls == []
+    
+    assert await challenge_completion_scheduler.run_once() == 1
+    assert calls == [1]
@@ -0,0 +1,47 @@
+from eth_abi import encode
+from eth_account import Account
+from web3 import Web3
+
+from src.abis.constants import OGUOGU_EVENT_ABI
+from src.registry.events import EventDecoder
+
+
+OGUOGU_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+USDT_ADDRESS = "0xe7f1725E7734CE288F8367e1Bb143E90bb3F0512"
+
+
+def test_decode_receipt(user0_account: Account):
+    decoder = EventDecoder(Web3().codec, OGUOGU_ADDRESS, OGUOGU_EVENT_ABI)
+    challenge_hash = Web3.keccak(text="challenge")
+    challenger_topic = encode(["address"], [user0_account.address])
+    
+    logs = [
+        {
+            # USDT Transfer: 다른 컨트랙트 로그는 건너뜁니다
+            "address": USDT_ADDRESS,
+            "topics": [Web3.keccak(text="Transfer(address,address,uint256)"), challenger_topic, challenger_topic],
+            "data": encode(["uint256"], [100]),
+            "logIndex": 0, "transactionIndex": 0, "transactionHash": b"\x01" * 32, "blockHash": b"\x02" * 32, "blockNumber": 1,
+        },
+        {
+            "address": OGUOGU_ADDRESS,
+            "topics": [Web3.keccak(text="ChallengeCreated(uint256,address,bytes32)"), encode(["uint256"], [7]), challenger_topic],
+            "data": encode(["bytes32"], [challenge_hash]),
+            "logIndex": 1, "transactionIndex": 0, "transactionHash": b"\x01" * 32, "blockHash": b"\x02" * 32, "blockNumber": 1,
+        },
+        {
+            # ABI에 없는 이벤트
+            "address": OGUOGU_ADDRESS,
+            "topics": [Web3.keccak(text="Unknown()")],
+            "data": b"",
+            "logIndex": 2, "transactionIndex": 0, "transactionHash": b"\x01" * 32, "blockHash": b"\x02" * 32, "blockNumber": 1,
+        },
+    ]
+    
+    events = decoder.decode_receipt({"logs": logs})
+    assert [event["event"] for event in events] == ["ChallengeCreated"]
+    assert events[0]["args"]["tokenId"] == 7
+    assert events[0]["args"]["challenger"] == user0_account.address
+    assert events[0]["args"]["challengeHash"] == challenge_hash
+    
+    assert decoder.decode_receipt({"logs": logs}, "ChallengeCompleted") == []
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from eth_account import Account
+import pytest
+import pytz
+from src.domains import Challenge, ChallengeStatus, ChallengeType
+from src.registry.challenge import ChallengeRegistryService
+from src.registry.indexer import INDEXER_LOCK_ID, ChainIndexer
+from src.utils import send_transaction
+from web3 import Web3
+from web3.contract import Contract
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_index_challenge_created(
+    challenge_registry_service: ChallengeRegistryService,
+    chain_indexer: ChainIndexer,
+    web3: Web3,
+    user0_account: Account,
+    oguogu_contract: Contract,
+    given_user_usdt,
+):
+    send_transaction(web3, user0_account, oguogu_contract.functions.depositReward(user0_account.address, Web3.to_wei(10, 'ether')))
+    
+    given_challenge = Challenge.new(
+        nonce=10,
+        challenger_address=user0_account.address,
+        reward_amount=Web3.to_wei(1, 'ether'),
+        title="Indexed Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge_signature = await challenge_registry_service.sign_new_challenge(given_challenge)
+    
+    # 서버에 등록(register_challenge)하지 않고 블록체인에만 생성합니다
+    send_transaction(
+        web3, 
+        user0_account, 
+        oguogu_contract.functions.createChallenge(
+            title=given_challenge.title,
+            reward=given_challenge.reward_amount,
+            challengeType=given_challenge.type.value,
+            challengeSignature=challenge_signature.signature,
+            startDate=int(given_challenge.start_date.timestamp()),
+            endDate=int(given_challenge.end_date.timestamp()),
+            nonce=given_challenge.nonce,
+            minimumActivityCount=given_challenge.minimum_activity_count,
+        )
+    )
+    
+    while await chain_indexer.index_once() > 0:
+        pass
+    
+    output_challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+    assert output_challenge.status == ChallengeStatus.OPEN
+    assert output_challenge.challenger_address == user0_account.address
+    assert output_challenge.id is not None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_index_on_one_worker(chain_indexer: ChainIndexer):
+    while await chain_indexer.index_once() > 0:
+        pass
+    
+    # 다른 워커가 lock을 잡고 있으면 인덱싱하지 않고, 다음에는 체크포인트부터 이어서 인덱싱합니다
+    async with chain_indexer.session_manager.try_advisory_lock(INDEXER_LOCK_ID) as acquired:
+        assert acquired
+        assert await chain_indexer.run_once() == 0
+        assert chain_indexer._last_block is None
+    
+    await chain_indexer.run_once()
+    checkpoint = await chain_indexer.repository.get_checkpoint(ChainIndexer.CHECKPOINT_NAME)
+    assert chain_indexer._last_block == checkpoint
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from eth_account import Account
+import pytest
+
+import pytz
+from src.domains import ActivitySubmittedEvent, Challenge, ChallengeActivity, ChallengeStatus, ChallengeType
+from src.registry.activity import ActivityRegistryService
+from src.registry.challenge import ChallengeRegistryService
+from src.registry.reconcile import ChainReconciler, PendingLookups, ReconcileReport
+from src.registry.reward import ChallengeRewardService
+from src.registry.transaction import TransactionManager
+from web3 import Web3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reconcile_challenges(
+    chain_reconciler: ChainReconciler,
+    challenge_reward_service: ChallengeRewardService,
+    challenge_registry_service: ChallengeRegistryService,
+    mock_activity_registry_service: ActivityRegistryService,
+    transaction_manager: TransactionManager,
+    user0_account: Account,
+    given_user_usdt,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    func = transaction_manager.oguogu_contract().functions.depositReward(user0_account.address, Web3.to_wei(1, 'ether'))
+    await transaction_manager.asend_transaction(func, user0_account)
+
+    # 1. 증명을 제출하고 완료한 챌린지 만들기
+    given_challenge = Challenge.new(
+        nonce=7,
+        challenger_address=user0_account.address,
+        reward_amount=Web3.to_wei(1, 'ether'),
+        title="Test Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge_signature = await challenge_registry_service.sign_new_challenge(given_challenge)
+    func = transaction_manager.oguogu_contract().functions.createChallenge(
+            title=given_challenge.title,
+            reward=given_challenge.reward_amount,
+            challengeType=given_challenge.type.value,
+            challengeSignature=challenge_signature.signature,
+            startDate=int(given_challenge.start_date.timestamp()),
+            endDate=int(given_challenge.end_date.timestamp()),
+            nonce=given_challenge.nonce,
+            minimumActivityCount=given_challenge.minimum_activity_count,
+    )
+    txreceipt = await transaction_manager.asend_transaction(func, user0_account)
+    await challenge_registry_service.register_challenge(txreceipt.transactionHash.hex())
+    challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+
+    activity_content = {
+        "content_type": "image/jpeg",
+        "image": "test7",
+        'image_bytes': b'test7'
+    }
+    activity = ChallengeActivity.new(activity_content)
+    activity_signature = transaction_manager.create_signature(activity.activity_hash, user0_account).to_0x_hex()
+    await mock_activity_registry_service.register_activity(challenge=challenge, content=activity_content)
+    await mock_activity_registry_service.submit_activity(
+        challenge=challenge,
+        activity_hash=activity.activity_hash,
+        activity_signature=activity_signature
+    )
+    completed = await challenge_reward_service.complete_challenge(challenge.hash)
+
+    # 2. 블록체인과 DB가 같으면 차이가 없습니다
+    repository = chain_reconciler.repository
+    report = ReconcileReport()
+    await chain_reconciler.reconcile([await repository.get_challenge(challenge.hash)], report)
+    assert report.checked == 1
+    assert report.diffs == []
+
+    # 3. DB의 완료 결과와 증명 제출 결과가 누락된 경우
+    challenge = await repository.get_challenge(challenge.hash)
+    challenge.status = ChallengeStatus.OPEN
+    challenge.payment_transaction = None
+    challenge.payment_reward = 0
+    challenge.complete_date = None
+    await repository.repair_challenges([challenge])
+    await repository.repair_activities([ActivitySubmittedEvent(
+        challenge_hash=challenge.hash,
+        activity_hash=activity.activity_hash,
+        activity_transaction=None,
+        activity_date=None,
+    )])
+
+    # 로그는 블록 범위를 나눠서 찾습니다
+    monkeypatch.setattr(chain_reconciler, "block_range", 4)
+    report = ReconcileReport()
+    await chain_reconciler.reconcile([await repository.get_challenge(challenge.hash)], report, repair=True)
+    assert {diff.field for diff in report.diffs} == {"status", "payment_reward", "payment_transaction", "activities"}
+    assert report.repaired_challenges == 1
+    assert report.repaired_activities == 1
+
+    # 4. 블록체인 기준으로 복구됩니다
+    output_challenge = await repository.get_challenge(challenge.hash)
+    assert output_challenge.status == completed.status
+    assert output_challenge.payment_reward == completed.payment_reward
+    assert output_challenge.payment_transaction == completed.payment_transaction
+    assert all(activity.is_completed() for activity in output_challenge.activities)
+
+    report = ReconcileReport()
+    await chain_reconciler.reconcile([output_challenge], report)
+    assert report.diffs == []
+
+    # 5. 지급 결과가 저장되어 있어도 완료 상태가 블록체인과 다르면 찾아서 복구합니다
+    output_challenge.status = ChallengeStatus.FAILED
+    await repository.repair_challenges([output_challenge])
+    report = ReconcileReport()
+    await chain_reconciler.reconcile([await repository.get_challenge(challenge.hash)], report, repair=True)
+    assert [(diff.field, diff.database, diff.chain) for diff in report.diffs] == [
+        ("status", ChallengeStatus.FAILED.value, completed.status.value),
+    ]
+    assert (await repository.get_challenge(challenge.hash)).status == completed.status
+
+    # 6. 블록체인의 챌린지 해시와 다르면 보고합니다
+    other = await repository.get_challenge(challenge.hash)
+    other.hash = "0x" + "00" * 32
+    report = ReconcileReport()
+    await chain_reconciler.compare([other], report, PendingLookups())
+    assert [(diff.field, diff.chain) for diff in report.diffs] == [("hash", challenge.hash)]
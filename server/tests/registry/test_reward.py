@@ -4,8 +4,10 @@ import pytest
 
 import pytz
 from src.domains import Challenge, ChallengeActivity, ChallengeStatus, ChallengeType
+from src.exceptions import ClientException
 from src.registry.challenge import ChallengeRegistryService
 from src.registry.activity import ActivityRegistryService
+from src.registry.multicall import Multicall
 from src.registry.reward import ChallengeRewardService
 from src.registry.transaction import TransactionManager
 from web3 import Web3
@@ -93,3 +95,107 @@ async def test_submit_activity(
     # 13. 실제로 지급되었는지 확인
     balance = test_usdt_contract.functions.balanceOf(user0_account.address).call() - before_balance
     assert balance <= Web3.to_wei(1, 'ether') and balance > 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_check_completable(
+    challenge_reward_service: ChallengeRewardService,
+    challenge_registry_service: ChallengeRegistryService,
+    mock_activity_registry_service: ActivityRegistryService,
+    transaction_manager: TransactionManager,
+    user0_account: Account,
+    given_user_usdt,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    func = transaction_manager.oguogu_contract().functions.depositReward(user0_account.address, Web3.to_wei(1, 'ether'))
+    await transaction_manager.asend_transaction(func, user0_account)
+    
+    # 아직 증명을 제출하지 않은 챌린지
+    given_challenge = Challenge.new(
+        nonce=4,
+        challenger_address=user0_account.address,
+        reward_amount=Web3.to_wei(1, 'ether'),
+        title="Test Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc) + timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge_signature = await challenge_registry_service.sign_new_challenge(given_challenge)
+    func = transaction_manager.oguogu_contract().functions.createChallenge(
+            title=given_challenge.title,
+            reward=given_challenge.reward_amount,
+            challengeType=given_challenge.type.value,
+            challengeSignature=challenge_signature.signature,
+            startDate=int(given_challenge.start_date.timestamp()),
+            endDate=int(given_challenge.end_date.timestamp()),
+            nonce=given_challenge.nonce,
+            minimumActivityCount=given_challenge.minimum_activity_count,
+    )
+    txreceipt = await transaction_manager.asend_transaction(func, user0_account)
+    await challenge_registry_service.register_challenge(txreceipt.transactionHash.hex())
+    challenge = await challenge_registry_service.get_challenge(given_challenge.hash)
+    
+    # 컨트랙트에서 OPEN인 챌린지와 존재하지 않는 챌린지는 완료할 수 없습니다
+    unknown = Challenge.new(
+        nonce=5,
+        challenger_address=user0_account.address,
+        reward_amount=1,
+        title="Unknown Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc),
+        end_date=datetime.now(pytz.utc),
+        minimum_activity_count=1,
+    )
+    unknown.id = 2**64
+    assert await transaction_manager.multicall.is_deployed()
+    assert await challenge_reward_service.check_completable([challenge, unknown]) == [False, False]
+    
+    # 최소 증명 횟수를 채운 챌린지는 완료할 수 있습니다
+    activity_content = {
+        "content_type": "image/jpeg",
+        "image": "test4",
+        'image_bytes': b'test4'
+    }
+    activity = ChallengeActivity.new(activity_content)
+    activity_signature = transaction_manager.create_signature(activity.activity_hash, user0_account).to_0x_hex()
+    await mock_activity_registry_service.register_activity(challenge=challenge, content=activity_content)
+    await mock_activity_registry_service.submit_activity(
+        challenge=challenge,
+        activity_hash=activity.activity_hash,
+        activity_signature=activity_signature
+    )
+    assert await challenge_reward_service.check_completable([challenge, unknown]) == [True, False]
+    
+    # Multicall3가 배포되지 않은 체인에서는 eth_call 배치 요청으로 같은 결과를 얻습니다
+    monkeypatch.setattr(transaction_manager, "multicall", Multicall(transaction_manager.aweb3, Account.create().address, 100))
+    assert not await transaction_manager.multicall.is_deployed()
+    assert await challenge_reward_service.check_completable([challenge, unknown]) == [True, False]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_complete_challenge_not_completable_on_chain(
+    challenge_reward_service: ChallengeRewardService,
+    user0_account: Account,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # DB에서는 종료일이 지났지만 블록체인에는 없는 챌린지
+    challenge = Challenge.new(
+        nonce=8,
+        challenger_address=user0_account.address,
+        reward_amount=1,
+        title="Unknown Challenge",
+        type=ChallengeType.photos,
+        start_date=datetime.now(pytz.utc) - timedelta(days=2),
+        end_date=datetime.now(pytz.utc) - timedelta(days=1),
+        minimum_activity_count=1,
+    )
+    challenge.id = 2**64
+    challenge.status = ChallengeStatus.OPEN
+    async def get_challenge(challenge_hash: str) -> Challenge:
+        return challenge
+    monkeypatch.setattr(challenge_reward_service.repository, "get_challenge", get_challenge)
+    
+    # 클라이언트 요청으로 완료할 수 없는 챌린지는 ClientException으로 응답합니다
+    with pytest.raises(ClientException):
+        await challenge_reward_service.complete_challenge(challenge.hash)
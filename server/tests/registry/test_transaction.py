@@ -0,0 +1,147 @@
+import asyncio
+from eth_account import Account
+import pytest
+from src.registry.fee import FeeOracle
+from src.registry.lanes import OperatorLanes
+from src.registry.transaction import TransactionManager
+from src.settings import Settings
+from web3.contract import Contract
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_operator_transactions(
+    transaction_manager: TransactionManager,
+    test_usdt_contract: Contract,
+    oguogu_operator: Account,
+):
+    receipts = await asyncio.gather(*[
+        transaction_manager.asend_transaction(
+            test_usdt_contract.functions.mint(oguogu_operator.address, 1)
+        )
+        for _ in range(5)
+    ])
+    
+    assert all(receipt.status == 1 for receipt in receipts)
+    assert len({receipt.transactionHash for receipt in receipts}) == 5
+    
+    
+@pytest.mark.asyncio(loop_scope="session")
+async def test_operator_lanes(
+    local_settings: Settings,
+    test_usdt_contract: Contract,
+    oguogu_operator: Account,
+    user1_account: Account,
+):
+    # 세션의 TransactionManager와 nonce가 겹치지 않도록 다른 계정들로 lane을 구성합니다
+    owner_account = Account.from_key('0x7c852118294e51e653712a81e05800f419141751be58f605c371e15141b007a6')
+    transaction_manager = TransactionManager(
+        local_settings.model_copy(update={
+            "OPERATOR_PRIVATE_KEY": owner_account.key.to_0x_hex(),
+            "OPERATOR_PRIVATE_KEYS": [user1_account.key.to_0x_hex()],
+        })
+    )
+    
+    receipts = await asyncio.gather(*[
+        transaction_manager.asend_transaction_on_lane(
+            test_usdt_contract.functions.mint(oguogu_operator.address, 1)
+        )
+        for _ in range(6)
+    ])
+    
+    # 진행 중인 트랜잭션이 적은 계정으로 번갈아 배정됩니다
+    assert all(receipt.status == 1 for receipt in receipts)
+    senders = [receipt['from'] for receipt in receipts]
+    assert senders.count(owner_account.address) == 3
+    assert senders.count(user1_account.address) == 3
+
+
+def test_stalled_lane_is_skipped(oguogu_operator: Account, user0_account: Account):
+    lanes = OperatorLanes([oguogu_operator, user0_account], stall_timeout=-1)
+    
+    with lanes.track(oguogu_operator):
+        assert lanes.select() == user0_account
+        with lanes.track(user0_account, 2):
+            # 모든 lane이 멈췄으면 진행 중인 트랜잭션이 적은 lane을 고릅니다
+            assert lanes.select() == oguogu_operator
+
+
+def test_assign_skips_stalled_lane(oguogu_operator: Account, user0_account: Account, user1_account: Account):
+    lanes = OperatorLanes([oguogu_operator, user0_account, user1_account], stall_timeout=-1)
+    
+    # 멈추지 않은 lane끼리는 배정한 개수가 고르게 나뉩니다
+    accounts = lanes.assign(6)
+    assert [accounts.count(account) for account in lanes.accounts] == [2, 2, 2]
+    
+    with lanes.track(oguogu_operator):
+        accounts = lanes.assign(4)
+        assert oguogu_operator not in accounts
+        assert accounts.count(user0_account) == accounts.count(user1_account) == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_build_transaction_with_fee_oracle(
+    transaction_manager: TransactionManager,
+    test_usdt_contract: Contract,
+    oguogu_operator: Account,
+):
+    receipt = await transaction_manager.asend_transaction(
+        test_usdt_contract.functions.mint(oguogu_operator.address, 1)
+    )
+    
+    # 같은 함수는 캐시된 chain id / 수수료 / gas로 생성합니다
+    transaction = await transaction_manager.abuild_transaction(
+        test_usdt_contract.functions.mint(oguogu_operator.address, 2),
+        {'from': oguogu_operator.address}
+    )
+    max_fee, priority_fee = await transaction_manager.fee_oracle.fees()
+    assert transaction['chainId'] == transaction_manager.web3.eth.chain_id
+    assert transaction['maxFeePerGas'] == max_fee
+    assert transaction['maxPriorityFeePerGas'] == priority_fee
+    assert transaction['gas'] >= receipt.gasUsed
+    
+    # gas는 상태에 따라 달라지므로 캐시한 값보다 더 필요하면 새로 추정한 값을 씁니다 (잔고가 없는 주소로 mint하면 gas가 더 필요합니다)
+    oracle = transaction_manager.fee_oracle
+    oracle = FeeOracle(oracle.aweb3, oracle.block_cache, oracle.max_age, oracle.history_blocks,
+                       oracle.priority_percentile, oracle.base_fee_multiplier, oracle.gas_margin)
+    contract = transaction_manager.aweb3.eth.contract(address=test_usdt_contract.address, abi=test_usdt_contract.abi)
+    cheap = contract.functions.mint(oguogu_operator.address, 1)
+    oracle.observe_receipt(cheap, transaction, await transaction_manager.asend_transaction(cheap))
+    cached = oracle._gas[oracle._gas_key(cheap)]
+    estimated = await oracle.estimate_gas(contract.functions.mint(Account.create().address, 1), {'from': oguogu_operator.address})
+    assert estimated > cached
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_replace_stuck_transaction(
+    transaction_manager: TransactionManager,
+    test_usdt_contract: Contract,
+    user0_account: Account,
+):
+    aweb3 = transaction_manager.aweb3
+    transaction = await transaction_manager.abuild_transaction(
+        test_usdt_contract.functions.mint(user0_account.address, 1),
+        {'from': user0_account.address}
+    )
+    # base fee보다 낮은 수수료로 보내서 블록에 포함되지 않도록 합니다
+    transaction = {
+        **transaction,
+        'nonce': await aweb3.eth.get_transaction_count(user0_account.address),
+        'maxFeePerGas': 1,
+        'maxPriorityFeePerGas': 1,
+    }
+    signed_txn = user0_account.sign_transaction(transaction)
+    tx_hash = (await aweb3.eth.send_raw_transaction(signed_txn.raw_transaction)).to_0x_hex()
+    
+    replacer = transaction_manager.replacer
+    replaced = replacer.replaced
+    waiting = asyncio.create_task(replacer.wait(user0_account, transaction, tx_hash, timeout=30))
+    while not waiting.done():
+        await aweb3.provider.make_request("evm_mine", [])
+        await asyncio.sleep(transaction_manager.receipt_watcher.poll_interval)
+    receipt = await waiting
+    
+    # 같은 nonce로 수수료를 올린 트랜잭션이 포함됩니다
+    assert receipt.status == 1
+    assert receipt.transactionHash.to_0x_hex() != tx_hash
+    assert replacer.replaced == replaced + 1
+    assert (await aweb3.eth.get_transaction(receipt.transactionHash)).nonce == transaction['nonce']
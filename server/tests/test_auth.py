@@ -0,0 +1,66 @@
+from eth_account import Account
+import pytest
+
+from src.auth import Authenticator, RecoveredAddressCache
+from src.exceptions import ClientException
+from src.settings import Settings
+from src.utils import create_hash, create_signature
+
+
+def test_authenticate_caches_recovered_address(user0_account: Account):
+    authenticator = Authenticator(Settings())
+    message = create_hash(login="oguogu")
+    token = f"{message}:{create_signature(user0_account, message).to_0x_hex()}"
+
+    assert authenticator.authenticate(token) == user0_account.address
+    assert authenticator.authenticate(token) == user0_account.address
+    assert authenticator.signature_cache.misses == 1
+    assert authenticator.signature_cache.hits == 1
+
+
+@pytest.mark.parametrize("signature", ["0xzz", "0x1234", "0x" + "00" * 65])
+def test_authenticate_malformed_signature(signature: str):
+    authenticator = Authenticator(Settings())
+    with pytest.raises(ClientException):
+        authenticator.authenticate(f"{create_hash(login='oguogu')}:{signature}")
+
+
+def test_recovered_address_cache_eviction(user0_account: Account, user1_account: Account):
+    cache = RecoveredAddressCache(maxsize=1, ttl=60)
+    cache.set("token0", user0_account.address)
+    cache.set("token1", user1_account.address)
+
+    assert cache.get("token0") is None
+    assert cache.get("token1") == user1_account.address
+    assert len(cache) == 1
+
+    expired = RecoveredAddressCache(maxsize=1, ttl=-1)
+    expired.set("token0", user0_account.address)
+    assert expired.get("token0") is None
+
+
+def test_session_token(user0_account: Account):
+    authenticator = Authenticator(Settings())
+    token, _ = authenticator.issue_session_token(user0_account.address)
+
+    assert authenticator.authenticate(token) == user0_account.address
+
+    payload, mac = token.split(".")
+    forged = f"{payload}.{mac[:-2]}AA"
+    with pytest.raises(ClientException):
+        authenticator.authenticate(forged)
+
+    other = Authenticator(Settings(SESSION_SECRET_KEY="other-secret"))
+    with pytest.raises(ClientException):
+        other.authenticate(token)
+
+
+def test_authenticate_metrics():
+    # 토큰이 설정되지 않으면 지표를 조회할 수 없습니다
+    with pytest.raises(ClientException):
+        Authenticator(Settings()).authenticate_metrics("")
+
+    authenticator = Authenticator(Settings(METRICS_TOKEN="metrics-token"))
+    authenticator.authenticate_metrics("metrics-token")
+    with pytest.raises(ClientException):
+        authenticator.authenticate_metrics("other-token")